@@ -1,88 +1,193 @@
 from flask import Flask, render_template, jsonify, request
 from flask_cors import CORS
 from dotenv import load_dotenv
-import os
-import psycopg2
 
-# Завантаження змінних з .env
+# Завантаження змінних з .env (до імпорту db — пул читає DB_* з оточення)
 load_dotenv()
 
+import products_repo as repo
+from db import transaction
+
 # Ініціалізація Flask-додатку
 app = Flask(__name__, static_folder='static', template_folder='templates')
 CORS(app)
 
-# Отримання параметрів підключення до БД з .env
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
-DB_NAME = os.getenv("DB_NAME")
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-
-# Функція для підключення до БД
-def get_conn():
-    return psycopg2.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD
-    )
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BULK_ITEMS = 1000
+MAX_MOVEMENTS_PAGE = 200
+
+
+class BatchRejected(Exception):
+    """Пакет змін не пройшов — транзакція відкочується."""
+
+    def __init__(self, failed):
+        super().__init__(failed)
+        self.failed = failed
+
+# Перевірка одного товару з тіла запиту
+def parse_product(data):
+    if not isinstance(data, dict):
+        return None
+    name = data.get("product_name")
+    quantity = data.get("quantity")
+    if not name or quantity is None:
+        return None
+    return {"product_name": name, "quantity": quantity}
+
+# Перевірка однієї зміни кількості (delta — ненульове ціле)
+def parse_adjustment(data, with_id=False):
+    if not isinstance(data, dict):
+        return None
+    delta = data.get("delta")
+    reason = data.get("reason")
+    if not isinstance(delta, int) or isinstance(delta, bool) or delta == 0:
+        return None
+    if reason is not None and not isinstance(reason, str):
+        return None
+    adj = {"delta": delta, "reason": reason}
+    if with_id:
+        product_id = data.get("product_id")
+        if not isinstance(product_id, int) or isinstance(product_id, bool):
+            return None
+        adj["product_id"] = product_id
+    return adj
 
 # Головна сторінка (UI)
 @app.route('/')
 def index():
     return render_template('index.html')
 
-# API: Отримати всі товари
+# API: Отримати товари (keyset-пагінація за product_id, фільтр за назвою)
 @app.route('/api/products', methods=['GET'])
 def get_products():
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT product_id, product_name, quantity FROM products ORDER BY product_id;")
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    after_id = request.args.get("after", None, type=int)
+    name = request.args.get("name", "").strip() or None
 
-    products = [{"product_id": r[0], "product_name": r[1], "quantity": r[2]} for r in rows]
-    return jsonify(products)
+    if limit < 1 or limit > MAX_PAGE_SIZE:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+    with transaction() as cur:
+        items, next_after = repo.list_page(cur, limit, after_id=after_id, name=name)
+
+    return jsonify({"items": items, "next_after": next_after})
 
 # API: Додати новий товар
 @app.route('/api/products', methods=['POST'])
 def add_product():
+    product = parse_product(request.json)
+    if product is None:
+        return jsonify({"error": "Invalid data"}), 400
+
+    with transaction() as cur:
+        created = repo.create(cur, product["product_name"], product["quantity"])
+
+    return jsonify(created), 201
+
+# API: Додати кілька товарів однією транзакцією
+@app.route('/api/products/bulk', methods=['POST'])
+def add_products_bulk():
     data = request.json
-    name = data.get("product_name")
-    quantity = data.get("quantity")
+    if not isinstance(data, list) or not data:
+        return jsonify({"error": "Expected a non-empty array of products"}), 400
+    if len(data) > MAX_BULK_ITEMS:
+        return jsonify({"error": f"At most {MAX_BULK_ITEMS} products per request"}), 400
 
-    if not name or quantity is None:
-        return jsonify({"error": "Invalid data"}), 400
+    products = [parse_product(item) for item in data]
+    invalid = [i for i, p in enumerate(products) if p is None]
+    if invalid:
+        return jsonify({"error": "Invalid data", "invalid_indexes": invalid}), 400
 
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("INSERT INTO products (product_name, quantity) VALUES (%s, %s) RETURNING product_id;",
-                (name, quantity))
-    new_id = cur.fetchone()[0]
-    conn.commit()
-    cur.close()
-    conn.close()
+    with transaction() as cur:
+        created = repo.create_many(cur, products)
 
-    return jsonify({"product_id": new_id, "product_name": name, "quantity": quantity}), 201
+    return jsonify(created), 201
 
 # API: Видалити товар за ID
 @app.route('/api/products/<int:product_id>', methods=['DELETE'])
 def delete_product(product_id):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM products WHERE product_id = %s RETURNING product_id;", (product_id,))
-    deleted = cur.fetchone()
-    conn.commit()
-    cur.close()
-    conn.close()
+    with transaction() as cur:
+        deleted = repo.delete(cur, product_id)
 
     if deleted:
         return jsonify({"message": "Product deleted"}), 200
     else:
         return jsonify({"error": "Product not found"}), 404
 
+# API: Видалити кілька товарів однією транзакцією
+@app.route('/api/products/bulk', methods=['DELETE'])
+def delete_products_bulk():
+    data = request.json
+    ids = data.get("product_ids") if isinstance(data, dict) else None
+    if (
+        not isinstance(ids, list) or not ids
+        or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids)
+    ):
+        return jsonify({"error": "Expected {\"product_ids\": [int, ...]}"}), 400
+    if len(ids) > MAX_BULK_ITEMS:
+        return jsonify({"error": f"At most {MAX_BULK_ITEMS} products per request"}), 400
+
+    with transaction() as cur:
+        deleted = repo.delete_many(cur, ids)
+
+    not_found = sorted(set(ids) - set(deleted))
+    return jsonify({"deleted": sorted(deleted), "not_found": not_found}), 200
+
+# API: Атомарно змінити кількість товару (+надходження / -списання)
+@app.route('/api/products/<int:product_id>/adjust', methods=['PATCH'])
+def adjust_product(product_id):
+    adj = parse_adjustment(request.json)
+    if adj is None:
+        return jsonify({"error": "Expected {\"delta\": non-zero int, \"reason\": str}"}), 400
+
+    with transaction() as cur:
+        product = repo.adjust(cur, product_id, adj["delta"], adj["reason"])
+        found = product is not None or repo.exists(cur, product_id)
+
+    if product:
+        return jsonify(product), 200
+    if not found:
+        return jsonify({"error": "Product not found"}), 404
+    return jsonify({"error": "Insufficient quantity"}), 409
+
+# API: Пакет змін кількості одним запитом до БД (все або нічого)
+@app.route('/api/products/adjust', methods=['POST'])
+def adjust_products_batch():
+    data = request.json
+    if not isinstance(data, list) or not data:
+        return jsonify({"error": "Expected a non-empty array of adjustments"}), 400
+    if len(data) > MAX_BULK_ITEMS:
+        return jsonify({"error": f"At most {MAX_BULK_ITEMS} adjustments per request"}), 400
+
+    adjustments = [parse_adjustment(item, with_id=True) for item in data]
+    invalid = [i for i, a in enumerate(adjustments) if a is None]
+    if invalid:
+        return jsonify({"error": "Invalid data", "invalid_indexes": invalid}), 400
+
+    try:
+        with transaction() as cur:
+            updated, failed = repo.adjust_many(cur, adjustments)
+            if failed:
+                raise BatchRejected(failed)
+    except BatchRejected as e:
+        return jsonify({"error": "Products not found or insufficient quantity", "failed": e.failed}), 409
+
+    return jsonify({"products": updated}), 200
+
+# API: Журнал руху товару (новіші спочатку)
+@app.route('/api/products/<int:product_id>/movements', methods=['GET'])
+def product_movements(product_id):
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    before_id = request.args.get("before", None, type=int)
+    if limit < 1 or limit > MAX_MOVEMENTS_PAGE:
+        return jsonify({"error": f"limit must be between 1 and {MAX_MOVEMENTS_PAGE}"}), 400
+
+    with transaction() as cur:
+        items = repo.movements(cur, product_id, limit, before_id=before_id)
+
+    return jsonify({"items": items})
+
 # Запуск сервера
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,61 @@
+import os
+import threading
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+
+# Пул з'єднань до БД: одне з'єднання на запит береться з пулу,
+# а не відкривається заново в кожному обробнику.
+_pool = None
+_pool_lock = threading.Lock()
+# ThreadedConnectionPool кидає PoolError, коли з'єднання скінчились;
+# семафор змушує зайвий потік чекати замість помилки
+_slots = None
+
+
+def get_pool():
+    global _pool, _slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                maxconn = int(os.getenv("DB_POOL_MAX", "10"))
+                _slots = threading.BoundedSemaphore(maxconn)
+                _pool = ThreadedConnectionPool(
+                    int(os.getenv("DB_POOL_MIN", "1")),
+                    maxconn,
+                    host=os.getenv("DB_HOST"),
+                    port=os.getenv("DB_PORT"),
+                    dbname=os.getenv("DB_NAME"),
+                    user=os.getenv("DB_USER"),
+                    password=os.getenv("DB_PASSWORD"),
+                )
+    return _pool
+
+
+@contextmanager
+def transaction():
+    """Курсор в одній транзакції: commit при успіху, rollback при помилці."""
+    pool = get_pool()
+    _slots.acquire()
+    try:
+        conn = pool.getconn()
+    except Exception:
+        # БД недоступна / PoolError: слот не повернувся б ніколи
+        _slots.release()
+        raise
+    broken = False
+    try:
+        with conn.cursor() as cur:
+            yield cur
+        conn.commit()
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        # з'єднання могло розірватися — не повертаємо його в пул
+        broken = True
+        raise
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pool.putconn(conn, close=broken or conn.closed != 0)
+        _slots.release()
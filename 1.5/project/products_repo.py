@@ -0,0 +1,168 @@
+from psycopg2.extras import execute_values
+
+# Репозиторій товарів: увесь SQL для таблиці products в одному місці.
+# Функції приймають курсор, тож кілька операцій можна виконати
+# в одній транзакції (див. db.transaction).
+
+COLUMNS = "product_id, product_name, quantity"
+
+
+def to_dict(row):
+    return {"product_id": row[0], "product_name": row[1], "quantity": row[2]}
+
+
+def _like_pattern(text):
+    # екрануємо % та _ щоб фільтр шукав підрядок буквально
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def list_page(cur, limit, after_id=None, name=None):
+    """Keyset-пагінація за product_id: (товари, after_id наступної сторінки або None)."""
+    where = []
+    params = []
+    if after_id is not None:
+        where.append("product_id > %s")
+        params.append(after_id)
+    if name:
+        where.append("product_name ILIKE %s")
+        params.append(_like_pattern(name))
+
+    sql = f"SELECT {COLUMNS} FROM products"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY product_id LIMIT %s;"
+    params.append(limit + 1)
+
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+
+    next_after = rows[limit - 1][0] if len(rows) > limit else None
+    return [to_dict(r) for r in rows[:limit]], next_after
+
+
+def create(cur, name, quantity):
+    cur.execute(
+        f"INSERT INTO products (product_name, quantity) VALUES (%s, %s) RETURNING {COLUMNS};",
+        (name, quantity),
+    )
+    return to_dict(cur.fetchone())
+
+
+def create_many(cur, items):
+    rows = execute_values(
+        cur,
+        f"INSERT INTO products (product_name, quantity) VALUES %s RETURNING {COLUMNS};",
+        [(i["product_name"], i["quantity"]) for i in items],
+        page_size=1000,
+        fetch=True,
+    )
+    return [to_dict(r) for r in rows]
+
+
+def delete(cur, product_id):
+    cur.execute("DELETE FROM products WHERE product_id = %s RETURNING product_id;", (product_id,))
+    return cur.fetchone() is not None
+
+
+def delete_many(cur, product_ids):
+    cur.execute("DELETE FROM products WHERE product_id = ANY(%s) RETURNING product_id;", (list(product_ids),))
+    return [r[0] for r in cur.fetchall()]
+
+
+def exists(cur, product_id):
+    cur.execute("SELECT 1 FROM products WHERE product_id = %s;", (product_id,))
+    return cur.fetchone() is not None
+
+
+def adjust(cur, product_id, delta, reason=None):
+    """Атомарна зміна кількості + запис у журнал одним запитом.
+
+    Повертає товар або None, якщо товару немає чи залишок став би від'ємним.
+    """
+    cur.execute(
+        f"""
+        WITH upd AS (
+          UPDATE products SET quantity = quantity + %(delta)s
+          WHERE product_id = %(product_id)s AND quantity + %(delta)s >= 0
+          RETURNING {COLUMNS}
+        ), mv AS (
+          INSERT INTO stock_movements (product_id, delta, quantity_after, reason)
+          SELECT product_id, %(delta)s, quantity, %(reason)s FROM upd
+        )
+        SELECT {COLUMNS} FROM upd;
+        """,
+        {"product_id": product_id, "delta": delta, "reason": reason},
+    )
+    row = cur.fetchone()
+    return to_dict(row) if row else None
+
+
+def adjust_many(cur, adjustments):
+    """Пакет змін одним запитом: дельти одного товару сумуються,
+    у журнал іде кожна зміна окремо (у порядку запиту).
+
+    Рядки товарів блокуються за зростанням product_id, щоб паралельні
+    пакети не взаємоблокувались. Повертає (оновлені товари, id що не пройшли);
+    якщо список невдалих непорожній — транзакцію треба відкотити.
+    """
+    cur.execute(
+        f"""
+        WITH input AS (
+          SELECT t.product_id, t.delta, t.reason, t.ord
+          FROM unnest(%s::int[], %s::int[], %s::text[]) WITH ORDINALITY AS t(product_id, delta, reason, ord)
+        ), agg AS (
+          SELECT product_id, SUM(delta) AS delta FROM input GROUP BY product_id
+        ), locked AS (
+          SELECT product_id FROM products
+          WHERE product_id IN (SELECT product_id FROM agg)
+          ORDER BY product_id
+          FOR UPDATE
+        ), upd AS (
+          UPDATE products p SET quantity = p.quantity + agg.delta
+          FROM agg JOIN locked USING (product_id)
+          WHERE p.product_id = agg.product_id AND p.quantity + agg.delta >= 0
+          RETURNING p.product_id, p.product_name, p.quantity
+        ), mv AS (
+          INSERT INTO stock_movements (product_id, delta, quantity_after, reason)
+          SELECT i.product_id, i.delta,
+                 u.quantity - COALESCE(SUM(i.delta) OVER (
+                   PARTITION BY i.product_id ORDER BY i.ord
+                   ROWS BETWEEN 1 FOLLOWING AND UNBOUNDED FOLLOWING
+                 ), 0),
+                 i.reason
+          FROM input i JOIN upd u USING (product_id)
+          ORDER BY i.ord
+        )
+        SELECT {COLUMNS} FROM upd ORDER BY product_id;
+        """,
+        (
+            [a["product_id"] for a in adjustments],
+            [a["delta"] for a in adjustments],
+            [a.get("reason") for a in adjustments],
+        ),
+    )
+    updated = [to_dict(r) for r in cur.fetchall()]
+    done = {p["product_id"] for p in updated}
+    failed = sorted({a["product_id"] for a in adjustments} - done)
+    return updated, failed
+
+
+def movements(cur, product_id, limit, before_id=None):
+    sql = """
+        SELECT movement_id, delta, quantity_after, reason, created_at
+        FROM stock_movements
+        WHERE product_id = %s
+    """
+    params = [product_id]
+    if before_id is not None:
+        sql += " AND movement_id < %s"
+        params.append(before_id)
+    sql += " ORDER BY movement_id DESC LIMIT %s;"
+    params.append(limit)
+    cur.execute(sql, params)
+    return [
+        {"movement_id": r[0], "delta": r[1], "quantity_after": r[2], "reason": r[3],
+         "created_at": r[4].isoformat()}
+        for r in cur.fetchall()
+    ]
@@ -0,0 +1,36 @@
+-- Схема БД складу (psql -d pr15 -f schema.sql)
+
+CREATE TABLE IF NOT EXISTS products (
+  product_id   SERIAL PRIMARY KEY,
+  product_name VARCHAR(255) NOT NULL,
+  quantity     INTEGER NOT NULL
+);
+
+-- Журнал руху товарів: лише додавання рядків.
+-- Без FK на products, щоб історія лишалась після видалення товару.
+CREATE TABLE IF NOT EXISTS stock_movements (
+  movement_id    BIGSERIAL PRIMARY KEY,
+  product_id     INTEGER NOT NULL,
+  delta          INTEGER NOT NULL CHECK (delta <> 0),
+  quantity_after INTEGER NOT NULL,
+  reason         TEXT,
+  created_at     TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_stock_movements_product
+  ON stock_movements (product_id, movement_id DESC);
+
+-- заборона UPDATE/DELETE у журналі
+CREATE OR REPLACE FUNCTION trg_stock_movements_append_only()
+RETURNS TRIGGER AS $$
+BEGIN
+  RAISE EXCEPTION 'stock_movements is append-only';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS stock_movements_append_only ON stock_movements;
+
+CREATE TRIGGER stock_movements_append_only
+BEFORE UPDATE OR DELETE ON stock_movements
+FOR EACH STATEMENT
+EXECUTE FUNCTION trg_stock_movements_append_only();
@@ -1,13 +1,21 @@
-// Завантажити список товарів
-async function fetchProducts() {
+// Поточна сторінка списку (keyset-пагінація: after = останній product_id)
+let nextAfter = null;
+
+// Завантажити список товарів (append=true — наступна сторінка)
+async function fetchProducts(append = false) {
     try {
-        const res = await fetch('/api/products');
-        const products = await res.json();
+        const params = new URLSearchParams();
+        const name = document.getElementById('name-filter').value.trim();
+        if (name) params.set('name', name);
+        if (append && nextAfter !== null) params.set('after', nextAfter);
+
+        const res = await fetch(`/api/products?${params.toString()}`);
+        const page = await res.json();
 
         const list = document.getElementById('product-list');
-        list.innerHTML = '';
+        if (!append) list.innerHTML = '';
 
-        products.forEach(product => {
+        page.items.forEach(product => {
             const li = document.createElement('li');
             li.textContent = `${product.product_name} — ${product.quantity} шт.`;
 
@@ -18,11 +26,17 @@ async function fetchProducts() {
             li.appendChild(deleteBtn);
             list.appendChild(li);
         });
+
+        nextAfter = page.next_after;
+        document.getElementById('load-more').hidden = nextAfter === null;
     } catch (error) {
         console.error('Помилка при завантаженні товарів:', error);
     }
 }
 
+document.getElementById('load-more').addEventListener('click', () => fetchProducts(true));
+document.getElementById('name-filter').addEventListener('input', () => fetchProducts());
+
 // Додати товар
 document.getElementById('add-product-form').addEventListener('submit', async (e) => {
     e.preventDefault();
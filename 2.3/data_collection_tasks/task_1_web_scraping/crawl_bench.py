@@ -0,0 +1,139 @@
+# crawl_bench.py
+"""
+Локальний fixture-сервер і замір швидкості краулера (стор/с).
+
+    python crawl_bench.py --pages 300 --hosts 4 --latency 20
+
+Піднімає кілька HTTP-серверів на 127.0.0.1 (окремий порт = окремий хост),
+що віддають сторінки у форматі Hacker News з ETag/Last-Modified.
+Три прогони: холодний кеш, повторний (усі 304), після зміни частини сторінок.
+"""
+import argparse
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from crawler import Crawler
+from extractors import load_rules, rules_id
+from web_scraper import make_parser
+
+
+class FixtureSite:
+    """Стан сторінок: версія сторінки змінюється через bump()."""
+
+    def __init__(self, titles_per_page=30, latency=0.0):
+        self.titles_per_page = titles_per_page
+        self.latency = latency
+        self.versions = {}
+        self.started = time.time()
+
+    def bump(self, page):
+        self.versions[page] = self.versions.get(page, 0) + 1
+
+    def render(self, page):
+        v = self.versions.get(page, 0)
+        rows = "\n".join(
+            f'<tr class="athing"><td><span class="titleline"><a href="/item/{page}-{i}">'
+            f'Новина {page}.{i} (версія {v})</a></span></td></tr>'
+            for i in range(self.titles_per_page)
+        )
+        return f"<html><body><table>{rows}</table></body></html>".encode("utf-8")
+
+    def handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                if site.latency:
+                    time.sleep(site.latency)
+                if not self.path.startswith("/page/"):
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                page = int(self.path.rsplit("/", 1)[1])
+                v = site.versions.get(page, 0)
+                etag = '"' + hashlib.md5(f"{page}:{v}".encode()).hexdigest() + '"'
+                last_modified = formatdate(site.started + v, usegmt=True)
+
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                body = site.render(page)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def start_servers(site, hosts):
+    servers = []
+    for _ in range(hosts):
+        srv = ThreadingHTTPServer(("127.0.0.1", 0), site.handler())
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        servers.append(srv)
+    return servers
+
+
+def run(crawler, urls, label, parse, parser_id):
+    items = sum(len(p.items) for p in crawler.crawl(urls, parse, parser_id))
+    s = crawler.stats
+    print(f"{label:22} {s.pages:5} стор  {s.elapsed:6.2f} с  {s.pages_per_s:8.1f} стор/с  "
+          f"розібрано {s.parsed:4}  304: {s.not_modified:4}  помилок {s.errors}  заголовків {items}")
+    return s
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Бенчмарк краулера на локальному fixture-сервері")
+    ap.add_argument("--pages", type=int, default=300)
+    ap.add_argument("--hosts", type=int, default=4)
+    ap.add_argument("--latency", type=float, default=20, help="затримка відповіді сервера, мс")
+    ap.add_argument("--workers", type=int, default=16)
+    ap.add_argument("--per-host", type=int, default=4)
+    ap.add_argument("--changed", type=float, default=0.1, help="частка сторінок, змінених перед 3-м прогоном")
+    args = ap.parse_args(argv)
+
+    site = FixtureSite(latency=args.latency / 1000)
+    servers = start_servers(site, args.hosts)
+    urls = [
+        f"http://127.0.0.1:{servers[i % args.hosts].server_address[1]}/page/{i}"
+        for i in range(args.pages)
+    ]
+
+    rules = load_rules()
+    _, parse = make_parser(rules)
+    parser_id = rules_id(rules)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        crawler = Crawler(os.path.join(tmp, "cache.sqlite3"), workers=args.workers, per_host=args.per_host)
+        run(crawler, urls, "холодний кеш", parse, parser_id)
+        run(crawler, urls, "повтор (304)", parse, parser_id)
+        for page in range(0, args.pages, max(1, round(1 / args.changed)) if args.changed else args.pages + 1):
+            site.bump(page)
+        run(crawler, urls, f"змінено {args.changed:.0%}", parse, parser_id)
+        crawler.close()
+
+    for srv in servers:
+        srv.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+# crawler.py
+"""
+Паралельний ввічливий краулер з HTTP-кешем.
+
+- пул потоків, у кожного потоку своя requests.Session (keep-alive);
+- не більше per_host одночасних запитів і пауза delay між запитами до хоста;
+- robots.txt перевіряється один раз на хост;
+- кеш у SQLite: ETag / Last-Modified для умовних запитів (304),
+  хеш вмісту та вже розібрані елементи сторінки — незмінена сторінка
+  ніколи не розбирається вдруге.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+USER_AGENT = "miaz-crawler/1.0"
+
+
+@dataclass
+class PageResult:
+    url: str
+    status: int                # HTTP-статус; 0 — мережева помилка
+    items: list = field(default_factory=list)
+    changed: bool = False      # сторінку розібрано заново
+    from_cache: bool = False   # 304 або той самий вміст
+    error: str | None = None
+
+
+@dataclass
+class CrawlStats:
+    pages: int = 0
+    fetched: int = 0           # 200 з новим вмістом
+    not_modified: int = 0      # 304
+    unchanged: int = 0         # 200, але хеш вмісту той самий
+    parsed: int = 0
+    errors: int = 0
+    skipped_robots: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def pages_per_s(self) -> float:
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+
+class HttpCache:
+    """Постійний кеш відповідей у SQLite (один файл, безпечний для потоків)."""
+
+    def __init__(self, path="http_cache.sqlite3"):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+              url TEXT PRIMARY KEY,
+              etag TEXT,
+              last_modified TEXT,
+              digest TEXT NOT NULL,
+              parser TEXT NOT NULL,
+              items TEXT NOT NULL,
+              fetched_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    def get(self, url, parser):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, digest, items FROM pages WHERE url=? AND parser=?",
+                (url, parser),
+            ).fetchone()
+        if not row:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "digest": row[2], "items": json.loads(row[3])}
+
+    def put(self, url, parser, etag, last_modified, digest, items):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?,?,?,?,?,?,?)",
+                (url, etag, last_modified, digest, parser, json.dumps(items, ensure_ascii=False), time.time()),
+            )
+            self._db.commit()
+
+    def revalidated(self, url, etag, last_modified):
+        with self._lock:
+            self._db.execute(
+                "UPDATE pages SET etag=COALESCE(?, etag), last_modified=COALESCE(?, last_modified), fetched_at=? WHERE url=?",
+                (etag, last_modified, time.time(), url),
+            )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class HostLimiter:
+    """Обмеження одночасних запитів і мінімальна пауза між запитами до хоста."""
+
+    def __init__(self, per_host=2, delay=0.0):
+        self.per_host = per_host
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._next_at = {}
+
+    def _slot(self, host):
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._slots[host]
+
+    @contextmanager
+    def __call__(self, host):
+        slot = self._slot(host)
+        slot.acquire()
+        try:
+            if self.delay:
+                with self._lock:
+                    now = time.monotonic()
+                    start = max(now, self._next_at.get(host, now))
+                    self._next_at[host] = start + self.delay
+                if start > now:
+                    time.sleep(start - now)
+            yield
+        finally:
+            slot.release()
+
+
+class Crawler:
+    def __init__(self, cache_path="http_cache.sqlite3", workers=16, per_host=2, delay=0.0,
+                 timeout=10.0, respect_robots=True, user_agent=USER_AGENT):
+        self.cache = HttpCache(cache_path)
+        self.workers = workers
+        self.limit = HostLimiter(per_host, delay)
+        self.timeout = timeout
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self._local = threading.local()
+        self._robots = {}
+        self._robots_lock = threading.Lock()
+        self._robots_fetching = {}  # хост -> Lock: robots.txt завантажує лише один потік
+
+    def _session(self):
+        s = getattr(self._local, "session", None)
+        if s is None:
+            s = self._local.session = requests.Session()
+            s.headers["User-Agent"] = self.user_agent
+        return s
+
+    def allowed(self, url):
+        if not self.respect_robots:
+            return True
+        u = urlsplit(url)
+        base = f"{u.scheme}://{u.netloc}"
+        with self._robots_lock:
+            rp = self._robots.get(base)
+            host_lock = self._robots_fetching.setdefault(base, threading.Lock())
+        if rp is None:
+            # перші одночасні запити до хоста чекають на одне завантаження
+            with host_lock:
+                with self._robots_lock:
+                    rp = self._robots.get(base)
+                if rp is None:
+                    rp = self._fetch_robots(base, u.netloc)
+                    with self._robots_lock:
+                        self._robots[base] = rp
+        return rp.can_fetch(self.user_agent, url)
+
+    def _fetch_robots(self, base, host):
+        rp = RobotFileParser()
+        try:
+            # теж запит до хоста: під тим самим per_host / delay, що й сторінки
+            with self.limit(host):
+                r = self._session().get(base + "/robots.txt", timeout=self.timeout)
+            if r.status_code == 200:
+                rp.parse(r.text.splitlines())
+            else:
+                rp.parse([])  # немає robots.txt — дозволено все
+        except requests.RequestException:
+            rp.parse([])
+        return rp
+
+    def fetch(self, url, parse, parser_id) -> PageResult:
+        if not self.allowed(url):
+            return PageResult(url, 0, error="robots.txt")
+
+        cached = self.cache.get(url, parser_id)
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        try:
+            with self.limit(urlsplit(url).netloc):
+                resp = self._session().get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            return PageResult(url, 0, error=str(e))
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+
+        if resp.status_code == 304 and cached:
+            self.cache.revalidated(url, etag, last_modified)
+            return PageResult(url, 304, cached["items"], from_cache=True)
+        if resp.status_code != 200:
+            return PageResult(url, resp.status_code, error=resp.reason)
+
+        digest = hashlib.sha256(resp.content).hexdigest()
+        if cached and cached["digest"] == digest:
+            # сервер не підтримує 304, але вміст той самий — не розбираємо
+            self.cache.revalidated(url, etag, last_modified)
+            return PageResult(url, 200, cached["items"], from_cache=True)
+
+        try:
+            items = parse(resp)
+        except Exception as e:
+            # помилка розбору однієї сторінки не зупиняє обхід, як і мережева
+            return PageResult(url, 200, error=f"розбір: {e!r}")
+        self.cache.put(url, parser_id, etag, last_modified, digest, items)
+        return PageResult(url, 200, items, changed=True)
+
+    def crawl(self, urls, parse, parser_id="default"):
+        """Генератор PageResult у порядку завершення; статистика — у self.stats.
+
+        parse(response) -> list; parser_id відрізняє правила розбору в кеші.
+        """
+        self.stats = stats = CrawlStats()
+        t0 = time.perf_counter()
+        urls = list(dict.fromkeys(urls))  # без дублікатів, порядок збережено
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(self.fetch, u, parse, parser_id) for u in urls]
+            for fut in as_completed(futures):
+                r = fut.result()
+                stats.pages += 1
+                if r.error == "robots.txt":
+                    stats.skipped_robots += 1
+                elif r.error:
+                    stats.errors += 1
+                elif r.status == 304:
+                    stats.not_modified += 1
+                elif r.from_cache:
+                    stats.unchanged += 1
+                else:
+                    stats.fetched += 1
+                    stats.parsed += 1
+                stats.elapsed = time.perf_counter() - t0
+                yield r
+
+    def close(self):
+        self.cache.close()
@@ -0,0 +1,152 @@
+# extractors.py
+"""
+Шар розбору HTML: однакові CSS-правила поверх різних бекендів.
+
+Правила для сайтів — у sites.json:
+
+    "news.ycombinator.com": {
+        "items": ".titleline",                 # елемент = один рядок результату
+        "fields": {"Title": "a", "Link": "a@href"}   # селектор[@атрибут] всередині
+    }
+
+Бекенди (за швидкістю, див. parser_bench.py): selectolax, lxml, bs4.
+"auto" бере найшвидший встановлений.
+"""
+import hashlib
+import importlib
+import json
+import os
+import re
+from urllib.parse import urlsplit
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sites.json")
+
+# порядок за результатами parser_bench.py
+PREFERENCE = ["selectolax", "lxml", "bs4"]
+
+# змінюється разом з результатом розбору — інакше кеш краулера віддасть старий
+EXTRACT_VERSION = 2
+
+META_CHARSET_RE = re.compile(rb"<meta[^>]+charset=", re.I)
+
+
+def load_rules(path=RULES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def rule_for(rules, url):
+    host = urlsplit(url).hostname or ""
+    return rules.get(host) or rules["default"]
+
+
+def rules_id(rules):
+    # потрапляє в кеш краулера: змінились правила чи EXTRACT_VERSION — сторінки розберуться заново
+    key = json.dumps([EXTRACT_VERSION, rules], sort_keys=True)
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def _split(selector):
+    sel, _, attr = selector.partition("@")
+    return sel.strip(), attr or None
+
+
+# ---------------- бекенди ----------------
+def _extract_selectolax(html, rule):
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+    fields = {name: _split(s) for name, s in rule["fields"].items()}
+    rows = []
+    for node in tree.css(rule["items"]):
+        row = {}
+        for name, (sel, attr) in fields.items():
+            el = node.css_first(sel) if sel else node
+            if el is None:
+                row[name] = None
+            elif attr:
+                row[name] = el.attributes.get(attr)
+            else:
+                row[name] = el.text()
+        rows.append(row)
+    return rows
+
+
+def _extract_lxml(html, rule):
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+
+    # без <meta charset> lxml читає байти як latin-1; selectolax і bs4 — як UTF-8
+    parser = None
+    if isinstance(html, bytes) and not META_CHARSET_RE.search(html[:2048]):
+        parser = lxml.html.HTMLParser(encoding="utf-8")
+    tree = lxml.html.fromstring(html, parser=parser)
+    items = CSSSelector(rule["items"])
+    fields = {}
+    for name, s in rule["fields"].items():
+        sel, attr = _split(s)
+        fields[name] = (CSSSelector(sel) if sel else None, attr)
+
+    rows = []
+    for node in items(tree):
+        row = {}
+        for name, (sel, attr) in fields.items():
+            found = sel(node) if sel is not None else [node]
+            el = found[0] if found else None
+            if el is None:
+                row[name] = None
+            elif attr:
+                row[name] = el.get(attr)
+            else:
+                row[name] = el.text_content()
+        rows.append(row)
+    return rows
+
+
+def _extract_bs4(html, rule):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, 'html.parser')
+    fields = {name: _split(s) for name, s in rule["fields"].items()}
+    rows = []
+    for node in soup.select(rule["items"]):
+        row = {}
+        for name, (sel, attr) in fields.items():
+            el = node.select_one(sel) if sel else node
+            if el is None:
+                row[name] = None
+            elif attr:
+                row[name] = el.get(attr)
+            else:
+                row[name] = el.get_text()
+        rows.append(row)
+    return rows
+
+
+BACKENDS = {
+    "selectolax": ("selectolax.lexbor", _extract_selectolax),
+    "lxml": ("lxml.cssselect", _extract_lxml),
+    "bs4": ("bs4", _extract_bs4),
+}
+
+
+def available():
+    names = []
+    for name in PREFERENCE:
+        try:
+            importlib.import_module(BACKENDS[name][0])
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_extractor(name="auto"):
+    if name == "auto":
+        found = available()
+        if not found:
+            raise SystemExit("Не знайдено жодного HTML-парсера: pip install selectolax (або lxml, beautifulsoup4)")
+        name = found[0]
+    if name not in BACKENDS:
+        raise SystemExit(f"Невідомий парсер: {name}. Доступні: {', '.join(BACKENDS)}")
+    return name, BACKENDS[name][1]
@@ -0,0 +1,142 @@
+# parser_bench.py
+"""
+Порівняння HTML-бекендів на збережених сторінках: стор/с і пікова пам'ять.
+
+    python parser_bench.py --make-fixtures 200     # згенерувати fixtures/*.html
+    python parser_bench.py                          # заміряти всі встановлені бекенди
+    python parser_bench.py --fixtures saved_pages/  # або власні збережені сторінки
+
+Кожен бекенд запускається в окремому процесі, тож пікова пам'ять (ru_maxrss)
+не змішується між ними. "база" — RSS після імпорту й читання сторінок,
+"пік" — максимум під час розбору. За результатами впорядковано
+extractors.PREFERENCE.
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import time
+
+from extractors import BACKENDS, available, load_rules, rule_for
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(HERE, "fixtures")
+FIXTURE_URL = "https://news.ycombinator.com/news?p={}"
+
+WORDS = ("Show HN: Ask HN: Rust Python Postgres compiler kernel GPU startup open source "
+         "database release security browser model cache latency memory network").split()
+
+
+def make_fixtures(n, out_dir=FIXTURES, seed=42):
+    """Сторінки у розмітці Hacker News: 30 новин + рядки subtext, ~35 КБ кожна."""
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    for p in range(n):
+        rows = []
+        for i in range(30):
+            item = p * 30 + i
+            title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 12)))
+            rows.append(
+                f'<tr class="athing submission" id="{item}">'
+                f'<td align="right" valign="top" class="title"><span class="rank">{i + 1}.</span></td>'
+                f'<td valign="top" class="votelinks"><center><a id="up_{item}" href="vote?id={item}&amp;how=up">'
+                f'<div class="votearrow" title="upvote"></div></a></center></td>'
+                f'<td class="title"><span class="titleline"><a href="https://example.com/{item}">{title}</a>'
+                f'<span class="sitebit comhead"> (<a href="from?site=example.com"><span class="sitestr">'
+                f'example.com</span></a>)</span></span></td></tr>'
+                f'<tr><td colspan="2"></td><td class="subtext"><span class="subline">'
+                f'<span class="score" id="score_{item}">{rng.randint(1, 900)} points</span> by '
+                f'<a href="user?id=u{item}" class="hnuser">u{item}</a> '
+                f'<span class="age" title="2025-01-01T00:00:00"><a href="item?id={item}">3 hours ago</a></span> | '
+                f'<a href="hide?id={item}">hide</a> | <a href="item?id={item}">{rng.randint(0, 500)}&nbsp;comments</a>'
+                f'</span></td></tr><tr class="spacer" style="height:5px"></tr>'
+            )
+        head = ('<html lang="en"><head><meta name="referrer" content="origin">'
+                '<link rel="stylesheet" type="text/css" href="news.css"><title>Hacker News</title></head>'
+                '<body><center><table id="hnmain" border="0" cellpadding="0" cellspacing="0" width="85%">'
+                '<tr><td><table border="0" cellpadding="0" cellspacing="0" class="itemlist">')
+        html = head + "".join(rows) + "</table></td></tr></table></center></body></html>"
+        with open(os.path.join(out_dir, f"page_{p:04d}.html"), "w", encoding="utf-8") as f:
+            f.write(html)
+    return n
+
+
+def _rss_mb():
+    # ru_maxrss: КБ на Linux, байти на macOS
+    r = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return r / (1024 * 1024) if sys.platform == "darwin" else r / 1024
+
+
+def worker(backend, fixtures, repeat):
+    """Виконується в дочірньому процесі; друкує JSON з результатом."""
+    extract = BACKENDS[backend][1]
+    rule = rule_for(load_rules(), FIXTURE_URL.format(1))
+    pages = []
+    for path in sorted(glob.glob(os.path.join(fixtures, "*.html"))):
+        with open(path, "rb") as f:
+            pages.append(f.read())
+
+    extract(pages[0], rule)  # імпорт бекенду й прогрів
+    base = _rss_mb()
+
+    rows = 0
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            rows += len(extract(html, rule))
+    elapsed = time.perf_counter() - t0
+
+    print(json.dumps({
+        "backend": backend,
+        "pages": len(pages) * repeat,
+        "rows": rows,
+        "elapsed_s": elapsed,
+        "pages_per_s": len(pages) * repeat / elapsed,
+        "rss_base_mb": base,
+        "rss_peak_mb": _rss_mb(),
+    }))
+
+
+def run(backend, fixtures, repeat):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", backend,
+         "--fixtures", fixtures, "--repeat", str(repeat)],
+        capture_output=True, text=True, check=True, cwd=HERE,
+    )
+    return json.loads(out.stdout)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Бенчмарк HTML-парсерів на fixture-сторінках")
+    ap.add_argument("--fixtures", default=FIXTURES, help="каталог зі сторінками *.html")
+    ap.add_argument("--make-fixtures", type=int, metavar="N", help="згенерувати N сторінок і вийти")
+    ap.add_argument("--backends", nargs="*", help="типово — усі встановлені")
+    ap.add_argument("--repeat", type=int, default=3, help="скільки разів пройти всі сторінки")
+    ap.add_argument("--worker", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.make_fixtures:
+        make_fixtures(args.make_fixtures, args.fixtures)
+        print(f"✅ {args.make_fixtures} сторінок у {args.fixtures}")
+        return
+    if args.worker:
+        return worker(args.worker, args.fixtures, args.repeat)
+
+    if not glob.glob(os.path.join(args.fixtures, "*.html")):
+        raise SystemExit(f"Немає сторінок у {args.fixtures}: python parser_bench.py --make-fixtures 200")
+
+    results = [run(b, args.fixtures, args.repeat) for b in (args.backends or available())]
+    fastest = max(r["pages_per_s"] for r in results)
+    print(f"{'бекенд':12} {'стор':>6} {'рядків':>7} {'стор/с':>9} {'x':>6} {'база МБ':>8} {'пік МБ':>7} {'+МБ':>6}")
+    for r in sorted(results, key=lambda r: -r["pages_per_s"]):
+        print(f"{r['backend']:12} {r['pages']:6} {r['rows']:7} {r['pages_per_s']:9.1f} "
+              f"{r['pages_per_s'] / fastest:6.2f} {r['rss_base_mb']:8.1f} {r['rss_peak_mb']:7.1f} "
+              f"{r['rss_peak_mb'] - r['rss_base_mb']:6.1f}")
+
+
+if __name__ == "__main__":
+    main()
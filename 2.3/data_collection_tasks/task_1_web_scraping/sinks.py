@@ -0,0 +1,62 @@
+# sinks.py
+"""
+Потоковий запис рядків: кожна сторінка пишеться одразу після розбору,
+в пам'яті тримається лише поточний пакет.
+
+CSV — стандартна бібліотека; Parquet — pyarrow (опційно), row group
+на кожні batch_size рядків.
+"""
+import csv
+
+
+class CsvSink:
+    def __init__(self, path, columns):
+        self.columns = columns
+        self._file = open(path, "w", newline='', encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, rows):
+        self._writer.writerows([r.get(c) for c in self.columns] for r in rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    def __init__(self, path, columns, batch_size=10_000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Для Parquet потрібен pyarrow: pip install pyarrow")
+
+        self._pa = pa
+        self.columns = columns
+        self.batch_size = batch_size
+        self._schema = pa.schema([(c, pa.string()) for c in columns])
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+        self._buffer = []
+
+    def write(self, rows):
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        data = {c: [r.get(c) for r in self._buffer] for c in self.columns}
+        self._writer.write_table(self._pa.table(data, schema=self._schema))
+        self._buffer = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+def open_sink(path, columns):
+    if path.endswith(".parquet"):
+        return ParquetSink(path, columns)
+    return CsvSink(path, columns)
@@ -1,17 +1,71 @@
-import requests
-from bs4 import BeautifulSoup
-import csv
+import argparse
+
+from crawler import Crawler
+from extractors import get_extractor, load_rules, rule_for, rules_id
+from sinks import open_sink
 
 URL = "https://news.ycombinator.com/"  # приклад сайту
-response = requests.get(URL)
-soup = BeautifulSoup(response.text, 'html.parser')
 
-titles = [tag.text for tag in soup.select('.titleline a')]
 
-with open("news_titles.csv", "w", newline='', encoding="utf-8") as file:
-    writer = csv.writer(file)
-    writer.writerow(["Title"])
-    for title in titles:
-        writer.writerow([title])
+def make_parser(rules, backend="auto"):
+    """parse(response) для краулера: правило обирається за хостом сторінки."""
+    name, extract = get_extractor(backend)
+
+    def parse(response):
+        return extract(response.content, rule_for(rules, response.url))
+
+    return name, parse
+
+
+def columns_for(rules):
+    # усі поля з усіх правил у порядку появи + джерело
+    cols = []
+    for rule in rules.values():
+        cols += [c for c in rule["fields"] if c not in cols]
+    return cols + ["Source"]
+
+
+def read_urls(path):
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Збір заголовків новин у CSV / Parquet")
+    ap.add_argument("urls", nargs="?", help="файл зі списком URL (по одному в рядку); без нього — лише URL")
+    ap.add_argument("-o", "--output", default="news_titles.csv", help="*.csv або *.parquet")
+    ap.add_argument("--rules", default=None, help="файл правил розбору (типово sites.json)")
+    ap.add_argument("--parser", default="auto", choices=["auto", "selectolax", "lxml", "bs4"])
+    ap.add_argument("--cache", default="http_cache.sqlite3", help="файл HTTP-кешу")
+    ap.add_argument("--workers", type=int, default=16)
+    ap.add_argument("--per-host", type=int, default=2, help="одночасних запитів до одного хоста")
+    ap.add_argument("--delay", type=float, default=0.5, help="пауза між запитами до хоста, с")
+    args = ap.parse_args(argv)
+
+    rules = load_rules(args.rules) if args.rules else load_rules()
+    backend, parse = make_parser(rules, args.parser)
+    urls = read_urls(args.urls) if args.urls else [URL]
+    crawler = Crawler(args.cache, workers=args.workers, per_host=args.per_host, delay=args.delay)
+
+    # рядки пишуться одразу після кожної сторінки, без накопичення в пам'яті
+    sink = open_sink(args.output, columns_for(rules))
+    rows = 0
+    try:
+        # id кешу залежить лише від правил: бекенди дають однаковий результат
+        for page in crawler.crawl(urls, parse, rules_id(rules)):
+            if page.error:
+                print(f"⚠ {page.url}: {page.error}")
+                continue
+            sink.write([{**item, "Source": page.url} for item in page.items])
+            rows += len(page.items)
+    finally:
+        sink.close()
+        crawler.close()
+
+    s = crawler.stats
+    print(f"✅ Збережено {rows} рядків у '{args.output}' (парсер {backend}): {s.pages} сторінок за {s.elapsed:.2f} с "
+          f"({s.pages_per_s:.1f} стор/с; нових {s.parsed}, 304: {s.not_modified}, без змін: {s.unchanged}, помилок: {s.errors})")
+
 
-print("✅ Збережено новини у 'news_titles.csv'")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# batch_processor.py
+"""
+Пакетна фільтрація каталогу Excel-файлів з колонковим кешем.
+
+    python batch_processor.py inbox/ -w "Score > 80" -o out/ --workers 8
+    python batch_processor.py inbox/ -w "Score > 90" -o out/     # вже з кешу, секунди
+
+- кожна книга один раз конвертується у Parquet (.excel_cache/<sha256>.parquet);
+- повторні запуски з іншим фільтром читають лише потрібні стовпці з Parquet,
+  XLSX не розбирається взагалі;
+- у index.json для кожного файлу — розмір, mtime і хеш: незмінений файл
+  навіть не хешується вдруге, а перейменований / "торкнутий" файл з тим
+  самим вмістом знаходить свій кеш за хешем;
+- книги обробляються паралельно в пулі процесів.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from excel_processor import (DEFAULT_CHUNK, ParquetSink, SINKS, apply_filter, open_sink,
+                             plan_columns, read_chunks, replacing)
+
+CACHE_DIR = ".excel_cache"
+CONVERT_CHUNK = 100_000   # більша порція — менше шансів, що тип стовпця "поплаве" між порціями
+EXTENSIONS = (".xlsx", ".xlsm")
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_index(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, "index.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_index(cache_dir, index):
+    path = os.path.join(cache_dir, "index.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    os.replace(path + ".tmp", path)
+
+
+def cached_parquet(path, cache_dir, known, engine="auto"):
+    """Шлях до Parquet-копії книги; конвертує лише за відсутності кешу.
+
+    known — запис з index.json для цього файлу (або None).
+    Повертає (parquet, запис для index.json, чи була конвертація).
+    """
+    st = os.stat(path)
+    if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+        digest = known["sha256"]
+    else:
+        digest = file_sha256(path)
+    entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+
+    parquet = os.path.join(cache_dir, f"{digest}.parquet")
+    if os.path.exists(parquet):
+        return parquet, entry, False
+
+    # атомарно: паралельні/перервані запуски не залишать пів-файлу
+    with replacing(parquet) as tmp:
+        sink = ParquetSink(tmp)
+        try:
+            for df in read_chunks(path, chunk_size=CONVERT_CHUNK, engine=engine):
+                sink.write(df)
+        finally:
+            sink.close()
+        if not os.path.exists(tmp):
+            raise SystemExit("У книзі немає заголовка")
+    return parquet, entry, True
+
+
+def filter_parquet(parquet, out, where=None, columns=None, chunk_size=DEFAULT_CHUNK):
+    """Фільтрує Parquet-кеш у out. Результат пишеться у тимчасовий файл і замінює
+    out атомарно — навіть порожній, щоб не лишився результат попереднього запуску."""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(parquet)
+    out_cols, needed = plan_columns(pf.schema_arrow.names, columns, where)
+    schema = pa.schema([pf.schema_arrow.field(c) for c in out_cols])
+    # цілі з порожніми клітинками — Int64 з pd.NA, а не float64 (інакше в CSV "91.0")
+    types = {pa.int64(): pd.Int64Dtype()}.get
+    written = 0
+    with replacing(out) as tmp:
+        sink = open_sink(tmp, schema)
+        try:
+            for batch in pf.iter_batches(batch_size=chunk_size, columns=needed):
+                df = apply_filter(batch.to_pandas(types_mapper=types), where, out_cols)
+                if len(df):
+                    sink.write(df)
+                    written += len(df)
+        finally:
+            sink.close()
+    return written
+
+
+def process_one(path, out, where, columns, cache_dir, known, engine, chunk_size):
+    """Задача для пулу процесів; помилки повертаються, а не зупиняють пакет."""
+    t0 = time.perf_counter()
+    result = {"path": path, "entry": known, "converted": False, "rows": 0, "error": None}
+    try:
+        parquet, result["entry"], result["converted"] = cached_parquet(path, cache_dir, known, engine)
+        result["rows"] = filter_parquet(parquet, out, where, columns, chunk_size)
+    except (Exception, SystemExit) as e:
+        result["error"] = str(e)
+    result["seconds"] = time.perf_counter() - t0
+    return result
+
+
+def find_workbooks(src):
+    return sorted(
+        os.path.join(src, name) for name in os.listdir(src)
+        if name.lower().endswith(EXTENSIONS) and not name.startswith("~$")  # ~$ — lock-файли Excel
+    )
+
+
+def run_batch(src, out_dir, where=None, columns=None, fmt="parquet", workers=None,
+              cache_dir=CACHE_DIR, engine="auto", chunk_size=DEFAULT_CHUNK):
+    os.makedirs(cache_dir, exist_ok=True)
+    os.makedirs(out_dir, exist_ok=True)
+    index = load_index(cache_dir)
+    books = find_workbooks(src)
+
+    # результат називається за іменем книги без розширення: a.xlsx і a.xlsm
+    # (або A.xlsx на нечутливій до регістру ФС) перезаписали б один одного
+    by_stem = {}
+    for path in books:
+        by_stem.setdefault(os.path.splitext(os.path.basename(path))[0].lower(), []).append(path)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for path in books:
+            key = os.path.abspath(path)
+            stem = os.path.splitext(os.path.basename(path))[0]
+            clash = [os.path.basename(p) for p in by_stem[stem.lower()] if p != path]
+            if clash:
+                results.append({"path": path, "entry": index.get(key), "converted": False, "rows": 0,
+                                "error": f"той самий результат {stem}.{fmt}, що й у {', '.join(clash)}",
+                                "seconds": 0.0})
+                continue
+            out = os.path.join(out_dir, f"{stem}.{fmt}")
+            futures.append(pool.submit(process_one, path, out, where, columns, cache_dir,
+                                       index.get(key), engine, chunk_size))
+        for fut in as_completed(futures):
+            r = fut.result()
+            if r["entry"]:
+                index[os.path.abspath(r["path"])] = r["entry"]
+            results.append(r)
+
+    save_index(cache_dir, index)
+    return sorted(results, key=lambda r: r["path"])
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Пакетна фільтрація Excel-файлів з Parquet-кешем")
+    ap.add_argument("src", help="каталог з *.xlsx")
+    ap.add_argument("-o", "--output", default="filtered", help="каталог результатів")
+    ap.add_argument("-w", "--where", default=None, help="вираз фільтра (pandas query)")
+    ap.add_argument("-c", "--columns", nargs="*", help="стовпці результату (типово — усі)")
+    ap.add_argument("--format", default="parquet", choices=[ext[1:] for ext in SINKS])
+    ap.add_argument("--workers", type=int, default=None, help="процесів (типово — кількість ядер)")
+    ap.add_argument("--cache", default=CACHE_DIR, help="каталог Parquet-кешу")
+    ap.add_argument("--engine", default="auto", choices=["auto", "calamine", "openpyxl"])
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    results = run_batch(args.src, args.output, args.where, args.columns, args.format,
+                        args.workers, args.cache, args.engine, args.chunk_size)
+
+    for r in results:
+        status = f"помилка: {r['error']}" if r["error"] else ("конвертовано" if r["converted"] else "з кешу")
+        print(f"{os.path.basename(r['path']):40} {r['rows']:9} рядків  {r['seconds']:7.2f} с  {status}")
+    converted = sum(r["converted"] for r in results)
+    cached = sum(not r["converted"] and not r["error"] for r in results)
+    errors = sum(bool(r["error"]) for r in results)
+    print(f"Файлів: {len(results)} (конвертовано {converted}, з кешу {cached}, "
+          f"помилок {errors}); рядків: {sum(r['rows'] for r in results)}; "
+          f"{time.perf_counter() - t0:.2f} с")
+
+
+if __name__ == "__main__":
+    main()
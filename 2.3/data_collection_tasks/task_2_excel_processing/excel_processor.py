@@ -1,15 +1,304 @@
 # excel_processor.py
+"""
+Потокова фільтрація великих Excel-файлів.
+
+    python excel_processor.py                                   # data.xlsx, Score > 80 -> filtered_data.xlsx
+    python excel_processor.py export.xlsx -w "Score > 80 and City == 'Київ'" \
+        -c Name Score -o filtered.parquet --chunk-size 50000
+
+- книга читається порціями по chunk_size рядків (openpyxl read_only
+  або calamine), з кожної порції беруться лише потрібні стовпці:
+  ті, що згадані у фільтрі, та ті, що йдуть у результат;
+- фільтр — вираз pandas.DataFrame.query; назви з пробілами — у `зворотних лапках`;
+- результат пишеться порціями: *.xlsx (write-only книга), *.csv, *.parquet —
+  у тимчасовий файл, який потім атомарно замінює попередній результат.
+
+Пам'ять обмежена розміром порції, а не розміром файлу.
+"""
+import argparse
+import csv
+import io
+import os
+import re
+import time
+import tokenize
+from contextlib import contextmanager
+
 import pandas as pd
 
-# Прочитати Excel
-df = pd.read_excel("data.xlsx")
+DEFAULT_FILTER = "Score > 80"
+DEFAULT_CHUNK = 50_000
+
+
+# ---------------- читання ----------------
+def _rows_openpyxl(path, sheet):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        yield from ws.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def _rows_calamine(path, sheet):
+    from python_calamine import CalamineWorkbook
+
+    wb = CalamineWorkbook.from_path(path)
+    ws = wb.get_sheet_by_name(sheet) if sheet else wb.get_sheet_by_index(0)
+    yield from ws.iter_rows()
+
+
+READERS = {"openpyxl": _rows_openpyxl, "calamine": _rows_calamine}
+
+
+def pick_engine(engine="auto"):
+    if engine != "auto":
+        return engine
+    try:
+        import python_calamine  # noqa: F401
+        return "calamine"
+    except ImportError:
+        return "openpyxl"
+
+
+def _cell(v):
+    # calamine віддає порожню клітинку як '', openpyxl — як None
+    if v == "":
+        return None
+    # Excel зберігає всі числа як float; цілі повертаємо як int (так само робить pandas)
+    if type(v) is float and v.is_integer():
+        return int(v)
+    return v
+
+
+def referenced_columns(expr, header):
+    """Стовпці заголовка, згадані у виразі (як ім'я або в `зворотних лапках`)."""
+    names = set(re.findall(r"`([^`]+)`", expr))
+    plain = re.sub(r"`[^`]+`", " ", expr)
+    for tok in tokenize.generate_tokens(io.StringIO(plain).readline):
+        if tok.type == tokenize.NAME:
+            names.add(tok.string)
+    return [c for c in header if c in names]
+
+
+def plan_columns(header, columns=None, where=None):
+    """(стовпці результату, стовпці для читання) з перевіркою назв."""
+    out_cols = list(columns) if columns else list(header)
+    missing = [c for c in out_cols if c not in header]
+    if missing:
+        raise SystemExit(f"У файлі немає стовпців: {', '.join(missing)}")
+
+    used = referenced_columns(where, header) if where else []
+    if where and not used:
+        raise SystemExit(f"Фільтр '{where}' не згадує жодного стовпця файлу. Стовпці: {', '.join(header)}")
+    return out_cols, out_cols + [c for c in used if c not in out_cols]
+
+
+def _int_columns(df):
+    # цілий стовпець з порожніми клітинками (або з дробовими, що не пройшли фільтр)
+    # pandas тримає як float64; повертаємо його цілим — Int64, порожні — pd.NA
+    for col in df.columns:
+        values = df[col]
+        if values.dtype.kind == "f" and len(values) and (values.dropna() % 1 == 0).all():
+            df[col] = values.astype("Int64")
+    return df
+
+
+def apply_filter(df, where, out_cols):
+    if where:
+        df = df.query(where)
+    return _int_columns(df[out_cols].copy())
+
+
+def read_chunks(path, columns=None, where=None, chunk_size=DEFAULT_CHUNK, engine="auto", sheet=None):
+    """Генератор DataFrame-порцій з уже застосованим фільтром.
+
+    columns — стовпці результату (None — усі); where — вираз фільтра.
+    Якщо під заголовком немає рядків, віддає одну порожню порцію зі стовпцями результату.
+    """
+    rows = READERS[pick_engine(engine)](path, sheet)
+    header = next(rows, None)
+    if header is None:
+        return
+    header = [str(h) if h is not None else f"col{i}" for i, h in enumerate(header)]
+
+    out_cols, needed = plan_columns(header, columns, where)
+    idx = [header.index(c) for c in needed]
+
+    batch, yielded = [], False
+    for row in rows:
+        batch.append([_cell(row[i]) if i < len(row) else None for i in idx])
+        if len(batch) >= chunk_size:
+            yield apply_filter(pd.DataFrame.from_records(batch, columns=needed), where, out_cols)
+            batch, yielded = [], True
+    if batch or not yielded:
+        yield apply_filter(pd.DataFrame.from_records(batch, columns=needed), where, out_cols)
+
+
+# ---------------- запис ----------------
+def _records(df):
+    # NaN / pd.NA (порожня клітинка) -> None: у CSV — порожнє поле, у xlsx — порожня клітинка
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+# schema (pyarrow) — стовпці результату на випадок, коли жодна порція не пройшла
+# фільтр: файл однаково створюється, з заголовком / схемою й без рядків
+class XlsxSink:
+    def __init__(self, path, schema=None):
+        from openpyxl import Workbook
+
+        self.path = path
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet()
+        self._header = False
+        self._schema = schema
+
+    def write(self, df):
+        if not self._header:
+            self._ws.append(list(df.columns))
+            self._header = True
+        for row in _records(df):
+            self._ws.append(row)
+
+    def close(self):
+        if not self._header and self._schema is not None:
+            self._ws.append(self._schema.names)
+        self._wb.save(self.path)
+
+
+class CsvSink:
+    def __init__(self, path, schema=None):
+        self._file = open(path, "w", newline='', encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._header = False
+        self._schema = schema
+
+    def write(self, df):
+        if not self._header:
+            self._writer.writerow(df.columns)
+            self._header = True
+        self._writer.writerows(_records(df))
+
+    def close(self):
+        if not self._header and self._schema is not None:
+            self._writer.writerow(self._schema.names)
+        self._file.close()
+
+
+class ParquetSink:
+    """Схема файлу — типи першої порції. Якщо наступна порція їх розширює
+    (дробове число в цілому стовпці, значення в досі порожньому), уже записане
+    переписується з новою схемою; несумісні типи (число і текст) — помилка."""
+
+    def __init__(self, path, schema=None):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit("Для Parquet потрібен pyarrow: pip install pyarrow")
+        self._pa, self._pq = pa, pq
+        self.path = path
+        self._writer = None
+        self._schema = schema
+
+    def _widen(self, schema):
+        pa, pq = self._pa, self._pq
+        self._writer.close()
+        narrow = f"{self.path}.narrow"
+        os.replace(self.path, narrow)
+        self._writer = pq.ParquetWriter(self.path, schema, compression="zstd")
+        try:
+            with pq.ParquetFile(narrow) as pf:
+                for batch in pf.iter_batches():
+                    self._writer.write_table(pa.Table.from_batches([batch]).cast(schema))
+        finally:
+            os.remove(narrow)
+
+    def write(self, df):
+        pa = self._pa
+        try:
+            schema = pa.Schema.from_pandas(df, preserve_index=False).remove_metadata()
+            if self._writer is None:
+                self._writer = self._pq.ParquetWriter(self.path, schema, compression="zstd")
+            elif not schema.equals(self._writer.schema):
+                merged = pa.unify_schemas([self._writer.schema, schema], promote_options="permissive")
+                if not merged.equals(self._writer.schema):
+                    self._widen(merged)
+            table = pa.Table.from_pandas(df, schema=self._writer.schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise SystemExit(f"Стовпець містить значення несумісних типів ({e}); пишіть у CSV")
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        elif self._schema is not None:
+            self._pq.write_table(self._schema.empty_table(), self.path, compression="zstd")
+
+
+SINKS = {".xlsx": XlsxSink, ".csv": CsvSink, ".parquet": ParquetSink}
+
+
+def open_sink(path, schema=None):
+    for ext, cls in SINKS.items():
+        if path.lower().endswith(ext):
+            return cls(path, schema)
+    raise SystemExit(f"Невідомий формат результату: {path} (підтримуються {', '.join(SINKS)})")
+
+
+@contextmanager
+def replacing(out):
+    """Тимчасовий шлях поруч з out: після успішного блоку файл атомарно замінює out,
+    після помилки — видаляється. out завжди або новий, або попередній цілком."""
+    root, ext = os.path.splitext(out)
+    tmp = f"{root}.{os.getpid()}.tmp{ext}"  # розширення лишається — за ним обирається формат
+    try:
+        yield tmp
+        os.replace(tmp, out)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def process(src, out, where=DEFAULT_FILTER, columns=None, chunk_size=DEFAULT_CHUNK, engine="auto", sheet=None):
+    """Фільтрує src у out; повертає кількість записаних рядків.
+    Якщо жоден рядок не пройшов фільтр, out — заголовок (схема) без рядків."""
+    with replacing(out) as tmp:
+        sink = open_sink(tmp)
+        written, first = 0, True
+        try:
+            for df in read_chunks(src, columns, where, chunk_size, engine, sheet):
+                # перша порція пишеться й порожньою — від неї заголовок і типи стовпців
+                if len(df) or first:
+                    sink.write(df)
+                    written += len(df)
+                first = False
+        finally:
+            sink.close()
+        if first:
+            raise SystemExit(f"У {src} немає заголовка")
+    return written
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Фільтрація Excel-файлу порціями")
+    ap.add_argument("input", nargs="?", default="data.xlsx")
+    ap.add_argument("-o", "--output", default="filtered_data.xlsx", help="*.xlsx, *.csv або *.parquet")
+    ap.add_argument("-w", "--where", default=DEFAULT_FILTER, help='вираз фільтра, напр. "Score > 80 and `Місто` == \'Київ\'"')
+    ap.add_argument("-c", "--columns", nargs="*", help="стовпці результату (типово — усі)")
+    ap.add_argument("--sheet", help="аркуш (типово — перший)")
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK)
+    ap.add_argument("--engine", default="auto", choices=["auto", "calamine", "openpyxl"])
+    args = ap.parse_args(argv)
 
-# Приклад фільтра: залишити тільки Score > 80
-if "Score" not in df.columns:
-    raise SystemExit("У файлі має бути стовпець 'Score'")
+    t0 = time.perf_counter()
+    n = process(args.input, args.output, args.where or None, args.columns,
+                args.chunk_size, args.engine, args.sheet)
+    print(f"Збережено {n} рядків у {args.output} за {time.perf_counter() - t0:.2f} с")
 
-filtered = df[df["Score"] > 80]
 
-# Зберегти результат
-filtered.to_excel("filtered_data.xlsx", index=False)
-print(f"Збережено {len(filtered)} рядків у filtered_data.xlsx")
+if __name__ == "__main__":
+    main()
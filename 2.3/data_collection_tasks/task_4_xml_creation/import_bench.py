@@ -0,0 +1,99 @@
+# import_bench.py
+"""
+Замір імпорту на згенерованому великому файлі: записів/с, МБ/с, пік RSS.
+
+    python import_bench.py --size-mb 1024                       # лише розбір і перевірка
+    python import_bench.py --size-mb 1024 --dsn postgresql://…  # + COPY у БД Practice58
+
+Файл генерується тим самим потоковим записом (xml_creator.xml_stream) у
+форматі export_documents.py з довідниками Practice58 (J1…J7, БД, Сектор А…).
+Імпорт запускається окремим процесом — пік RSS належить лише йому.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from xml_creator import xml_stream
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+UNITS = [("J1", "Особовий склад"), ("J2", "Розвідка"), ("J3", "Операції"), ("J4", "Логістика"),
+         ("J5", "Планування"), ("J6", "Зв’язок / ІТ"), ("J7", "Підготовка")]
+SECTORS = ["Сектор А", "Сектор Б", "Сектор В", None]
+DOC_TYPES = ["ПБД", "БД", "БЧС", "ЗВІТ", "РОЗП"]
+STATUSES = ["отримано", "в_роботі", "доведено", "прострочено"]
+
+
+def generate(path, size_mb, seed=7):
+    rng = random.Random(seed)
+    target = size_mb * 2**20
+    start = datetime(2025, 1, 1)
+    n = 0
+    with xml_stream(path, "documents", {"exported_at": datetime.now().replace(microsecond=0)}) as write:
+        while True:
+            for _ in range(10_000):
+                n += 1
+                code, name = rng.choice(UNITS)
+                doc_type = rng.choice(DOC_TYPES)
+                received = start + timedelta(minutes=rng.randint(0, 525_600))
+                status = rng.choice(STATUSES)
+                processed = received + timedelta(minutes=rng.randint(5, 240)) if status != "отримано" else None
+                delivered = processed + timedelta(minutes=rng.randint(5, 240)) if status == "доведено" else None
+                write("document", {
+                    "reg_number": f"{doc_type}-{n:08d}",
+                    "title": f"{doc_type}: донесення №{n} ({code}) — обстановка у смузі відповідальності",
+                    "doc_date": received - timedelta(minutes=rng.randint(0, 30)),
+                    "doc_type": doc_type,
+                    "sector": rng.choice(SECTORS),
+                    "status": status,
+                    "priority": rng.choice((1, 2, 2, 3)),
+                    "received_at": received,
+                    "processed_at": processed,
+                    "delivered_at": delivered,
+                    "unit": {"code": code, "name": name},
+                }, {"id": n})
+            if os.path.getsize(write.path) >= target:  # буфер ще не скинуто — похибка до 1 МБ
+                return n
+
+
+def run_import(path, dsn=None, batch=10_000):
+    cmd = [sys.executable, os.path.join(HERE, "import_xml.py"), path, "--json", "--batch", str(batch)]
+    cmd += ["--dsn", dsn] if dsn else ["--dry-run"]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Бенчмарк потокового імпорту XML")
+    ap.add_argument("--size-mb", type=int, default=1024)
+    ap.add_argument("--file", default=os.path.join(HERE, "bench_documents.xml"))
+    ap.add_argument("--dsn", help="БД зі схемою Practice58; без неї — лише розбір і перевірка")
+    ap.add_argument("--batch", type=int, default=10_000)
+    ap.add_argument("--keep", action="store_true", help="не видаляти згенерований файл")
+    args = ap.parse_args(argv)
+
+    if not os.path.exists(args.file) or os.path.getsize(args.file) < args.size_mb * 2**20 * 0.99:
+        t0 = time.perf_counter()
+        n = generate(args.file, args.size_mb)
+        print(f"згенеровано {n} документів, {os.path.getsize(args.file) / 2**20:.0f} МБ "
+              f"за {time.perf_counter() - t0:.1f} с")
+
+    try:
+        runs = [("розбір + перевірка", None)] + ([("+ COPY у БД", args.dsn)] if args.dsn else [])
+        print(f"{'режим':20} {'записів':>9} {'с':>7} {'зап/с':>8} {'МБ/с':>6} {'пік RSS МБ':>11} {'у БД':>9}")
+        for label, dsn in runs:
+            s = run_import(args.file, dsn, args.batch)
+            print(f"{label:20} {s['records']:9} {s['elapsed_s']:7.1f} {s['records'] / s['elapsed_s']:8.0f} "
+                  f"{s['size_mb'] / s['elapsed_s']:6.1f} {s.get('peak_rss_mb', 0):11.1f} {s['loaded']:9}")
+    finally:
+        if not args.keep:
+            os.remove(args.file)
+
+
+if __name__ == "__main__":
+    main()
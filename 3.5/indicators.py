@@ -0,0 +1,257 @@
+# indicators.py
+"""
+Похідні показники GlobalFirePower (3.5): на душу населення, відношення,
+щільність на площу, нормалізація і PCA через SVD — векторно над усією
+таблицею, а для кількох років — над стосом (роки × країни × стовпці).
+
+    from indicators import load_years, compute, to_frame
+
+    stack = load_years()                                   # GlobalFirePower.csv через datasets/registry.py
+    stack = load_years({2021: "gfp_2021.csv", 2022: "gfp_2022.csv"})
+    result = compute(stack, n_components=5)                # кеш за хешем вхідного масиву
+    df = to_frame(stack, result, year=2022)                # показники + компоненти PCA для року
+
+    python indicators.py                                   # головні компоненти поточного набору
+    python indicators.py --bench-years 50                  # час на 50 синтетичних років
+
+- роки вирівнюються за ISO3: країна, якої немає в році, — рядок NaN;
+- ділення на нуль і відсутні значення дають NaN, а не inf;
+- нормалізація і PCA — окремо для кожного року (вісь країн), з пропуском
+  NaN; SVD — одним пакетним викликом np.linalg.svd на весь стос;
+- результат compute кешується на диску (joblib.Memory, як у 4.3) за хешем
+  масиву і параметрів: повторний виклик на тих самих даних не рахує нічого.
+"""
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+import joblib
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+CACHE_DIR = os.path.join(HERE, ".cache")
+
+memory = joblib.Memory(CACHE_DIR, verbose=0)
+
+POPULATION = "Total Population"
+LAND_AREA = "Square Land Area (km)"
+
+# на 1 млн населення
+PER_CAPITA = [
+    "Total Military Personnel", "Active Personnel", "Reserve Personnel", "Total Aircraft Strength",
+    "Fighter Aircraft", "Total Helicopter Strength", "Combat Tanks", "Armored Fighting Vehicles",
+    "Self-Propelled Artillery", "Towed Artillery", "Rocket Projectors", "Total Naval Assets",
+    "Submarines", "Defense Budget", "Labor Force",
+]
+# на 1000 км² території
+DENSITY = [
+    "Combat Tanks", "Roadway Coverage (km)", "Railway Coverage (km)", "Serivecable Airports",
+    "Major Ports / Terminals",
+]
+RATIOS = {
+    "active_share": ("Active Personnel", "Total Military Personnel"),
+    "reserve_to_active": ("Reserve Personnel", "Active Personnel"),
+    "fit_share": ("Fit-for-Service", "Manpower Available"),
+    "fighter_share": ("Fighter Aircraft", "Total Aircraft Strength"),
+    "attack_heli_share": ("Attack Helicopters", "Total Helicopter Strength"),
+    "budget_to_ppp": ("Defense Budget", "Purchasing Power Parity"),
+    "budget_per_soldier": ("Defense Budget", "Active Personnel"),
+    "debt_to_ppp": ("External Debt", "Purchasing Power Parity"),
+    "reserves_to_ppp": ("Foreign Exchange / Gold", "Purchasing Power Parity"),
+    "oil_self_sufficiency": ("Production (bbl/dy)", "Consumption (bbl/dy)"),
+    "tanks_per_soldier": ("Combat Tanks", "Active Personnel"),
+    "coast_to_border": ("Coastline (km)", "Shared Borders (km)"),
+}
+
+
+@dataclass
+class YearStack:
+    values: np.ndarray        # (роки, країни, стовпці), float64
+    years: list
+    countries: np.ndarray     # ISO3
+    names: np.ndarray         # назви країн
+    columns: list
+
+    def column(self, name):
+        return self.values[..., self.columns.index(name)]
+
+
+def _registry():
+    sys.path.insert(0, os.path.join(ROOT, "datasets"))
+    import registry
+    return registry
+
+
+def stack(frames):
+    """{рік: DataFrame GlobalFirePower} -> YearStack; країни — об'єднання ISO3 усіх років."""
+    years = list(frames)
+    columns = [c for c in frames[years[0]].select_dtypes("number").columns if c != "Rank"]
+    countries = pd.Index(sorted(set().union(*(f["ISO3"] for f in frames.values()))))
+    names = pd.concat([f.set_index("ISO3")["Country"] for f in frames.values()])
+    names = names[~names.index.duplicated(keep="last")].reindex(countries)
+    values = np.stack([f.set_index("ISO3")[columns].reindex(countries).to_numpy(np.float64)
+                       for f in frames.values()])
+    return YearStack(values, years, countries.to_numpy(), names.to_numpy(), columns)
+
+
+def load_years(paths=None):
+    """{рік: шлях до CSV} (типово — 3.5/GlobalFirePower.csv як один рік) через реєстр наборів."""
+    registry = _registry()
+    if paths is None:
+        return stack({"gfp": registry.load("gfp")})
+    base = registry.get("gfp")
+    frames = {}
+    for year, path in paths.items():
+        schema = registry.register(registry.Schema(f"gfp_{year}", os.path.abspath(path), dict(base.dtypes),
+                                                   dict(base.rename), dict(base.na_values)))
+        frames[year] = registry.load(schema.name)
+    return stack(frames)
+
+
+# ---------------- показники ----------------
+def _divide(num, den):
+    out = np.full(np.broadcast_shapes(num.shape, den.shape), np.nan)
+    np.divide(num, den, out=out, where=(den != 0) & ~np.isnan(den))
+    return out
+
+
+def indicators(values, columns):
+    """(..., стовпці) -> ((..., показники), назви); per-capita і density — логарифмовані (log1p)."""
+    idx = {c: i for i, c in enumerate(columns)}
+    pop = values[..., idx[POPULATION], None]
+    area = values[..., idx[LAND_AREA], None]
+    per_capita = _divide(values[..., [idx[c] for c in PER_CAPITA]] * 1e6, pop)
+    density = _divide(values[..., [idx[c] for c in DENSITY]] * 1e3, area)
+    num, den = zip(*RATIOS.values())
+    ratios = _divide(values[..., [idx[c] for c in num]], values[..., [idx[c] for c in den]])
+    out = np.concatenate([np.log1p(per_capita), np.log1p(density), ratios], axis=-1)
+    names = ([f"log_{c}_per_1m" for c in PER_CAPITA] + [f"log_{c}_per_1000km2" for c in DENSITY]
+             + list(RATIOS))
+    return out, names
+
+
+def normalize(x, method="zscore"):
+    """Нормалізація по осі країн (-2) окремо для кожного року й показника, NaN пропускаються."""
+    if method == "zscore":
+        center, scale = np.nanmean(x, axis=-2, keepdims=True), np.nanstd(x, axis=-2, keepdims=True)
+    elif method == "minmax":
+        center = np.nanmin(x, axis=-2, keepdims=True)
+        scale = np.nanmax(x, axis=-2, keepdims=True) - center
+    elif method == "robust":
+        q1, center, q3 = np.nanpercentile(x, [25, 50, 75], axis=-2, keepdims=True)
+        scale = q3 - q1
+    else:
+        raise ValueError(f"Невідомий метод нормалізації: {method}")
+    return _divide(x - center, scale)
+
+
+def decompose(z, n_components=5):
+    """PCA нормалізованих показників (..., країни, ознаки) одним пакетним SVD.
+
+    Пропуски -> 0 (середнє після z-score); знак компоненти фіксується так,
+    щоб найбільше за модулем навантаження було додатним.
+    """
+    filled = np.nan_to_num(z - np.nanmean(z, axis=-2, keepdims=True), nan=0.0)
+    u, s, vt = np.linalg.svd(filled, full_matrices=False)
+    k = min(n_components, s.shape[-1])
+    u, s, vt = u[..., :k], s[..., :k], vt[..., :k, :]
+    top = np.take_along_axis(vt, np.abs(vt).argmax(axis=-1)[..., None], axis=-1)
+    sign = np.where(top < 0, -1.0, 1.0)                  # (..., k, 1)
+    vt = vt * sign
+    scores = u * s[..., None, :] * np.swapaxes(sign, -1, -2)
+    total = (filled ** 2).sum(axis=(-2, -1))[..., None]
+    return scores, vt, _divide(s ** 2, total)
+
+
+def _compute(values, columns, n_components, method):
+    x, names = indicators(values, columns)
+    z = normalize(x, method)
+    scores, loadings, explained = decompose(z, n_components)
+    missing = np.isnan(values).all(axis=-1)               # країни немає в цьому році
+    scores[missing] = np.nan
+    return {"indicators": x, "normalized": z, "names": names, "scores": scores,
+            "loadings": loadings, "explained": explained}
+
+
+_cached_compute = memory.cache(_compute)
+
+
+def compute(stack, n_components=5, method="zscore", cache=True):
+    """Усі показники, нормалізація і PCA для кожного року стосу."""
+    fn = _cached_compute if cache else _compute
+    return fn(stack.values, tuple(stack.columns), n_components, method)
+
+
+def to_frame(stack, result, year=None):
+    """Показники + компоненти PCA одного року (типово — останнього) як DataFrame за ISO3."""
+    i = stack.years.index(year) if year is not None else len(stack.years) - 1
+    k = result["scores"].shape[-1]
+    data = np.concatenate([result["indicators"][i], result["scores"][i]], axis=1)
+    frame = pd.DataFrame(data, columns=result["names"] + [f"PC{j + 1}" for j in range(k)],
+                         index=pd.Index(stack.countries, name="ISO3"))
+    frame.insert(0, "Country", stack.names)
+    return frame
+
+
+def loadings_frame(result, year_index=-1, top=5):
+    """Найбільші за модулем навантаження кожної компоненти."""
+    rows = []
+    for j, (vec, share) in enumerate(zip(result["loadings"][year_index], result["explained"][year_index])):
+        for i in np.abs(vec).argsort()[::-1][:top]:
+            rows.append({"component": f"PC{j + 1}", "explained": round(float(share), 3),
+                         "indicator": result["names"][i], "loading": round(float(vec[i]), 3)})
+    return pd.DataFrame(rows)
+
+
+# ---------------- вимір ----------------
+def synthetic_years(stack, n_years, seed=0):
+    """n_years копій року з мультиплікативним шумом ±10% і випадково відсутніми країнами."""
+    rng = np.random.default_rng(seed)
+    base = stack.values[-1]
+    values = base * rng.uniform(0.9, 1.1, size=(n_years,) + base.shape)
+    values[rng.random((n_years, base.shape[0])) < 0.05] = np.nan
+    return YearStack(values, list(range(2000, 2000 + n_years)), stack.countries, stack.names, stack.columns)
+
+
+def bench(stack, n_years=50, repeat=5):
+    big = synthetic_years(stack, n_years)
+    timings = {}
+    for label, cache in [("без кешу", False), ("з кешу", True)]:
+        compute(big, cache=cache)  # прогрів / заповнення кешу
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            compute(big, cache=cache)
+        timings[label] = (time.perf_counter() - t0) / repeat
+    return big.values.shape, timings
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Похідні показники і PCA GlobalFirePower")
+    ap.add_argument("--components", type=int, default=5)
+    ap.add_argument("--method", choices=["zscore", "minmax", "robust"], default="zscore")
+    ap.add_argument("--bench-years", type=int, help="виміряти час на N синтетичних роках")
+    args = ap.parse_args(argv)
+
+    data = load_years()
+    if args.bench_years:
+        shape, timings = bench(data, args.bench_years)
+        print(f"Стос {shape[0]} років × {shape[1]} країн × {shape[2]} стовпців:")
+        for label, seconds in timings.items():
+            print(f"  {label}: {seconds * 1000:.1f} мс")
+        return
+
+    result = compute(data, args.components, args.method)
+    frame = to_frame(data, result)
+    with pd.option_context("display.width", 200, "display.max_columns", 12):
+        print(loadings_frame(result).to_string(index=False))
+        print()
+        print(frame[["Country", "PC1", "PC2", "budget_to_ppp", "active_share"]]
+              .sort_values("PC1", ascending=False).head(10).round(3))
+
+
+if __name__ == "__main__":
+    main()
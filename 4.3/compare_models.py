@@ -0,0 +1,185 @@
+# compare_models.py
+"""
+Порівняння регресійних моделей (4.3) k-fold крос-валідацією на всіх ядрах.
+
+    python compare_models.py                                  # boston.csv, MEDV, 5 фолдів
+    python compare_models.py --data train.csv --target SalePrice --categorical -o results.csv
+    python compare_models.py --models RidgeCV,LassoCV,HistGradientBoosting   # лише частина моделей
+
+- попередня обробка (preprocessing.py) навчається один раз на фолд і кешується,
+  моделі отримують уже готові масиви;
+- кожна пара (модель+параметри, фолд) — окрема задача joblib на всіх ядрах;
+- RidgeCV / LassoCV проходять увесь шлях регуляризації за одне навчання
+  замість ручного перебору alpha;
+- ансамблі з warm_start нарощують кількість дерев: 50 → 100 → 200 —
+  це одне навчання, а не три;
+- для великих наборів (Kaggle, десятки тисяч рядків) бустинг гістограмний
+  (HistGradientBoosting: ознаки розбиті на ≤255 кошиків), а випадковий ліс
+  бере 1/3 ознак на розбиття — обидва в рази швидші за класичні варіанти;
+- результат — таблиця R² / RMSE / час навчання для кожної конфігурації.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from scipy import sparse
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Lasso, LassoCV, LinearRegression, Ridge, RidgeCV
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import KFold
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeRegressor
+
+from preprocessing import fitted_preprocessor, guess_target, load
+
+ALPHAS = np.logspace(-3, 3, 61)
+LASSO_ALPHAS = np.logspace(-4, 1, 60)  # явна сітка: параметр n_alphas прибрано в нових sklearn
+
+# (назва, клас, список параметрів) — як у ноутбуці, плюс CV-варіанти
+GRID = [
+    ("LinearRegression", LinearRegression, [{}]),
+    ("Ridge", Ridge, [{"alpha": a} for a in (0.1, 1.0, 10.0)]),
+    ("Lasso", Lasso, [{"alpha": a, "max_iter": 10_000} for a in (0.01, 0.1, 1.0)]),
+    ("RidgeCV", RidgeCV, [{"alphas": ALPHAS}]),
+    ("LassoCV", LassoCV, [{"alphas": LASSO_ALPHAS, "cv": 5, "max_iter": 10_000}]),
+    ("DecisionTree", DecisionTreeRegressor, [{"max_depth": d, "random_state": 0} for d in (3, 5, 8, None)]),
+]
+
+# (назва, клас, параметр, що нарощується, його значення, решта параметрів)
+WARM_START = [
+    ("HistGradientBoosting", HistGradientBoostingRegressor, "max_iter", (50, 100, 200, 400),
+     {"learning_rate": 0.05, "early_stopping": False, "random_state": 0}),
+    ("RandomForest", RandomForestRegressor, "n_estimators", (50, 100, 200),
+     {"max_features": 1 / 3, "random_state": 0, "n_jobs": 1}),
+]
+
+# моделі, що не приймають розріджених матриць
+DENSE_ONLY = (HistGradientBoostingRegressor,)
+
+
+def _params_text(params):
+    hidden = ("alphas", "random_state", "n_jobs", "max_iter", "early_stopping")
+    return ", ".join(f"{k}={v:.3g}" if isinstance(v, float) else f"{k}={v}"
+                     for k, v in params.items() if k not in hidden)
+
+
+def _scores(y_true, y_pred):
+    return r2_score(y_true, y_pred), mean_squared_error(y_true, y_pred) ** 0.5
+
+
+def prepare_folds(X, y, folds=5, k="all", categorical=False, seed=42):
+    """Для кожного фолду: (X_train, X_test, y_train, y_test) — вже оброблені й масштабовані."""
+    out = []
+    for train_idx, test_idx in KFold(folds, shuffle=True, random_state=seed).split(X):
+        X_tr, X_te = X.iloc[train_idx], X.iloc[test_idx]
+        y_tr, y_te = y.iloc[train_idx], y.iloc[test_idx]
+        prep = fitted_preprocessor(X_tr, y_tr, k, categorical)  # з кешу при повторному запуску
+        A_tr, A_te = prep.transform(X_tr), prep.transform(X_te)
+        # масштаб потрібен Ridge/Lasso; для розріджених one-hot — без центрування
+        scaler = StandardScaler(with_mean=not sparse.issparse(A_tr)).fit(A_tr)
+        out.append((scaler.transform(A_tr), scaler.transform(A_te), y_tr.to_numpy(), y_te.to_numpy()))
+    return out
+
+
+def fit_one(name, cls, params, fold, data):
+    X_tr, X_te, y_tr, y_te = data
+    model = cls(**params)
+    t0 = time.perf_counter()
+    model.fit(X_tr, y_tr)
+    fit_s = time.perf_counter() - t0
+    r2, rmse = _scores(y_te, model.predict(X_te))
+    alpha = getattr(model, "alpha_", None)
+    return [{"model": name, "params": _params_text(params), "fold": fold, "r2": r2, "rmse": rmse,
+             "fit_s": fit_s, "alpha": alpha, "warm": False}]
+
+
+def fit_warm(name, cls, grow, steps, params, fold, data):
+    """Одне навчання з warm_start: оцінка після кожного кроку."""
+    X_tr, X_te, y_tr, y_te = data
+    if issubclass(cls, DENSE_ONLY) and sparse.issparse(X_tr):
+        X_tr, X_te = X_tr.toarray(), X_te.toarray()
+    model = cls(warm_start=True, **params)
+    rows, total = [], 0.0
+    for n in steps:
+        model.set_params(**{grow: n})
+        t0 = time.perf_counter()
+        model.fit(X_tr, y_tr)
+        total += time.perf_counter() - t0  # час, який коштувало б окреме навчання до n
+        r2, rmse = _scores(y_te, model.predict(X_te))
+        text = ", ".join(filter(None, (_params_text(params), f"{grow}={n}")))
+        rows.append({"model": name, "params": text, "fold": fold, "r2": r2, "rmse": rmse, "fit_s": total, "alpha": None, "warm": True})
+    return rows
+
+
+def select_models(names, grid=GRID, warm=WARM_START):
+    """Лише вказані моделі (назви з GRID / WARM_START)."""
+    known = {g[0] for g in grid} | {w[0] for w in warm}
+    unknown = set(names) - known
+    if unknown:
+        raise SystemExit(f"Невідомі моделі: {', '.join(sorted(unknown))} (є: {', '.join(sorted(known))})")
+    return [g for g in grid if g[0] in names], [w for w in warm if w[0] in names]
+
+
+def run(X, y, folds=5, n_jobs=-1, k="all", categorical=False, grid=GRID, warm=WARM_START):
+    fold_data = prepare_folds(X, y, folds, k, categorical)
+    tasks = []
+    for i, data in enumerate(fold_data):
+        for name, cls, param_list in grid:
+            for params in param_list:
+                tasks.append(delayed(fit_one)(name, cls, params, i, data))
+        for name, cls, grow, steps, params in warm:
+            tasks.append(delayed(fit_warm)(name, cls, grow, steps, params, i, data))
+
+    # великі масиви joblib передає воркерам через memmap, без копій
+    results = Parallel(n_jobs=n_jobs)(tasks)
+    return pd.DataFrame([row for rows in results for row in rows])
+
+
+def summarize(raw):
+    table = (raw.groupby(["model", "params"], sort=False)
+             .agg(r2_mean=("r2", "mean"), r2_std=("r2", "std"), rmse_mean=("rmse", "mean"),
+                  fit_s_mean=("fit_s", "mean"), fit_s_total=("fit_s", "sum"), alpha=("alpha", "mean"))
+             .reset_index()
+             .sort_values("r2_mean", ascending=False, ignore_index=True))
+    return table
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="k-fold порівняння регресійних моделей")
+    ap.add_argument("--data", default="boston.csv")
+    ap.add_argument("--target", help="типово SalePrice або MEDV")
+    ap.add_argument("--folds", type=int, default=5)
+    ap.add_argument("--jobs", type=int, default=-1, help="процесів (-1 — усі ядра, 1 — послідовно)")
+    ap.add_argument("--k", default="all", help="скільки ознак залишити (SelectKBest)")
+    ap.add_argument("--categorical", action="store_true", help="one-hot для текстових стовпців")
+    ap.add_argument("--models", help="через кому, напр. RidgeCV,LassoCV,HistGradientBoosting")
+    ap.add_argument("-o", "--output", help="зберегти таблицю у CSV")
+    args = ap.parse_args(argv)
+
+    data = load(args.data)
+    target = args.target or guess_target(data)
+    X, y = data.drop(columns=target), data[target]
+    k = args.k if args.k == "all" else int(args.k)
+
+    grid, warm = select_models(args.models.split(",")) if args.models else (GRID, WARM_START)
+
+    t0 = time.perf_counter()
+    raw = run(X, y, args.folds, args.jobs, k, args.categorical, grid, warm)
+    wall = time.perf_counter() - t0
+    table = summarize(raw)
+
+    with pd.option_context("display.width", 200, "display.max_columns", 20, "display.float_format", "{:.4f}".format):
+        print(table.to_string(index=False))
+    # для warm_start час у рядках накопичувальний — рахуємо лише останній крок
+    compute = (raw.loc[~raw["warm"], "fit_s"].sum()
+               + raw[raw["warm"]].groupby(["model", "fold"])["fit_s"].max().sum())
+    print(f"\n{len(raw)} оцінок ({args.folds} фолдів) за {wall:.2f} с; "
+          f"сумарний час навчання {compute:.2f} с")
+    if args.output:
+        table.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# preprocessing.py
+"""
+Попередня обробка для регресії (4.3): те саме, що в sample.ipynb, але
+одним sklearn-конвеєром і з дисковим кешем.
+
+    from preprocessing import load, split, fitted_preprocessor, correlations
+
+    data = load("boston.csv")
+    corr, target_corr = correlations(data, "MEDV")
+    X_train, X_test, y_train, y_test = split(data, "MEDV")
+    prep = fitted_preprocessor(X_train, y_train, k=10)
+    X_train_t, X_test_t = prep.transform(X_train), prep.transform(X_test)
+
+- пропуски заповнюються векторно (SimpleImputer) за правилом циклу з ноутбука:
+  стовпці цілого типу (int64) — модою, решта числових — середнім. Float-стовпець
+  з цілими значеннями (LotFrontage у Kaggle) — середнім, як у ноутбуці;
+- текстові стовпці за замовчуванням відкидаються (як select_dtypes("number")),
+  categorical=True — мода + one-hot;
+- відбір ознак — SelectKBest(f_regression): ранжування за |кореляцією з ціллю|;
+- кореляції та навчені трансформери кешуються на диску (joblib.Memory)
+  за хешем даних: повторний запуск експерименту їх не перераховує.
+"""
+import hashlib
+import os
+
+import joblib
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.feature_selection import SelectKBest, f_regression
+from sklearn.impute import SimpleImputer
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(HERE, ".cache")
+
+memory = joblib.Memory(CACHE_DIR, verbose=0)
+# входить у ключ кешу конвеєрів: збільшити при зміні build_preprocessor
+PREP_VERSION = 2
+
+
+def load(path="boston.csv"):
+    return pd.read_csv(os.path.join(HERE, path) if not os.path.isabs(path) else path)
+
+
+def guess_target(data):
+    return "SalePrice" if "SalePrice" in data.columns else "MEDV"
+
+
+def dataset_hash(*frames):
+    """Хеш вмісту (значення, індекс, назви та типи стовпців) — ключ кешу."""
+    h = hashlib.sha1()
+    for f in frames:
+        h.update(pd.util.hash_pandas_object(f, index=True).values.tobytes())
+        if isinstance(f, pd.DataFrame):
+            h.update(repr(list(zip(f.columns, f.dtypes.astype(str)))).encode())
+        else:
+            h.update(repr((f.name, str(f.dtype))).encode())
+    return h.hexdigest()
+
+
+def column_groups(X):
+    """(дискретні, неперервні, категоріальні) стовпці."""
+    numeric = X.select_dtypes(include="number")
+    # як у ноутбуці: дискретний — за типом стовпця, а не за значеннями
+    discrete = [c for c in numeric.columns if pd.api.types.is_integer_dtype(numeric[c])]
+    continuous = [c for c in numeric.columns if c not in discrete]
+    categorical = [c for c in X.columns if c not in numeric.columns]
+    return discrete, continuous, categorical
+
+
+def build_preprocessor(X, k="all", categorical=False):
+    discrete, continuous, cats = column_groups(X)
+    parts = [
+        ("discrete", SimpleImputer(strategy="most_frequent"), discrete),
+        ("continuous", SimpleImputer(strategy="mean"), continuous),
+    ]
+    if categorical and cats:
+        parts.append(("categorical", Pipeline([
+            ("impute", SimpleImputer(strategy="most_frequent")),
+            ("onehot", OneHotEncoder(handle_unknown="ignore")),
+        ]), cats))
+    impute = ColumnTransformer(parts, remainder="drop", verbose_feature_names_out=False)
+    return Pipeline([("impute", impute), ("select", SelectKBest(f_regression, k=k))])
+
+
+def split(data, target=None, test_size=0.2, random_state=42):
+    target = target or guess_target(data)
+    return train_test_split(data.drop(columns=target), data[target],
+                            test_size=test_size, random_state=random_state)
+
+
+@memory.cache(ignore=["X", "y"])
+def _fit_cached(key, version, k, categorical, X, y):
+    return build_preprocessor(X, k, categorical).fit(X, y)
+
+
+def fitted_preprocessor(X_train, y_train, k="all", categorical=False):
+    """Навчений конвеєр; для тих самих даних і параметрів — з кешу."""
+    if k != "all":
+        k = min(k, X_train.shape[1])
+    return _fit_cached(dataset_hash(X_train, y_train), PREP_VERSION, k, categorical, X_train, y_train)
+
+
+@memory.cache(ignore=["data"])
+def _correlations_cached(key, target, data):
+    corr = data.corr(numeric_only=True)
+    return corr, corr[target].drop(target).sort_values(ascending=False)
+
+
+def correlations(data, target=None):
+    """(матриця кореляцій, кореляції з ціллю за спаданням), з кешу для тих самих даних."""
+    target = target or guess_target(data)
+    return _correlations_cached(dataset_hash(data), target, data)
+
+
+def clear_cache():
+    memory.clear(warn=False)
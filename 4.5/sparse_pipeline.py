@@ -0,0 +1,192 @@
+# sparse_pipeline.py
+"""
+Класифікація 4.5 (case_universe.csv, ціль Uncertain) без щільного one-hot.
+
+    from sparse_pipeline import load, split, build_pipeline
+
+    data = load("case_universe.csv")            # категорії + зменшені числові типи
+    X_train, X_test, y_train, y_test = split(data)
+    model = build_pipeline().fit(X_train, y_train)
+
+    python sparse_pipeline.py                     # порівняння з get_dummies з ноутбука
+    python sparse_pipeline.py --scale 20          # у 20 разів більше рядків і кодів
+
+- текстові коди (Target State, Target COW ID) зберігаються як category:
+  кожне значення — ціле число, а не окремий рядок;
+- числові стовпці зменшуються до int8/int16/float32;
+- OneHotEncoder(sparse_output=True) дає CSR-матрицю: у рядку лише кілька
+  ненульових значень замість стовпця на кожну категорію, як у pd.get_dummies;
+- encoding="hash" — FeatureHasher з фіксованою кількістю ознак (не залежить
+  від кількості кодів); складені коди "SPN, FRN" розбиваються на окремі;
+- LogisticRegression(solver="liblinear") працює з CSR напряму,
+  числові ознаки масштабуються, тож збіжність без max_iter=1000.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.compose import ColumnTransformer, make_column_selector
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder, StandardScaler
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TARGET = "Uncertain"
+CATEGORICAL = ["Target State", "Target COW ID"]
+
+
+def shrink(data):
+    """Текст -> category, цілі -> найменший int, дробові (з NaN) -> float32."""
+    out = {}
+    for col, s in data.items():
+        if col in CATEGORICAL or not pd.api.types.is_numeric_dtype(s):
+            out[col] = s.astype("category")
+        elif pd.api.types.is_integer_dtype(s):
+            out[col] = pd.to_numeric(s, downcast="integer")
+        else:
+            out[col] = s.astype(np.float32)
+    return pd.DataFrame(out, index=data.index)
+
+
+def load(path="case_universe.csv", lean=True):
+    path = path if os.path.isabs(path) else os.path.join(HERE, path)
+    if not lean:
+        return pd.read_csv(path)
+    # category одразу при читанні — без проміжних рядкових стовпців
+    return shrink(pd.read_csv(path, dtype={c: "category" for c in CATEGORICAL}))
+
+
+def split(data, test_size=0.2, random_state=42):
+    return train_test_split(data.drop(columns=TARGET), data[TARGET],
+                            test_size=test_size, random_state=random_state)
+
+
+def _tokens(X):
+    """Рядок -> ["стовпець=код", ...]; "SPN, FRN" дає два токени, NaN — жодного."""
+    cols = list(X.columns)
+    return [[f"{c}={t}" for c, v in zip(cols, row) if isinstance(v, str) for t in v.split(", ")]
+            for row in X.itertuples(index=False)]
+
+
+def build_pipeline(encoding="onehot", n_features=2**12, solver="liblinear", C=1.0):
+    if encoding == "onehot":
+        categorical = Pipeline([
+            ("impute", SimpleImputer(strategy="most_frequent")),
+            ("onehot", OneHotEncoder(handle_unknown="ignore", sparse_output=True, dtype=np.float32)),
+        ])
+    elif encoding == "hash":
+        categorical = Pipeline([
+            ("tokens", FunctionTransformer(_tokens)),
+            ("hash", FeatureHasher(n_features, input_type="string", dtype=np.float32)),
+        ])
+    else:
+        raise ValueError(f"Невідоме кодування: {encoding} (onehot або hash)")
+    numeric = Pipeline([("impute", SimpleImputer(strategy="mean")), ("scale", StandardScaler())])
+    features = ColumnTransformer([
+        ("numeric", numeric, make_column_selector(dtype_include="number")),
+        ("categorical", categorical, CATEGORICAL),
+    ], sparse_threshold=1.0)  # результат завжди CSR
+    return Pipeline([("features", features),
+                     ("model", LogisticRegression(solver=solver, C=C, max_iter=1000))])
+
+
+# ---------------- порівняння з ноутбуком ----------------
+def dense_baseline(data):
+    """Як у sample.ipynb: fillna, get_dummies(drop_first=True), LogisticRegression(max_iter=1000)."""
+    data = data.copy()
+    for col in ["End Year", "MID", "IMI", "MIPS", "CRS", "ACD"]:
+        data[col] = data[col].fillna(data[col].mean())
+    data["Target COW ID"] = data["Target COW ID"].fillna(data["Target COW ID"].mode()[0])
+    data = pd.get_dummies(data, columns=CATEGORICAL, drop_first=True)
+    X_train, X_test, y_train, y_test = split(data)
+    return LogisticRegression(max_iter=1000), X_train, X_test, y_train, y_test
+
+
+def scale_up(data, factor):
+    """factor копій набору; у кожній копії свої коди — кардинальність росте разом з рядками."""
+    if factor <= 1:
+        return data
+    parts = []
+    for i in range(factor):
+        part = data.copy()
+        if i:
+            for col in CATEGORICAL:
+                part[col] = part[col].astype("str").where(part[col].notna()) + f"#{i}"
+        parts.append(part)
+    return pd.concat(parts, ignore_index=True)
+
+
+def nbytes(X):
+    if sparse.issparse(X):
+        return X.data.nbytes + X.indices.nbytes + X.indptr.nbytes
+    if isinstance(X, pd.DataFrame):
+        return int(X.memory_usage(deep=True).sum())
+    return X.nbytes
+
+
+def measure(name, prepare):
+    """prepare() -> (модель, X_train, X_test, y_train, y_test); пам'ять — пік tracemalloc."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    model, X_train, X_test, y_train, y_test = prepare()
+    t1 = time.perf_counter()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ConvergenceWarning)
+        model.fit(X_train, y_train)
+    t2 = time.perf_counter()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    y_pred = model.predict(X_test)
+    if isinstance(model, Pipeline):
+        width = model[:-1].transform(X_test.iloc[:1]).shape[1]
+        matrix = nbytes(model[:-1].transform(X_train))
+    else:
+        width, matrix = X_train.shape[1], nbytes(X_train.to_numpy(dtype=float))  # sklearn працює з float64
+    return {"підхід": name, "ознак": width, "матриця_МБ": matrix / 2**20, "пік_МБ": peak / 2**20,
+            "підготовка_с": t1 - t0, "навчання_с": t2 - t1,
+            "збіглася": not any(issubclass(w.category, ConvergenceWarning) for w in caught),
+            "accuracy": accuracy_score(y_test, y_pred), "f1": f1_score(y_test, y_pred)}
+
+
+def compare(raw, solver="liblinear", n_features=2**12):
+    lean = shrink(raw)
+    rows = [measure("get_dummies + lbfgs (ноутбук)", lambda: dense_baseline(raw))]
+    for encoding in ("onehot", "hash"):
+        rows.append(measure(f"{encoding} CSR + {solver}", lambda: (
+            build_pipeline(encoding, n_features, solver), *split(lean))))
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Розріджений one-hot для класифікації 4.5")
+    ap.add_argument("--data", default="case_universe.csv")
+    ap.add_argument("--scale", type=int, default=1, help="збільшити набір у N разів (рядки і коди)")
+    ap.add_argument("--solver", default="liblinear", help="liblinear або saga — обидва приймають CSR")
+    ap.add_argument("--n-features", type=int, default=2**12, help="розмір простору для encoding=hash")
+    args = ap.parse_args(argv)
+
+    raw = scale_up(load(args.data, lean=False), args.scale)
+    frame_before = nbytes(raw)
+    frame_after = nbytes(shrink(raw))
+    print(f"Рядків: {len(raw)}, кодів: " + ", ".join(f"{c} {raw[c].nunique()}" for c in CATEGORICAL))
+    print(f"DataFrame: {frame_before / 2**20:.2f} МБ -> {frame_after / 2**20:.2f} МБ "
+          f"(category + зменшені числові типи, у {frame_before / frame_after:.1f} раза менше)\n")
+
+    table = compare(raw, args.solver, args.n_features)
+    with pd.option_context("display.width", 200, "display.float_format", "{:.3f}".format):
+        print(table.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# numpy_mlp.py
+"""
+Keras MLP 4.8 -> .npz з вагами Dense-шарів і пряме поширення на чистому NumPy.
+
+    python numpy_mlp.py export mlp.keras mlp.npz --scaler mlp_scaler.joblib
+    python numpy_mlp.py check mlp.keras mlp.npz          # збіг з Keras + час запуску
+
+    from numpy_mlp import NumpyMLP
+    model = NumpyMLP.load("mlp.npz")                     # без TensorFlow, мілісекунди
+    proba = model.predict_proba(X)
+
+- підтримуються Dense (relu / softmax / sigmoid / tanh / linear) і Dropout
+  (на інференсі — тотожність);
+- StandardScaler вбудовується в перший шар: W' = W / scale, b' = b - (mean / scale) @ W;
+- прохід — пакетами по batch_size рядків у float32: пам'ять обмежена
+  розміром пакета, а не кількістю рядків.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ACTIVATIONS = ("relu", "softmax", "sigmoid", "tanh", "linear")
+
+
+def _relu(z):
+    return np.maximum(z, 0, out=z)
+
+
+def _softmax(z):
+    z -= z.max(axis=1, keepdims=True)
+    np.exp(z, out=z)
+    z /= z.sum(axis=1, keepdims=True)
+    return z
+
+
+def _sigmoid(z):
+    np.negative(z, out=z)
+    np.exp(z, out=z)
+    z += 1
+    return np.reciprocal(z, out=z)
+
+
+FUNCTIONS = {"relu": _relu, "softmax": _softmax, "sigmoid": _sigmoid,
+             "tanh": lambda z: np.tanh(z, out=z), "linear": lambda z: z}
+
+
+class NumpyMLP:
+    def __init__(self, weights, biases, activations, fill=None):
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activations = list(activations)
+        self.fill = None if fill is None else np.asarray(fill, dtype=np.float32)  # заміна NaN (середні)
+
+    @property
+    def n_features(self):
+        return self.weights[0].shape[0]
+
+    @property
+    def n_classes(self):
+        return self.weights[-1].shape[1]
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as f:
+            meta = json.loads(f["meta"].item())
+            n = len(meta["activations"])
+            return cls([f[f"W{i}"] for i in range(n)], [f[f"b{i}"] for i in range(n)],
+                       meta["activations"], f["fill"] if "fill" in f else None)
+
+    def save(self, path):
+        arrays = {f"W{i}": w for i, w in enumerate(self.weights)}
+        arrays.update({f"b{i}": b for i, b in enumerate(self.biases)})
+        if self.fill is not None:
+            arrays["fill"] = self.fill
+        arrays["meta"] = np.array(json.dumps({"activations": self.activations}))
+        np.savez(path, **arrays)
+
+    def predict_proba(self, X, batch_size=65_536):
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"очікується масив (n, {self.n_features}), отримано {X.shape}")
+        if self.fill is not None and np.isnan(X).any():
+            X = np.where(np.isnan(X), self.fill, X)
+        out = np.empty((len(X), self.n_classes), dtype=np.float32)
+        for start in range(0, len(X), batch_size):
+            h = X[start:start + batch_size]
+            for W, b, act in zip(self.weights, self.biases, self.activations):
+                h = h @ W
+                h += b
+                h = FUNCTIONS[act](h)
+            out[start:start + len(h)] = h
+        return out
+
+    def predict(self, X, batch_size=65_536):
+        return self.predict_proba(X, batch_size).argmax(axis=1)
+
+
+# ---------------- експорт з Keras ----------------
+def from_keras(model, scaler=None):
+    """Ваги Dense-шарів моделі; scaler (StandardScaler) вбудовується в перший шар."""
+    weights, biases, activations = [], [], []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind in ("Dropout", "InputLayer"):
+            continue
+        if kind != "Dense":
+            raise ValueError(f"Шар {layer.name} ({kind}) не підтримується — лише Dense і Dropout")
+        act = layer.get_config()["activation"]
+        if act not in ACTIVATIONS:
+            raise ValueError(f"Активація {act} шару {layer.name} не підтримується")
+        W, b = (np.asarray(v, dtype=np.float64) for v in layer.get_weights())
+        weights.append(W)
+        biases.append(b)
+        activations.append(act)
+    fill = None
+    if scaler is not None:
+        mean, scale = np.asarray(scaler.mean_), np.asarray(scaler.scale_)
+        biases[0] = biases[0] - (mean / scale) @ weights[0]
+        weights[0] = weights[0] / scale[:, None]
+        fill = mean
+    return NumpyMLP(weights, biases, activations, fill)
+
+
+def export(keras_path, npz_path, scaler_path=None):
+    import joblib
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(keras_path)
+    scaler = joblib.load(scaler_path) if scaler_path else None
+    mlp = from_keras(model, scaler)
+    mlp.save(npz_path)
+    return mlp
+
+
+def parity(keras_path, npz_path, scaler_path=None, n=10_000, seed=0):
+    """Максимальна різниця ймовірностей і збіг класів NumPy vs Keras на випадкових входах."""
+    import joblib
+    import tensorflow as tf
+
+    mlp = NumpyMLP.load(npz_path)
+    model = tf.keras.models.load_model(keras_path)
+    X = np.random.default_rng(seed).normal(size=(n, mlp.n_features)).astype(np.float32)
+    scaled = joblib.load(scaler_path).transform(X).astype(np.float32) if scaler_path else X
+    ref = model.predict(scaled, batch_size=4096, verbose=0)
+    got = mlp.predict_proba(X)
+    return {"rows": n, "max_abs_diff": float(np.abs(ref - got).max()),
+            "argmax_agreement": float((ref.argmax(1) == got.argmax(1)).mean())}
+
+
+def _timed_subprocess(code):
+    import subprocess
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return time.perf_counter() - t0, out.strip()
+
+
+def startup(keras_path, npz_path, rows=100_000):
+    """Окремі процеси: час від старту до першого прогнозу і пік пам'яті (МБ)."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    # VmHWM, а не ru_maxrss: ru_maxrss успадковується від батьківського процесу через fork
+    rss = "print(next(int(l.split()[1]) // 1024 for l in open('/proc/self/status') if l.startswith('VmHWM')))"
+    results = {}
+    for name, code in [
+        ("keras", f"import numpy as np, tensorflow as tf; m = tf.keras.models.load_model({keras_path!r}); "
+                  f"m.predict(np.zeros((1, m.input_shape[1]), 'float32'), verbose=0); {rss}"),
+        ("numpy", f"import sys; sys.path.insert(0, {here!r}); import numpy as np; from numpy_mlp import NumpyMLP; "
+                  f"m = NumpyMLP.load({npz_path!r}); m.predict_proba(np.zeros((1, m.n_features))); {rss}"),
+    ]:
+        seconds, peak = _timed_subprocess(code)
+        results[name] = {"first_prediction_s": round(seconds, 3), "peak_rss_mb": int(peak.splitlines()[-1])}
+
+    # пропускна здатність пакетного прогнозу в цьому процесі
+    import tensorflow as tf
+    model, mlp = tf.keras.models.load_model(keras_path), NumpyMLP.load(npz_path)
+    X = np.random.default_rng(1).normal(size=(rows, mlp.n_features)).astype(np.float32)
+    for name, fn in [("keras", lambda: model.predict(X, batch_size=65_536, verbose=0)),
+                     ("numpy", lambda: mlp.predict_proba(X))]:
+        fn()
+        t0 = time.perf_counter()
+        fn()
+        results[name]["rows_per_s"] = round(rows / (time.perf_counter() - t0))
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Експорт Keras MLP у NumPy і перевірка збігу")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("export", help="model.keras -> model.npz")
+    p.add_argument("keras_path")
+    p.add_argument("npz_path")
+    p.add_argument("--scaler", help="StandardScaler (joblib), вбудовується в перший шар")
+    p = sub.add_parser("check", help="збіг з Keras, час запуску і швидкість")
+    p.add_argument("keras_path")
+    p.add_argument("npz_path")
+    p.add_argument("--scaler", help="той самий scaler, що й при експорті")
+    p.add_argument("--rows", type=int, default=10_000)
+    p.add_argument("--tolerance", type=float, default=1e-4)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "export":
+        mlp = export(args.keras_path, args.npz_path, args.scaler)
+        shape = " -> ".join([str(mlp.n_features)] + [f"{w.shape[1]} {a}" for w, a in zip(mlp.weights, mlp.activations)])
+        print(f"{args.npz_path}: {shape}, {os.path.getsize(args.npz_path) / 1024:.1f} КБ")
+        return
+
+    result = parity(args.keras_path, args.npz_path, args.scaler, args.rows)
+    ok = result["max_abs_diff"] <= args.tolerance
+    print(f"{result['rows']} рядків: max |Δp| = {result['max_abs_diff']:.2e}, "
+          f"збіг класів {result['argmax_agreement']:.4%} — {'OK' if ok else 'РОЗБІЖНІСТЬ'}")
+    for name, r in startup(args.keras_path, args.npz_path).items():
+        print(f"  {name}: перший прогноз через {r['first_prediction_s']} с, пік {r['peak_rss_mb']} МБ, "
+              f"{r['rows_per_s']} рядків/с")
+    if not ok:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
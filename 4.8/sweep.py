@@ -0,0 +1,178 @@
+# sweep.py
+"""
+Перебір варіантів 4.8 (JOURNAL_NUMBER) × архітектура × регуляризація
+у паралельних процесах з successive halving.
+
+    python sweep.py                                   # варіанти 1-10, типова сітка
+    python sweep.py --variants 3,7 --workers 4 --threads 2 -o sweep_results.csv
+    python sweep.py --sequential                      # усі конфігурації на повний бюджет, для порівняння
+
+- кожна конфігурація — окреме навчання в процесі-воркері (spawn) з
+  обмеженою кількістю потоків TensorFlow (--threads), щоб воркери не
+  змагалися за ядра;
+- successive halving: усі конфігурації вчаться --min-epochs епох, у кожному
+  варіанті далі проходить краща 1/eta частина за val_accuracy, бюджет
+  зростає в eta разів — до --max-epochs. Переможці продовжують з
+  збереженої моделі (.keras з оптимізатором), а не з нуля;
+- EarlyStopping (--patience) зупиняє конфігурацію, що перестала
+  покращуватися; зупинена більше не навчається, її результат остаточний;
+- підсумок — одна таблиця: останній раунд, епохи, val/test accuracy, час.
+"""
+import argparse
+import itertools
+import math
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
+from multiprocessing import get_context
+
+import pandas as pd
+
+from training import CONFIGS, configure_threads, make_data, train
+
+ARCHITECTURES = {
+    "64-32": (64, 32),      # як у ноутбуках
+    "32": (32,),
+    "128-64": (128, 64),
+    "64-64-32": (64, 64, 32),
+}
+REGULARIZATION = {
+    "none": {"l2": 0.0, "dropout": 0.0},
+    "l2+dropout": {"l2": 1e-4, "dropout": 0.3},   # як clf_reg у practice8_variant7
+}
+
+
+def make_trials(variants, architectures=ARCHITECTURES, regularization=REGULARIZATION):
+    return [{"trial": f"v{j}/{a}/{r}", "journal_number": j, "arch": a, "reg": r}
+            for j, a, r in itertools.product(variants, architectures, regularization)]
+
+
+# ---------------- воркер ----------------
+_SCALE = 1
+_BASE = "tfdata-spe16"
+
+
+def _init_worker(threads, scale, base):
+    global _SCALE, _BASE
+    _SCALE, _BASE = scale, base
+    configure_threads(threads, 1)  # до першої операції TensorFlow у процесі
+
+
+@lru_cache(maxsize=4)
+def _data(journal_number):
+    return make_data("practice", journal_number=journal_number, scale=_SCALE)
+
+
+def run_trial(trial, epochs, done, path, patience):
+    """Довчити конфігурацію з done до epochs епох; модель — у path."""
+    import tensorflow as tf
+
+    X_tr, X_te, y_tr, y_te = _data(trial["journal_number"])
+    cfg = replace(CONFIGS[_BASE], name=trial["trial"], hidden=ARCHITECTURES[trial["arch"]],
+                  epochs=epochs, patience=patience, **REGULARIZATION[trial["reg"]])
+    model = tf.keras.models.load_model(path) if done else None
+    model, report = train(X_tr, y_tr, cfg, X_te, y_te, model=model, initial_epoch=done)
+    model.save(path)
+    return {**trial, "epochs_done": done + report["epochs"], "stopped": done + report["epochs"] < epochs,
+            "val_accuracy": report["val_accuracy"], "test_accuracy": report["test_accuracy"],
+            "train_s": report["train_s"]}
+
+
+# ---------------- successive halving ----------------
+def budgets(min_epochs, max_epochs, eta):
+    out, b = [], min_epochs
+    while b < max_epochs:
+        out.append(b)
+        b *= eta
+    return out + [max_epochs]
+
+
+def promote(rows, eta):
+    """У кожному варіанті — краща ceil(n/eta) частина за val_accuracy."""
+    keep = []
+    for _, group in itertools.groupby(sorted(rows, key=lambda r: r["journal_number"]),
+                                      key=lambda r: r["journal_number"]):
+        group = sorted(group, key=lambda r: r["val_accuracy"], reverse=True)
+        keep += group[:math.ceil(len(group) / eta)]
+    return keep
+
+
+def sweep(trials, workers, threads, scale=1, min_epochs=5, max_epochs=60, eta=3, patience=8,
+          base="tfdata-spe16", sequential=False):
+    """Повертає (таблиця, сумарний час навчання всіх запусків)."""
+    # потоки numpy / OpenMP у воркерах — теж обмежені
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    rungs = [max_epochs] if sequential else budgets(min_epochs, max_epochs, eta)
+    workdir = tempfile.mkdtemp(prefix="sweep-")
+    state = {t["trial"]: {**t, "rung": 0, "epochs_done": 0, "stopped": False, "train_s": 0.0,
+                          "path": os.path.join(workdir, f"{i}.keras")} for i, t in enumerate(trials)}
+    compute = 0.0
+    try:
+        with ProcessPoolExecutor(workers, mp_context=get_context("spawn"), initializer=_init_worker,
+                                 initargs=(threads, scale, base)) as pool:
+            alive = list(state.values())
+            for rung, budget in enumerate(rungs):
+                jobs = {pool.submit(run_trial, {k: r[k] for k in ("trial", "journal_number", "arch", "reg")},
+                                    budget, r["epochs_done"], r["path"], patience): r
+                        for r in alive if not r["stopped"]}
+                for future, r in jobs.items():
+                    res = future.result()
+                    compute += res["train_s"]
+                    r.update(res, train_s=r["train_s"] + res["train_s"])
+                for r in alive:  # зупинені EarlyStopping теж переходять у раунд зі своїм результатом
+                    r["rung"] = rung
+                print(f"  раунд {rung}: {len(jobs)} конфігурацій до {budget} епох", flush=True)
+                if rung < len(rungs) - 1:
+                    alive = promote(alive, eta)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    table = pd.DataFrame([{k: v for k, v in r.items() if k != "path"} for r in state.values()])
+    table = table.sort_values(["journal_number", "rung", "val_accuracy"], ascending=[True, False, False],
+                              ignore_index=True)
+    return table, compute
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Паралельний перебір варіантів і архітектур 4.8")
+    ap.add_argument("--variants", default="1,2,3,4,5,6,7,8,9,10", help="номери в журналі через кому")
+    ap.add_argument("--archs", default=",".join(ARCHITECTURES))
+    ap.add_argument("--regs", default=",".join(REGULARIZATION))
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    ap.add_argument("--threads", type=int, help="потоків TensorFlow на воркер (типово ядра / воркери)")
+    ap.add_argument("--scale", type=int, default=1, help="у скільки разів більше зразків")
+    ap.add_argument("--min-epochs", type=int, default=5)
+    ap.add_argument("--max-epochs", type=int, default=60)
+    ap.add_argument("--eta", type=int, default=3, help="у скільки разів скорочується кожен раунд")
+    ap.add_argument("--patience", type=int, default=8)
+    ap.add_argument("--base", default="tfdata-spe16", choices=list(CONFIGS), help="конфігурація з training.py")
+    ap.add_argument("--sequential", action="store_true", help="без відсіву: усі до --max-epochs")
+    ap.add_argument("-o", "--output", default="sweep_results.csv")
+    args = ap.parse_args(argv)
+
+    threads = args.threads or max(1, os.cpu_count() // args.workers)
+    trials = make_trials([int(v) for v in args.variants.split(",")],
+                         {a: ARCHITECTURES[a] for a in args.archs.split(",")},
+                         {r: REGULARIZATION[r] for r in args.regs.split(",")})
+    print(f"{len(trials)} конфігурацій, {args.workers} воркерів × {threads} потоків")
+
+    t0 = time.perf_counter()
+    table, compute = sweep(trials, args.workers, threads, args.scale, args.min_epochs, args.max_epochs,
+                           args.eta, args.patience, args.base, args.sequential)
+    wall = time.perf_counter() - t0
+
+    best = table[table["rung"] == table["rung"].max()].groupby("journal_number").head(1)
+    with pd.option_context("display.width", 200):
+        print(best.to_string(index=False))
+    table.to_csv(args.output, index=False)
+    print(f"\nЕпох навчено: {table['epochs_done'].sum()} (без відсіву було б до "
+          f"{len(trials) * args.max_epochs}); час навчання {compute:.0f} с, стіна {wall:.0f} с -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# test_numpy_mlp.py
+"""
+Збіг NumPy-рантайму з Keras: невелика модель будується й зберігається в .keras,
+експортується в .npz (numpy_mlp.export) і порівнюється з model.predict.
+
+    python -m pytest 4.8/test_numpy_mlp.py -q
+"""
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+joblib = pytest.importorskip("joblib")
+from sklearn.preprocessing import StandardScaler  # noqa: E402
+
+from numpy_mlp import NumpyMLP, export  # noqa: E402
+
+N_FEATURES = 6
+
+
+def build(hidden, output):
+    keras = tf.keras
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([keras.Input(shape=(N_FEATURES,))])
+    for units, act in hidden:
+        model.add(keras.layers.Dense(units, activation=act))
+        model.add(keras.layers.Dropout(0.2))
+    model.add(keras.layers.Dense(*output))
+    return model
+
+
+@pytest.mark.parametrize("hidden, output", [
+    ([(16, "relu"), (8, "relu")], (3, "softmax")),
+    ([(8, "tanh")], (1, "sigmoid")),
+    ([(8, "linear"), (4, "relu")], (2, "softmax")),
+])
+@pytest.mark.parametrize("with_scaler", [False, True])
+def test_matches_keras(tmp_path, hidden, output, with_scaler):
+    rng = np.random.default_rng(1)
+    model = build(hidden, output)
+    keras_path, npz_path = str(tmp_path / "m.keras"), str(tmp_path / "m.npz")
+    model.save(keras_path)
+
+    X = rng.normal(loc=5, scale=3, size=(2000, N_FEATURES)).astype(np.float32)
+    scaler_path = None
+    if with_scaler:
+        scaler_path = str(tmp_path / "scaler.joblib")
+        joblib.dump(StandardScaler().fit(X), scaler_path)
+
+    export(keras_path, npz_path, scaler_path)
+    mlp = NumpyMLP.load(npz_path)
+
+    scaled = joblib.load(scaler_path).transform(X).astype(np.float32) if scaler_path else X
+    ref = model.predict(scaled, batch_size=512, verbose=0)
+    got = mlp.predict_proba(X, batch_size=300)  # кілька пакетів, останній неповний
+
+    assert got.shape == ref.shape
+    assert np.allclose(got, ref, rtol=1e-4, atol=1e-5)
+    if ref.shape[1] > 1:
+        assert (got.argmax(1) == ref.argmax(1)).all()
+    else:
+        assert ((got[:, 0] > 0.5) == (ref[:, 0] > 0.5)).all()
+
+
+def test_nan_filled_with_scaler_mean(tmp_path):
+    model = build([(8, "relu")], (3, "softmax"))
+    keras_path, npz_path = str(tmp_path / "m.keras"), str(tmp_path / "m.npz")
+    model.save(keras_path)
+    X = np.random.default_rng(2).normal(size=(100, N_FEATURES)).astype(np.float32)
+    scaler = StandardScaler().fit(X)
+    joblib.dump(scaler, tmp_path / "scaler.joblib")
+    mlp = export(keras_path, npz_path, str(tmp_path / "scaler.joblib"))
+
+    X_nan = X.copy()
+    X_nan[:, 2] = np.nan
+    filled = X.copy()
+    filled[:, 2] = scaler.mean_[2]
+    assert np.allclose(mlp.predict_proba(X_nan), mlp.predict_proba(filled), atol=1e-6)
+
+
+def test_rejects_wrong_shape():
+    mlp = NumpyMLP([np.ones((N_FEATURES, 2))], [np.zeros(2)], ["softmax"])
+    with pytest.raises(ValueError):
+        mlp.predict_proba(np.ones((3, N_FEATURES + 1)))
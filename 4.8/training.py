@@ -0,0 +1,251 @@
+# training.py
+"""
+Спільне навчання Keras-класифікаторів 4.8 на CPU: tf.data, потоки TensorFlow,
+режим великого пакета і вимір швидкості (зразків/с).
+
+    from training import CONFIGS, configure_threads, make_data, train
+
+    configure_threads(intra=4, inter=2)        # до першої операції TensorFlow
+    X_train, X_test, y_train, y_test = make_data("practice", scale=10)
+    model, report = train(X_train, y_train, CONFIGS["large-batch"], X_test, y_test)
+
+    python training.py --scale 10                         # усі конфігурації
+    python training.py --scale 100 --epochs 3 --configs notebook,large-batch --intra 8
+
+- pipeline="tfdata": tf.data з cache() і prefetch(AUTOTUNE) — підготовка
+  наступного пакета йде паралельно з кроком навчання;
+- steps_per_execution=N: N кроків за один виклик графа — для малих пакетів
+  накладні витрати Python на крок більші за сам крок;
+- великий пакет: batch_size 1024+ з learning rate, масштабованим від
+  base_batch (sqrt — для Adam, linear — для SGD);
+- precision="mixed_bfloat16": обчислення у bfloat16 (вихідний шар — float32),
+  має сенс на CPU з AVX512_BF16 / AMX.
+"""
+import argparse
+import time
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+N_FEATURES_SOLUTION = 12
+
+
+@dataclass
+class TrainConfig:
+    name: str = "notebook"
+    batch_size: int = 64
+    lr: float = 0.01
+    base_batch: int = 64           # пакет, для якого підібрано lr
+    lr_scaling: str = "none"       # none | sqrt | linear
+    epochs: int = 60
+    pipeline: str = "numpy"        # numpy | tfdata
+    shuffle_buffer: int = 10_000
+    steps_per_execution: int = 1
+    precision: str = "float32"     # float32 | mixed_bfloat16
+    jit_compile: bool = False
+    hidden: tuple = (64, 32)
+    l2: float = 0.0
+    dropout: float = 0.0
+    validation_split: float = 0.2
+    patience: int | None = None    # EarlyStopping за val_loss
+    seed: int = 7
+
+
+CONFIGS = {
+    # як у ноутбуках: NumPy-масиви, пакет 64
+    "notebook": TrainConfig("notebook"),
+    "tfdata": TrainConfig("tfdata", pipeline="tfdata"),
+    "tfdata-spe16": TrainConfig("tfdata-spe16", pipeline="tfdata", steps_per_execution=16),
+    "large-batch": TrainConfig("large-batch", batch_size=1024, lr_scaling="sqrt", pipeline="tfdata"),
+    "large-batch-bf16": TrainConfig("large-batch-bf16", batch_size=1024, lr_scaling="sqrt",
+                                    pipeline="tfdata", precision="mixed_bfloat16"),
+}
+
+
+def configure_threads(intra=0, inter=0):
+    """Потоки всередині операції (intra) і між незалежними операціями (inter); 0 — усі ядра."""
+    import tensorflow as tf
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra)
+        tf.config.threading.set_inter_op_parallelism_threads(inter)
+    except RuntimeError:
+        raise RuntimeError("Потоки TensorFlow налаштовуються до першої операції "
+                           "(викличте configure_threads одразу після імпорту)") from None
+
+
+def make_data(variant="practice", journal_number=7, scale=1, test_size=0.2):
+    """Дані ноутбука: solution_variant_7 (12 ознак) або practice8_variant7 (2·класів ознак, масштабовані).
+
+    scale множить кількість зразків (1000 · номер у журналі).
+    """
+    from sklearn.datasets import make_classification
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    n_samples = 1000 * journal_number * scale
+    n_classes = journal_number + 2
+    if variant == "solution":
+        X, y = make_classification(n_samples=n_samples, n_features=N_FEATURES_SOLUTION,
+                                   n_informative=N_FEATURES_SOLUTION, n_redundant=0, n_classes=n_classes,
+                                   n_clusters_per_class=1, random_state=42)
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=test_size, random_state=42, stratify=y)
+    else:
+        n_features = max(12, 2 * n_classes)
+        n_informative = min(n_features, 8)
+        X, y = make_classification(n_samples=n_samples, n_features=n_features, n_informative=n_informative,
+                                   n_redundant=n_features - n_informative, n_classes=n_classes,
+                                   n_clusters_per_class=1, class_sep=1.5 + 0.1 * (journal_number % 5),
+                                   flip_y=0.01, random_state=journal_number)
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=journal_number, stratify=y)
+        scaler = StandardScaler().fit(X_train)
+        X_train, X_test = scaler.transform(X_train), scaler.transform(X_test)
+    return X_train.astype(np.float32), X_test.astype(np.float32), y_train, y_test
+
+
+def learning_rate(cfg):
+    k = cfg.batch_size / cfg.base_batch
+    if cfg.lr_scaling == "linear":
+        return cfg.lr * k
+    if cfg.lr_scaling == "sqrt":
+        return cfg.lr * k ** 0.5
+    return cfg.lr
+
+
+def build_model(n_features, n_classes, cfg):
+    import tensorflow as tf
+
+    reg = tf.keras.regularizers.l2(cfg.l2) if cfg.l2 else None
+    layers = [tf.keras.Input(shape=(n_features,))]
+    for units in cfg.hidden:
+        layers.append(tf.keras.layers.Dense(units, activation="relu", kernel_regularizer=reg))
+        if cfg.dropout:
+            layers.append(tf.keras.layers.Dropout(cfg.dropout))
+    # softmax у float32 навіть у змішаній точності — стабільні ймовірності
+    layers.append(tf.keras.layers.Dense(n_classes, activation="softmax", dtype="float32"))
+    model = tf.keras.Sequential(layers)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=learning_rate(cfg)),
+                  loss="sparse_categorical_crossentropy", metrics=["accuracy"],
+                  steps_per_execution=cfg.steps_per_execution, jit_compile=cfg.jit_compile)
+    return model
+
+
+def make_dataset(X, y, batch_size, shuffle_buffer=0, seed=7):
+    """cache -> shuffle -> batch -> prefetch; shuffle_buffer=0 — без перемішування (валідація)."""
+    import tensorflow as tf
+
+    ds = tf.data.Dataset.from_tensor_slices((X, y)).cache()
+    if shuffle_buffer:
+        ds = ds.shuffle(min(shuffle_buffer, len(X)), seed=seed, reshuffle_each_iteration=True)
+    return ds.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def _epoch_timer():
+    import tensorflow as tf
+
+    class EpochTimer(tf.keras.callbacks.Callback):
+        def on_train_begin(self, logs=None):
+            self.times = []
+
+        def on_epoch_begin(self, epoch, logs=None):
+            self._t0 = time.perf_counter()
+
+        def on_epoch_end(self, epoch, logs=None):
+            self.times.append(time.perf_counter() - self._t0)
+
+    return EpochTimer()
+
+
+def train(X, y, cfg=CONFIGS["notebook"], X_test=None, y_test=None, verbose=0, model=None, initial_epoch=0):
+    """Повертає (модель, звіт); зразків/с — без першої епохи (трасування графа).
+
+    model + initial_epoch — продовжити навчання вже навченої моделі до cfg.epochs.
+    """
+    import tensorflow as tf
+
+    tf.keras.utils.set_random_seed(cfg.seed + initial_epoch)
+    if model is None:
+        policy = tf.keras.mixed_precision.global_policy()
+        tf.keras.mixed_precision.set_global_policy(cfg.precision)
+        try:
+            model = build_model(X.shape[1], int(y.max()) + 1, cfg)
+        finally:
+            tf.keras.mixed_precision.set_global_policy(policy)
+
+    timer = _epoch_timer()
+    callbacks = [timer]
+    if cfg.patience:
+        callbacks.append(tf.keras.callbacks.EarlyStopping(monitor="val_loss", patience=cfg.patience,
+                                                          restore_best_weights=True))
+
+    # валідація — останні validation_split рядків, як у Keras
+    n_val = int(len(X) * cfg.validation_split)
+    X_tr, y_tr, X_val, y_val = X[:len(X) - n_val], y[:len(y) - n_val], X[len(X) - n_val:], y[len(y) - n_val:]
+
+    t0 = time.perf_counter()
+    if cfg.pipeline == "tfdata":
+        history = model.fit(make_dataset(X_tr, y_tr, cfg.batch_size, cfg.shuffle_buffer, cfg.seed),
+                            validation_data=make_dataset(X_val, y_val, max(cfg.batch_size, 1024)) if n_val else None,
+                            epochs=cfg.epochs, initial_epoch=initial_epoch, callbacks=callbacks,
+                            verbose=verbose, shuffle=False)  # перемішує сам tf.data
+    else:
+        history = model.fit(X_tr, y_tr, validation_data=(X_val, y_val) if n_val else None,
+                            epochs=cfg.epochs, initial_epoch=initial_epoch, batch_size=cfg.batch_size,
+                            callbacks=callbacks, verbose=verbose)
+    train_s = time.perf_counter() - t0
+
+    steady = timer.times[1:] or timer.times
+    hist = history.history
+    # EarlyStopping(restore_best_weights) лишає ваги епохи з найменшим val_loss,
+    # а не останньої — і точність звітується для них
+    best = int(np.argmin(hist["val_loss"])) if cfg.patience and hist.get("val_loss") else -1
+    report = {
+        "config": cfg.name,
+        "batch": cfg.batch_size,
+        "lr": round(learning_rate(cfg), 5),
+        "epochs": len(timer.times),
+        "samples_s": round(len(X_tr) / (sum(steady) / len(steady))),
+        "first_epoch_s": round(timer.times[0], 2),
+        "train_s": round(train_s, 2),
+        "val_accuracy": round(hist.get("val_accuracy", [float("nan")])[best], 4),
+    }
+    if X_test is not None:
+        report["test_accuracy"] = round(model.evaluate(X_test, y_test, batch_size=4096, verbose=0)[1], 4)
+    return model, report
+
+
+def benchmark(names, scale=10, epochs=3, variant="practice"):
+    X_train, X_test, y_train, y_test = make_data(variant, scale=scale)
+    rows = []
+    for name in names:
+        _, report = train(X_train, y_train, replace(CONFIGS[name], epochs=epochs), X_test, y_test)
+        rows.append(report)
+        print(f"  {name}: {report['samples_s']} зразків/с", flush=True)
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Швидкість навчання MLP 4.8 на CPU для різних конфігурацій")
+    ap.add_argument("--scale", type=int, default=10, help="у скільки разів більше зразків, ніж у варіанті")
+    ap.add_argument("--epochs", type=int, default=3)
+    ap.add_argument("--variant", choices=["practice", "solution"], default="practice")
+    ap.add_argument("--configs", default=",".join(CONFIGS), help="через кому: " + ", ".join(CONFIGS))
+    ap.add_argument("--intra", type=int, default=0, help="потоків усередині операції (0 — усі ядра)")
+    ap.add_argument("--inter", type=int, default=0, help="потоків між операціями (0 — авто)")
+    args = ap.parse_args(argv)
+
+    names = args.configs.split(",")
+    unknown = [n for n in names if n not in CONFIGS]
+    if unknown:
+        raise SystemExit(f"Невідомі конфігурації: {', '.join(unknown)}")
+
+    configure_threads(args.intra, args.inter)
+    print(f"Набір {args.variant} ×{args.scale}, {args.epochs} епох:")
+    table = benchmark(names, args.scale, args.epochs, args.variant)
+    with pd.option_context("display.width", 200):
+        print(table.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
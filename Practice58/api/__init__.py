@@ -0,0 +1,10 @@
+"""
+API дашборду Practice58 (uvicorn api.main:app з каталогу Practice58).
+
+fastjson / compression / routing — спільні з exam/: пакет apicommon у корені
+репозиторію. Корінь додається до шляху імпорту тут, до першого модуля api.*.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -1,13 +1,134 @@
 import os
+import threading
+from contextlib import closing, contextmanager
+
 from dotenv import load_dotenv
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
+
+from apicommon.routing import LAG_SQL, ReplicaRouter, replica_urls, router_settings
 
 # Підтягує .env з кореня проєкту
 load_dotenv()
 
-def get_conn():
+def _replica_lag(dsn):
+    with closing(psycopg2.connect(dsn, connect_timeout=2)) as conn, conn.cursor() as cur:
+        cur.execute(LAG_SQL)
+        return cur.fetchone()[0]
+
+# аналітичні читання -> репліки з DATABASE_REPLICA_URLS (див. apicommon/routing.py)
+router = ReplicaRouter(replica_urls(), _replica_lag, **router_settings())
+
+# Пул з'єднань на кожну БД (первинна, репліки) створюється при першому
+# зверненні до неї, а не при імпорті; з'єднання відкриваються на вимогу
+_pools = {}
+_pools_lock = threading.Lock()
+
+# таблиці, які читають ендпоінти (warm_up)
+WARMUP_TABLES = ("time_control", "documents", "doc_schedule", "events", "units", "sectors", "doc_types")
+
+
+class _Pool(ThreadedConnectionPool):
+    """Не відкриває з'єднань наперед, але тримає до maxconn вільних:
+    psycopg2 закриває повернуте з'єднання, якщо вільних уже minconn."""
+
+    def __init__(self, maxconn, *args, **kwargs):
+        super().__init__(0, maxconn, *args, **kwargs)
+        self.minconn = maxconn
+
+
+def _primary_dsn():
     dsn = os.getenv("DATABASE_URL")
     if not dsn:
         raise RuntimeError("DATABASE_URL не знайдено. Перевір файл .env у корені проєкту.")
-    return psycopg2.connect(dsn, cursor_factory=RealDictCursor)
+    return dsn
+
+
+def _pool(dsn):
+    """(пул, семафор) для DSN. ThreadedConnectionPool кидає PoolError, коли
+    з'єднання скінчились; семафор змушує зайвий потік чекати замість помилки."""
+    entry = _pools.get(dsn)
+    if entry is None:
+        with _pools_lock:
+            entry = _pools.get(dsn)
+            if entry is None:
+                maxconn = int(os.getenv("DB_POOL_MAX", "10"))
+                extra = {"connect_timeout": 2} if dsn in router.replicas else {}
+                entry = _pools[dsn] = (_Pool(maxconn, dsn, cursor_factory=RealDictCursor, **extra),
+                                       threading.BoundedSemaphore(maxconn))
+    return entry
+
+
+def _checkout(dsn):
+    pool, slots = _pool(dsn)
+    slots.acquire()
+    try:
+        return pool, slots, pool.getconn()
+    except Exception:
+        slots.release()
+        raise
+
+
+def _use(pool, slots, conn, readonly):
+    broken = False
+    try:
+        conn.set_session(readonly=readonly)
+        # як і раніше: commit при успіху, rollback при помилці
+        with conn:
+            yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        # з'єднання могло розірватися — не повертаємо його в пул
+        broken = True
+        raise
+    finally:
+        pool.putconn(conn, close=broken or conn.closed != 0)
+        slots.release()
+
+
+@contextmanager
+def get_conn(readonly=False):
+    """З'єднання з пулу на один блок with (commit / rollback, потім назад у пул).
+
+    readonly=True — аналітичне читання: свіжа репліка, якщо є, інакше первинна БД
+    в режимі READ ONLY. Без readonly — первинна БД; такі з'єднання вважаються записом,
+    і наступні читання цього процесу DB_READ_AFTER_WRITE_S секунд теж ідуть на первинну."""
+    if readonly:
+        replica = router.pick()
+        if replica is not None:
+            try:
+                checkout = _checkout(replica)
+            except psycopg2.OperationalError as e:
+                router.failed(replica, e)
+            else:
+                yield from _use(*checkout, readonly=True)
+                return
+    checkout = _checkout(_primary_dsn())
+    if not readonly:
+        router.wrote()
+    yield from _use(*checkout, readonly=readonly)
+
+
+def warm_up():
+    """Підготувати процес до першого запиту (DB_WARMUP=1 або виклик вручну):
+    відкрити DB_WARMUP_CONNECTIONS (типово 5) з'єднань до первинної БД і кожної
+    репліки — вони лишаються в пулі — і на кожному спланувати запити до таблиць
+    ендпоінтів, щоб бекенд PostgreSQL закешував їхній каталог."""
+    n = int(os.getenv("DB_WARMUP_CONNECTIONS", "5"))
+    probe = ";".join(f"SELECT * FROM {t} LIMIT 0" for t in WARMUP_TABLES)
+    for dsn in [_primary_dsn(), *router.replicas]:
+        pool, _ = _pool(dsn)
+        conns = []
+        try:
+            for _ in range(min(n, pool.maxconn)):
+                conns.append(pool.getconn())
+            for conn in conns:
+                with conn, conn.cursor() as cur:
+                    cur.execute(probe)
+        except psycopg2.OperationalError as e:
+            if dsn not in router.replicas:
+                raise
+            router.failed(dsn, e)
+        finally:
+            for conn in conns:
+                pool.putconn(conn, close=conn.closed != 0)
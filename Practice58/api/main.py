@@ -1,12 +1,24 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime, timedelta, date, time
 import os
 
-from api.db import get_conn
+from api.db import get_conn, router, warm_up
+from apicommon.compression import CompressionMiddleware
+from apicommon.fastjson import ORJSONResponse
+
+@asynccontextmanager
+async def lifespan(app):
+    # DB_WARMUP=1: пул з'єднань прогрівається до того, як uvicorn почне приймати запити
+    if os.getenv("DB_WARMUP") == "1":
+        await run_in_threadpool(warm_up)
+    yield
 
-app = FastAPI(title="IAZ Dashboard API")
+app = FastAPI(title="IAZ Dashboard API", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +26,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# documents / week_dynamics — великий JSON для настінних екранів
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
 
 def parse_dt(x: str | None):
     return datetime.fromisoformat(x) if x else None
@@ -40,11 +54,11 @@ class EventCreate(BaseModel):
     severity: int | None = None
     note: str | None = None
 
-def get_time_control():
-    with get_conn() as conn, conn.cursor() as cur:
+def get_time_control(readonly=False):
+    with get_conn(readonly) as conn, conn.cursor() as cur:
         cur.execute("SELECT * FROM time_control WHERE id=1;")
         row = cur.fetchone()
-        if not row:
+        if not row and not readonly:
             # fallback: створимо
             cur.execute("""
                 INSERT INTO time_control (id, astro_time, op_date, op_day_start, mode)
@@ -52,6 +66,10 @@ def get_time_control():
                 RETURNING *;
             """)
             row = cur.fetchone()
+    if not row and readonly:
+        # створення рядка — лише на первинній БД; з'єднання для читання вже
+        # повернуте в пул, тож запит не тримає два слоти одного пулу
+        return get_time_control()
     return row
 
 def compute_op_date(astro: datetime, op_day_start: time) -> date:
@@ -66,7 +84,7 @@ def compute_op_now(astro: datetime, op_date_val: date) -> datetime:
 
 @app.get("/api/time_status")
 def time_status():
-    tc = get_time_control()
+    tc = get_time_control(readonly=True)
 
     astro = tc["astro_time"]
     op_day_start = tc["op_day_start"]
@@ -146,12 +164,17 @@ def create_event(body: EventCreate):
 
     return {"event_id": eid, "op_date": op_date_val.isoformat(), "event_time": ev_time.isoformat(sep=" ", timespec="seconds")}
 
+@app.get("/api/db_status")
+def db_status():
+    # відставання реплік і куди пішли читання
+    return router.snapshot()
+
 # -------------------------
 # Existing endpoints (filters, kpi, charts, docs)
 # -------------------------
 @app.get("/api/filters")
 def filters():
-    with get_conn() as conn, conn.cursor() as cur:
+    with get_conn(readonly=True) as conn, conn.cursor() as cur:
         cur.execute("SELECT unit_id, code FROM units ORDER BY code;")
         units = cur.fetchall()
         cur.execute("SELECT sector_id, name FROM sectors ORDER BY name;")
@@ -200,7 +223,7 @@ def kpi(
       WHERE {" AND ".join(where)};
     """
 
-    with get_conn() as conn, conn.cursor() as cur:
+    with get_conn(readonly=True) as conn, conn.cursor() as cur:
         cur.execute(sql, params)
         row = cur.fetchone()
 
@@ -245,7 +268,7 @@ def worked_docs(
       GROUP BY dt.code
       ORDER BY dt.code;
     """
-    with get_conn() as conn, conn.cursor() as cur:
+    with get_conn(readonly=True) as conn, conn.cursor() as cur:
         cur.execute(sql, params)
         rows = cur.fetchall()
     return {"rows": rows}
@@ -277,7 +300,7 @@ def docs_by_unit(
       GROUP BY u.code
       ORDER BY u.code;
     """
-    with get_conn() as conn, conn.cursor() as cur:
+    with get_conn(readonly=True) as conn, conn.cursor() as cur:
         cur.execute(sql, params)
         rows = cur.fetchall()
     return {"rows": rows}
@@ -319,10 +342,11 @@ def documents(
       ORDER BY d.doc_date DESC
       LIMIT %(limit)s;
     """
-    with get_conn() as conn, conn.cursor() as cur:
+    with get_conn(readonly=True) as conn, conn.cursor() as cur:
         cur.execute(sql, params)
         rows = cur.fetchall()
-    return {"rows": rows}
+    # до 1000 рядків: серіалізуємо RealDictRow напряму, без jsonable_encoder
+    return ORJSONResponse({"rows": rows})
 
 @app.get("/api/week_dynamics")
 def week_dynamics(
@@ -415,7 +439,7 @@ def week_dynamics(
     ORDER BY days.day;
     """
 
-    with get_conn() as conn, conn.cursor() as cur:
+    with get_conn(readonly=True) as conn, conn.cursor() as cur:
         cur.execute(sql_cycle, params)
         cycle_rows = cur.fetchall()
         cur.execute(sql_flow, params)
@@ -432,7 +456,7 @@ def week_dynamics(
 # -------------------------
 @app.get("/api/control_board")
 def control_board():
-    tc = get_time_control()
+    tc = get_time_control(readonly=True)
     astro = tc["astro_time"]
     op_day_start = tc["op_day_start"]
     mode = tc["mode"]
@@ -441,7 +465,7 @@ def control_board():
     # оперативний "зараз"
     op_now = compute_op_now(astro, op_date_val)
 
-    with get_conn() as conn, conn.cursor() as cur:
+    with get_conn(readonly=True) as conn, conn.cursor() as cur:
         # schedule
         cur.execute("""
             SELECT schedule_id, doc_type_code, due_time, tolerance_min, is_event_driven, event_type, sla_minutes, note
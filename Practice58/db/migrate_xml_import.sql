@@ -0,0 +1,21 @@
+-- XML-імпорт (2.3/data_collection_tasks/task_4_xml_creation/import_xml.py) для наявної БД:
+-- ключ documents.ext_id і таблиця unit_reports, як у schema.sql
+BEGIN;
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS ext_id BIGINT;
+CREATE UNIQUE INDEX IF NOT EXISTS documents_ext_id_key ON documents(ext_id);
+
+CREATE TABLE IF NOT EXISTS unit_reports (
+  report_id BIGSERIAL PRIMARY KEY,
+  name TEXT NOT NULL,
+  personnel INT NOT NULL CHECK (personnel >= 0),
+  status TEXT NOT NULL,
+  imported_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+-- таблицю могла створити попередня версія імпорту, без ключа: лишаємо останній звіт
+DELETE FROM unit_reports a USING unit_reports b
+WHERE a.name = b.name AND a.report_id < b.report_id;
+CREATE UNIQUE INDEX IF NOT EXISTS unit_reports_name_key ON unit_reports(name);
+
+COMMIT;
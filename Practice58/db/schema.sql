@@ -2,6 +2,7 @@
 -- Працює для shtab_insait
 
 DROP TABLE IF EXISTS documents CASCADE;
+DROP TABLE IF EXISTS unit_reports CASCADE;
 DROP TABLE IF EXISTS norms CASCADE;
 DROP TABLE IF EXISTS units CASCADE;
 DROP TABLE IF EXISTS sectors CASCADE;
@@ -42,7 +43,19 @@ CREATE TABLE documents (
   processed_at TIMESTAMP,
   delivered_at TIMESTAMP,
 
-  cycle_minutes INT
+  cycle_minutes INT,
+
+  -- id документа у файлі XML-імпорту (2.3/.../import_xml.py): повторний імпорт оновлює, а не дублює
+  ext_id BIGINT UNIQUE
+);
+
+-- звіти підрозділів з unit_data.xml (import_xml.py): один рядок на підрозділ
+CREATE TABLE unit_reports (
+  report_id BIGSERIAL PRIMARY KEY,
+  name TEXT UNIQUE NOT NULL,
+  personnel INT NOT NULL CHECK (personnel >= 0),
+  status TEXT NOT NULL,
+  imported_at TIMESTAMP NOT NULL DEFAULT now()
 );
 
 CREATE TABLE norms (
@@ -0,0 +1,12 @@
+"""
+Модулі, спільні для API exam/ і Practice58/:
+
+    fastjson      ORJSONResponse — серіалізація відповідей через orjson
+    compression   CompressionMiddleware — brotli / gzip з кешем стиснених тіл
+    routing       ReplicaRouter — аналітичні читання на репліки з урахуванням відставання
+
+Застосунки запускаються зі своїх каталогів і додають корінь репозиторію до
+шляху імпорту (exam/main.py, Practice58/api/__init__.py):
+
+    from apicommon.fastjson import ORJSONResponse
+"""
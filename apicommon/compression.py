@@ -0,0 +1,141 @@
+"""
+Стиснення відповідей (brotli / gzip) з узгодженням через Accept-Encoding.
+
+- відповіді менші за minimum_size не стискаються;
+- текстові відповіді мають Vary: Accept-Encoding, навіть нестиснуті (малі
+  або для клієнта без gzip/br): інакше кеш/проксі віддасть їх не тому клієнту;
+- стискаються лише текстові типи (JSON, text/*);
+- стиснуті тіла кешуються за хешем вмісту: дашборд, що оновлюється
+  кожні N секунд з тими самими даними, не стискає їх повторно.
+
+brotli — опційна залежність; без неї працює лише gzip.
+"""
+import gzip
+import hashlib
+from collections import OrderedDict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+
+    for enc in ("br", "gzip"):
+        if enc == "br" and brotli is None:
+            continue
+        if accepted.get(enc, accepted.get("*", 0.0)) > 0:
+            return enc
+    return None
+
+
+def with_vary(headers):
+    """Заголовки ASGI з Accept-Encoding у Vary (без дубля, якщо вже є)."""
+    vary = dict(headers).get(b"vary")
+    if vary and b"accept-encoding" in vary.lower():
+        return list(headers)
+    return [(k, v) for k, v in headers if k != b"vary"] + [
+        (b"vary", (vary + b", Accept-Encoding") if vary else b"Accept-Encoding")
+    ]
+
+
+def negotiable(headers) -> bool:
+    """Текстова відповідь, ще не стиснута застосунком, — її вигляд залежить від Accept-Encoding."""
+    headers = dict(headers)
+    ctype = headers.get(b"content-type", b"").decode("latin-1")
+    return b"content-encoding" not in headers and ctype.startswith(COMPRESSIBLE_TYPES)
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 5,
+                 brotli_quality: int = 4, cache_size: int = 256):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache_size = cache_size
+        self._cache: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            return hit
+
+        if encoding == "br":
+            out = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            out = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+        self._cache[key] = out
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return out
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            async def vary_send(message):
+                if message["type"] == "http.response.start" and negotiable(message.get("headers") or []):
+                    message = {**message, "headers": with_vary(message["headers"])}
+                await send(message)
+
+            return await self.app(scope, receive, vary_send)
+
+        start = None
+        passthrough = False
+
+        async def wrapped_send(message):
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                return await send(message)
+
+            body = message.get("body", b"")
+            resp_headers = dict(start.get("headers") or [])
+            ctype = resp_headers.get(b"content-type", b"").decode("latin-1")
+
+            # потокові відповіді, вже стиснуті, малі й нетекстові — як є
+            if (
+                message.get("more_body", False)
+                or b"content-encoding" in resp_headers
+                or len(body) < self.minimum_size
+                or not ctype.startswith(COMPRESSIBLE_TYPES)
+            ):
+                passthrough = True
+                if negotiable(start.get("headers") or []):
+                    start = {**start, "headers": with_vary(start["headers"])}
+                await send(start)
+                return await send(message)
+
+            body = self.compress(body, encoding)
+            new_headers = [(k, v) for k, v in with_vary(start["headers"]) if k != b"content-length"]
+            new_headers += [
+                (b"content-encoding", encoding.encode()),
+                (b"content-length", str(len(body)).encode()),
+            ]
+            await send({**start, "headers": new_headers})
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, wrapped_send)
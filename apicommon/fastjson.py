@@ -0,0 +1,35 @@
+"""
+Швидка JSON-серіалізація відповідей через orjson.
+
+ORJSONResponse — відповідь за замовчуванням для застосунку.
+Великі списки (exam: allocations, map_points; Practice58: documents) повертаються як
+ORJSONResponse(dict_rows) напряму: FastAPI тоді не валідує їх
+через Pydantic і не проходить jsonable_encoder по кожному полю.
+"""
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# OPT_UTC_Z: "…Z" для UTC, як у Pydantic
+OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def _default(obj):
+    # як fastapi.encoders.decimal_encoder: ціле -> int, інакше float;
+    # NaN / Infinity (exponent — рядок "n" / "F") -> null, як float NaN в orjson
+    if isinstance(obj, Decimal):
+        if not obj.is_finite():
+            return None
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
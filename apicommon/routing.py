@@ -0,0 +1,142 @@
+"""
+Маршрутизація аналітичних читань на репліки PostgreSQL з урахуванням відставання.
+
+- записи завжди йдуть на первинну БД; читання — на репліку (по колу серед
+  придатних), якщо її відставання не більше за max_lag_s;
+- відставання кожної репліки перевіряється (LAG_SQL) не частіше ніж раз
+  на check_interval_s — запити між перевірками беруть збережене значення;
+- недоступна репліка (помилка перевірки чи з'єднання) пропускається
+  retry_s секунд, читання тим часом іде на первинну;
+- після запису цього процесу читання sticky_s секунд ідуть на первинну,
+  щоб клієнт одразу бачив власні зміни (у межах одного воркера uvicorn).
+
+Налаштування з оточення (router_settings):
+    DATABASE_REPLICA_URLS    через кому; порожньо — усе на первинну
+    DB_REPLICA_MAX_LAG_S     5
+    DB_REPLICA_CHECK_S       1
+    DB_REPLICA_RETRY_S       5
+    DB_READ_AFTER_WRITE_S    = DB_REPLICA_MAX_LAG_S
+"""
+import itertools
+import os
+import re
+import threading
+import time
+from collections import Counter
+
+# на первинній 0; на репліці, що відтворила все отримане, теж 0 — інакше
+# вік останньої відтвореної транзакції (при простої первинної він би ріс сам)
+LAG_SQL = """
+SELECT CASE
+  WHEN NOT pg_is_in_recovery() THEN 0
+  WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+  ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END::float8
+"""
+
+
+def replica_urls() -> list[str]:
+    return [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+
+
+def router_settings() -> dict:
+    max_lag = float(os.getenv("DB_REPLICA_MAX_LAG_S", "5"))
+    return {
+        "max_lag_s": max_lag,
+        "check_interval_s": float(os.getenv("DB_REPLICA_CHECK_S", "1")),
+        "retry_s": float(os.getenv("DB_REPLICA_RETRY_S", "5")),
+        "sticky_s": float(os.getenv("DB_READ_AFTER_WRITE_S", str(max_lag))),
+    }
+
+
+def mask_password(url: str) -> str:
+    url = re.sub(r"(://[^:/@]+:)[^@]*@", r"\1***@", url)
+    return re.sub(r"(password=)\S+", r"\1***", url)
+
+
+class ReplicaRouter:
+    def __init__(self, replicas, probe, names=None, max_lag_s=5.0, check_interval_s=1.0,
+                 retry_s=5.0, sticky_s=None):
+        self.replicas = list(replicas)
+        self.probe = probe                      # репліка -> відставання, с (виняток = недоступна)
+        self.names = list(names) if names else [mask_password(str(r)) for r in self.replicas]
+        self.max_lag_s = max_lag_s
+        self.check_interval_s = check_interval_s
+        self.retry_s = retry_s
+        self.sticky_s = max_lag_s if sticky_s is None else sticky_s
+        self._state = [{"lag": None, "checked": float("-inf"), "down_until": 0.0, "error": None,
+                        "probing": False} for _ in self.replicas]
+        self._next = itertools.count()
+        self._last_write = float("-inf")
+        self._lock = threading.Lock()
+        self.routes = Counter()
+
+    def _count(self, route):
+        with self._lock:
+            self.routes[route] += 1
+
+    def wrote(self):
+        self._last_write = time.monotonic()
+
+    def _lag(self, i, now):
+        s = self._state[i]
+        with self._lock:
+            due = (not s["probing"] and now >= s["down_until"]
+                   and now - s["checked"] >= self.check_interval_s)
+            if due:
+                s["probing"] = True  # перевіряє один потік, решта беруть попереднє значення
+        if due:
+            try:
+                lag, error = float(self.probe(self.replicas[i])), None
+            except Exception as e:
+                lag, error = None, e
+            with self._lock:
+                checked = time.monotonic()
+                s.update(lag=lag, checked=checked, probing=False, error=None if error is None else repr(error))
+                if error is not None:
+                    s["down_until"] = checked + self.retry_s
+        if time.monotonic() < s["down_until"]:
+            return None
+        return s["lag"]
+
+    def pick(self):
+        """Репліка для читання або None — читати з первинної."""
+        if not self.replicas:
+            self._count("primary:no_replicas")
+            return None
+        now = time.monotonic()
+        if now - self._last_write < self.sticky_s:
+            self._count("primary:after_write")
+            return None
+        start = next(self._next)
+        lagging = False
+        for k in range(len(self.replicas)):
+            i = (start + k) % len(self.replicas)
+            lag = self._lag(i, now)
+            if lag is None:
+                continue
+            if lag > self.max_lag_s:
+                lagging = True
+                continue
+            self._count(f"replica:{self.names[i]}")
+            return self.replicas[i]
+        self._count("primary:lag" if lagging else "primary:down")
+        return None
+
+    def failed(self, replica, error):
+        """З'єднання з реплікою не вдалося — пропустити її на retry_s секунд."""
+        i = self.replicas.index(replica)
+        with self._lock:
+            s = self._state[i]
+            s.update(error=repr(error), down_until=time.monotonic() + self.retry_s)
+            self.routes["replica_errors"] += 1
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "max_lag_s": self.max_lag_s,
+                "replicas": [{"name": name, "lag_s": s["lag"], "down": now < s["down_until"], "error": s["error"]}
+                             for name, s in zip(self.names, self._state)],
+                "routes": dict(self.routes),
+            }
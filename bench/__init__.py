@@ -0,0 +1,14 @@
+"""
+Навантажувальний бенчмарк для дашбордів exam/ та Practice58/.
+
+Запуск:  python -m bench --help
+"""
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# ціль -> (каталог проєкту, "модуль:атрибут" ASGI-застосунку)
+TARGETS = {
+    "exam": (ROOT / "exam", "main:app"),
+    "practice58": (ROOT / "Practice58", "api.main:app"),
+}
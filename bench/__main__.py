@@ -0,0 +1,196 @@
+"""
+CLI бенчмарку.
+
+    python -m bench seed    --target exam --scale medium
+    python -m bench run     --target exam --scale medium --concurrency 8 --refreshes 30
+    python -m bench compare bench/results/old.json bench/results/new.json
+
+DSN береться з --dsn або BENCH_DATABASE_URL.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from functools import partial
+from pathlib import Path
+
+from bench import ROOT, TARGETS
+from bench.load import run_load
+from bench.report import build_report, compare, git_commit, write_report
+from bench.seed import SCALES, libpq_dsn, seed
+from bench.server import STATS_PATH
+from bench.workload import MIXES
+
+RESULTS_DIR = ROOT / "bench" / "results"
+
+
+def env_dsn(args) -> str:
+    dsn = args.dsn or os.getenv("BENCH_DATABASE_URL")
+    if not dsn:
+        raise SystemExit("Потрібен --dsn або BENCH_DATABASE_URL (окрема БД для бенчмарку).")
+    return dsn
+
+
+def rows_for(args) -> int:
+    return args.rows or SCALES[args.scale]
+
+
+def http_json(url: str, method: str = "GET"):
+    req = urllib.request.Request(url, method=method)
+    with urllib.request.urlopen(req, timeout=10) as r:
+        return json.loads(r.read() or b"null")
+
+
+def start_server(target: str, dsn: str, port: int, replica_dsns: list[str] | None = None,
+                 query_log: str | None = None) -> subprocess.Popen:
+    # Practice58 передає DATABASE_URL прямо в psycopg2 — потрібен libpq-формат
+    convert = (lambda d: d) if target == "exam" else libpq_dsn
+    env = {**os.environ, "DATABASE_URL": convert(dsn)}
+    if replica_dsns:
+        # аналітичні читання -> репліки (apicommon/routing.py)
+        env["DATABASE_REPLICA_URLS"] = ",".join(convert(d) for d in replica_dsns)
+    cmd = [sys.executable, "-m", "bench.server", "--target", target, "--port", str(port)]
+    if query_log:
+        cmd += ["--query-log", str(Path(query_log).resolve())]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"Сервер {target} завершився з кодом {proc.returncode}")
+        try:
+            http_json(f"http://127.0.0.1:{port}{STATS_PATH}")
+            return proc
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("Сервер не піднявся за 30 с")
+
+
+def cmd_seed(args):
+    rows = rows_for(args)
+    t0 = time.perf_counter()
+    inserted = seed(args.target, env_dsn(args), rows, args.seed)
+    print(f"✅ {args.target}: {inserted} рядків за {time.perf_counter() - t0:.1f} с")
+
+
+def cmd_run(args):
+    dsn = None if args.url else env_dsn(args)
+    if args.seed_db:
+        cmd_seed(args)
+
+    proc = None
+    base_url = args.url
+    if not base_url:
+        proc = start_server(args.target, dsn, args.port, args.replica_dsn, args.query_log)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        mix = MIXES[args.target]
+        if args.approx:
+            if args.target != "exam":
+                raise SystemExit("--approx підтримує лише --target exam")
+            mix = partial(mix, approx=True)
+        headers = {"Accept-Encoding": args.accept_encoding} if args.accept_encoding else {}
+        # прогрів: кеш сторінок PostgreSQL, пул з'єднань, ліниві імпорти
+        run_load(base_url, mix, concurrency=args.concurrency, refreshes=args.warmup,
+                 seed=args.seed + 1, headers=headers)
+        try:
+            http_json(base_url + STATS_PATH, method="DELETE")
+            counted = True
+        except (urllib.error.URLError, OSError):
+            counted = False
+
+        samples, elapsed = run_load(base_url, mix, concurrency=args.concurrency,
+                                    refreshes=args.refreshes, seed=args.seed, headers=headers)
+        db_queries = http_json(base_url + STATS_PATH) if counted else None
+    finally:
+        if proc:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    meta = {
+        "target": args.target,
+        "scale": None if args.rows else args.scale,
+        "rows": rows_for(args),
+        "concurrency": args.concurrency,
+        "refreshes": args.refreshes,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "accept_encoding": args.accept_encoding,
+        "replicas": len(args.replica_dsn or []),
+        "approx": args.approx,
+    }
+    report = build_report(samples, elapsed, meta, db_queries)
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{args.target}-{meta['rows']}-{git_commit() or 'nogit'}.json"
+    write_report(report, out)
+
+    t = report["totals"]
+    print(f"{args.target}: {t['requests']} запитів, {t['throughput_rps']} rps, "
+          f"p50={t['p50_ms']} p95={t['p95_ms']} p99={t['p99_ms']} мс, помилок {t['errors']}")
+    print(f"Звіт: {out}")
+
+
+def cmd_compare(args):
+    base = json.loads(Path(args.base).read_text(encoding="utf-8"))
+    new = json.loads(Path(args.new).read_text(encoding="utf-8"))
+    for key in ("target", "rows", "concurrency", "refreshes", "seed", "accept_encoding", "approx"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(f"⚠ різні параметри прогону: {key} {base['meta'].get(key)} != {new['meta'].get(key)}")
+
+    lines, regressions = compare(base, new, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\nРегресій понад {args.threshold:.0%}: {len(regressions)}")
+        raise SystemExit(1)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bench", description="Бенчмарк API дашбордів")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    def common(p):
+        p.add_argument("--target", choices=sorted(TARGETS), required=True)
+        p.add_argument("--dsn", help="DSN тестової БД (інакше BENCH_DATABASE_URL)")
+        p.add_argument("--scale", choices=list(SCALES), default="small")
+        p.add_argument("--rows", type=int, help="точна кількість рядків (замість --scale)")
+        p.add_argument("--seed", type=int, default=13)
+
+    p = sub.add_parser("seed", help="наповнити БД у заданому масштабі")
+    common(p)
+    p.set_defaults(func=cmd_seed)
+
+    p = sub.add_parser("run", help="прогнати сценарій оновлень дашборду")
+    common(p)
+    p.add_argument("--seed-db", action="store_true", help="перед прогоном наповнити БД")
+    p.add_argument("--url", help="вже запущений API (без підрахунку SQL-запитів)")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--concurrency", type=int, default=8, help="кількість паралельних дашбордів")
+    p.add_argument("--refreshes", type=int, default=30, help="оновлень на дашборд")
+    p.add_argument("--warmup", type=int, default=3)
+    p.add_argument("--accept-encoding", default="",
+                   help='заголовок Accept-Encoding клієнта, напр. "gzip" або "br, gzip"')
+    p.add_argument("--replica-dsn", action="append",
+                   help="DSN репліки для аналітичних читань (можна кілька), див. python -m bench.replica")
+    p.add_argument("--approx", action="store_true",
+                   help="exam: /kpi, /trend, /distribution/* з approx=true (вибірка, exam/approx.py)")
+    p.add_argument("--query-log", help="записати SQL сервера в JSONL (python exam/index_advisor.py ФАЙЛ)")
+    p.add_argument("--out", help="шлях до JSON-звіту")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("compare", help="порівняти два звіти")
+    p.add_argument("base")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=0.10, help="допустиме погіршення (0.10 = 10%%)")
+    p.set_defaults(func=cmd_compare)
+
+    args = ap.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Генератор навантаження: N паралельних «дашбордів», кожен робить R оновлень.
+
+Лише стандартна бібліотека (http.client + потоки), щоб клієнт
+не залежав від версій httpx/requests між комітами.
+"""
+import http.client
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import urlsplit
+
+
+@dataclass
+class Sample:
+    path: str
+    status: int
+    seconds: float
+    bytes: int
+
+
+class Client:
+    """Keep-alive з'єднання на потік — як у браузера."""
+
+    def __init__(self, base_url: str, headers: dict | None = None, timeout: float = 30.0):
+        u = urlsplit(base_url)
+        self.host, self.port = u.hostname, u.port or 80
+        self.headers = headers or {}
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conn(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        return conn
+
+    def get(self, url: str) -> Sample:
+        path = url.split("?", 1)[0]
+        t0 = time.perf_counter()
+        try:
+            conn = self._conn()
+            conn.request("GET", url, headers=self.headers)
+            resp = conn.getresponse()
+            body = resp.read()
+            return Sample(path, resp.status, time.perf_counter() - t0, len(body))
+        except (OSError, http.client.HTTPException):
+            self._local.conn = None
+            return Sample(path, 0, time.perf_counter() - t0, 0)
+
+
+def run_dashboard(client: Client, mix, rng: random.Random, refreshes: int, out: list):
+    now = datetime.now().astimezone()
+    # пул на дашборд: паралельний етап (Promise.all) іде окремими з'єднаннями
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(refreshes):
+            for stage in mix(rng, now):
+                if len(stage) == 1:
+                    out.append(client.get(stage[0]))
+                else:
+                    out.extend(pool.map(client.get, stage))
+
+
+def run_load(base_url: str, mix, *, concurrency: int, refreshes: int, seed: int,
+             headers: dict | None = None) -> tuple[list[Sample], float]:
+    """Повертає (семпли, тривалість у секундах)."""
+    client = Client(base_url, headers)
+    per_dashboard = [[] for _ in range(concurrency)]
+
+    threads = [
+        threading.Thread(
+            target=run_dashboard,
+            args=(client, mix, random.Random(f"{seed}:{i}"), refreshes, per_dashboard[i]),
+        )
+        for i in range(concurrency)
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    return [s for chunk in per_dashboard for s in chunk], elapsed
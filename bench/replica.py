@@ -0,0 +1,110 @@
+"""
+Локальна потокова репліка PostgreSQL для перевірки маршрутизації читань
+(apicommon/routing.py) на двох інстансах.
+
+    python -m bench.replica create --primary-port 5432 --port 5433 --datadir /tmp/pg-replica
+    python -m bench.replica status --port 5433
+    python -m bench.replica pause  --port 5433     # зупинити відтворення WAL — штучне відставання
+    python -m bench.replica resume --port 5433
+    python -m bench.replica stop   --datadir /tmp/pg-replica
+
+create: pg_basebackup -R (standby.signal + primary_conninfo) і pg_ctl start
+на --port. Первинна має дозволяти replication-з'єднання (pg_hba.conf) —
+у типовій локальній установці це так. Утиліти PostgreSQL шукаються в
+--bindir, PATH або через pg_config; pg_ctl не запускається від root.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+
+import psycopg2
+
+STATUS_SQL = """
+SELECT pg_is_in_recovery() AS in_recovery,
+       pg_is_wal_replay_paused() AS paused,
+       pg_last_wal_receive_lsn()::text AS received,
+       pg_last_wal_replay_lsn()::text AS replayed,
+       EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8 AS last_replay_age_s
+"""
+
+
+def bindir(explicit: str | None) -> str:
+    if explicit:
+        return explicit
+    found = shutil.which("pg_basebackup")
+    if found:
+        return os.path.dirname(found)
+    pg_config = shutil.which("pg_config")
+    if pg_config:
+        return subprocess.run([pg_config, "--bindir"], capture_output=True, text=True, check=True).stdout.strip()
+    raise SystemExit("Не знайдено утиліт PostgreSQL: задайте --bindir")
+
+
+def create(args):
+    bin_ = bindir(args.bindir)
+    if os.path.exists(args.datadir) and os.listdir(args.datadir):
+        raise SystemExit(f"{args.datadir} не порожній")
+    subprocess.run([os.path.join(bin_, "pg_basebackup"), "-h", args.primary_host, "-p", str(args.primary_port),
+                    "-U", args.user, "-D", args.datadir, "-R", "-X", "stream", "-c", "fast"], check=True)
+    start(args)
+
+
+def start(args):
+    bin_ = bindir(args.bindir)
+    subprocess.run([os.path.join(bin_, "pg_ctl"), "-D", args.datadir, "-l", os.path.join(args.datadir, "replica.log"),
+                    "-o", f"-p {args.port} -k {args.socket_dir}", "-w", "start"], check=True)
+    print(f"Репліка на {args.host}:{args.port}: DATABASE_REPLICA_URLS=postgresql://{args.user}@{args.host}:{args.port}/<бд>")
+
+
+def stop(args):
+    subprocess.run([os.path.join(bindir(args.bindir), "pg_ctl"), "-D", args.datadir, "-m", "fast", "stop"], check=True)
+
+
+def _query(args, sql):
+    with psycopg2.connect(host=args.host, port=args.port, user=args.user, dbname="postgres") as conn:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(sql)
+            if cur.description:
+                return dict(zip([c.name for c in cur.description], cur.fetchone()))
+    return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bench.replica", description="Локальна репліка PostgreSQL")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    def common(p, datadir=False):
+        p.add_argument("--host", default="127.0.0.1")
+        p.add_argument("--port", type=int, default=5433)
+        p.add_argument("--user", default="postgres")
+        p.add_argument("--bindir", help="каталог з pg_basebackup / pg_ctl")
+        if datadir:
+            p.add_argument("--datadir", default="/tmp/pg-replica")
+            p.add_argument("--socket-dir", default="/tmp")
+
+    p = sub.add_parser("create", help="pg_basebackup з первинної і запуск репліки")
+    common(p, datadir=True)
+    p.add_argument("--primary-host", default="127.0.0.1")
+    p.add_argument("--primary-port", type=int, default=5432)
+    p.set_defaults(func=create)
+    p = sub.add_parser("start", help="запустити вже створену репліку")
+    common(p, datadir=True)
+    p.set_defaults(func=start)
+    p = sub.add_parser("stop")
+    common(p, datadir=True)
+    p.set_defaults(func=stop)
+    for name, sql, help_ in [("status", STATUS_SQL, "стан відтворення WAL"),
+                             ("pause", "SELECT pg_wal_replay_pause()", "зупинити відтворення (відставання росте)"),
+                             ("resume", "SELECT pg_wal_replay_resume()", "продовжити відтворення")]:
+        p = sub.add_parser(name, help=help_)
+        common(p)
+        p.set_defaults(func=lambda a, sql=sql: print(_query(a, sql) or "ok"))
+
+    args = ap.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Агрегація семплів у JSON-звіт і порівняння двох звітів.
+"""
+import json
+import math
+import platform
+import subprocess
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from bench import ROOT
+
+# метрики, зростання яких — регресія (для rps — навпаки)
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    # nearest-rank: стабільний між прогонами, без інтерполяції
+    if not sorted_values:
+        return 0.0
+    k = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+def latency_block(seconds: list[float]) -> dict:
+    ms = sorted(s * 1000 for s in seconds)
+    return {
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "max_ms": round(ms[-1], 3) if ms else 0.0,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(samples, elapsed: float, meta: dict, db_queries: dict | None) -> dict:
+    by_path = defaultdict(list)
+    for s in samples:
+        by_path[s.path].append(s)
+
+    endpoints = {}
+    for path in sorted(by_path):
+        group = by_path[path]
+        ok = [s for s in group if 200 <= s.status < 400]
+        entry = {
+            "requests": len(group),
+            "errors": len(group) - len(ok),
+            "throughput_rps": round(len(group) / elapsed, 2) if elapsed else 0.0,
+            **latency_block([s.seconds for s in ok]),
+            "bytes_mean": round(sum(s.bytes for s in ok) / len(ok)) if ok else 0,
+            "db_queries_per_request": None,
+        }
+        q = (db_queries or {}).get(path)
+        if q and q["requests"]:
+            entry["db_queries_per_request"] = round(q["queries"] / q["requests"], 2)
+        endpoints[path] = entry
+
+    ok_all = [s for s in samples if 200 <= s.status < 400]
+    return {
+        "meta": {
+            **meta,
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "elapsed_s": round(elapsed, 3),
+        },
+        "totals": {
+            "requests": len(samples),
+            "errors": len(samples) - len(ok_all),
+            "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else 0.0,
+            "refreshes_per_s": round(meta["concurrency"] * meta["refreshes"] / elapsed, 2) if elapsed else 0.0,
+            **latency_block([s.seconds for s in ok_all]),
+            "bytes_total": sum(s.bytes for s in ok_all),
+            "db_queries_total": sum(q["queries"] for q in (db_queries or {}).values()) if db_queries else None,
+        },
+        "endpoints": endpoints,
+    }
+
+
+def write_report(report: dict, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _delta(old, new):
+    if not old:
+        return None
+    return (new - old) / old
+
+
+def compare(base: dict, new: dict, threshold: float) -> tuple[list[str], list[str]]:
+    """Повертає (рядки таблиці, список регресій)."""
+    lines, regressions = [], []
+    rows = [("TOTAL", base["totals"], new["totals"])]
+    rows += [(p, base["endpoints"][p], new["endpoints"][p])
+             for p in sorted(set(base["endpoints"]) & set(new["endpoints"]))]
+
+    lines.append(f"{'endpoint':32} {'metric':14} {'base':>10} {'new':>10} {'delta':>8}")
+    for name, b, n in rows:
+        for key in (*LATENCY_KEYS, "throughput_rps", "bytes_mean", "bytes_total", "db_queries_per_request"):
+            if b.get(key) is None or n.get(key) is None:
+                continue
+            d = _delta(b[key], n[key])
+            mark = ""
+            worse = d is not None and (d < -threshold if key == "throughput_rps" else d > threshold)
+            if worse:
+                mark = "  <-- регресія"
+                regressions.append(f"{name} {key}: {b[key]} -> {n[key]}")
+            ds = f"{d * 100:+.1f}%" if d is not None else "n/a"
+            lines.append(f"{name:32} {key:14} {b[key]:>10} {n[key]:>10} {ds:>8}{mark}")
+    return lines, regressions
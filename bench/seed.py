@@ -0,0 +1,133 @@
+"""
+Наповнення локального PostgreSQL для бенчмарку у заданому масштабі.
+
+- practice58: схема db/schema.sql + db/migrate_control.sql, документи
+  генерує Practice58/db/seed.py (той самий генератор, що й для демо).
+- exam: таблиця з exam/sql/init.sql, рядки генерує generate_allocations()
+  — Python-аналог generate_series з init.sql; після них — вибірка для
+  approx=true (exam/sql/sample.sql) та індекси exam/sql/indexes.sql
+  (exam/schema.py apply — поза транзакцією, бо CONCURRENTLY).
+"""
+import importlib.util
+import random
+from datetime import datetime, timedelta
+
+from bench import ROOT
+
+# масштаб -> кількість рядків у головній таблиці цілі
+SCALES = {
+    "small": 1_000,
+    "medium": 20_000,
+    "large": 200_000,
+}
+
+DIRECTIONS = ["Північ", "Південь", "Схід", "Захід", "Центр"]
+RESOURCE_TYPES = ["Паливо", "Боєприпаси", "Медицина", "Ремонт", "Звʼязок", "Провізія"]
+ALLOC_UNITS = ["J1", "J2", "J3", "J4", "J5"]
+REASONS = ["Поповнення", "Планова ротація", "Екстрене підсилення", "Навчання", "Перекидання"]
+SOURCES = ["Штаб", "Склад", "Підрозділ", "Суміжники", "Розвідка"]
+NOTES = ["Без приміток", "Потребує уточнення", "Погоджено старшим", "Терміново", "Контроль виконання"]
+
+
+def libpq_dsn(url: str) -> str:
+    # exam використовує URL SQLAlchemy (postgresql+psycopg2://...), psycopg2 його не розуміє
+    if "://" in url:
+        scheme, rest = url.split("://", 1)
+        return f"{scheme.split('+', 1)[0]}://{rest}"
+    return url
+
+
+def run_sql_file(cur, path):
+    cur.execute(path.read_text(encoding="utf-8"))
+
+
+def _load(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_practice58_seed():
+    # Practice58/db не є пакетом — підвантажуємо seed.py за шляхом
+    return _load("practice58_seed", ROOT / "Practice58" / "db" / "seed.py")
+
+
+def generate_allocations(n: int, rng: random.Random, now: datetime | None = None, days: int = 120):
+    """Рядки resource_allocations з тим самим розподілом, що й у exam/sql/init.sql."""
+    now = now or datetime.now().astimezone()
+    for _ in range(n):
+        occurred_at = now - timedelta(
+            days=rng.random() * days,
+            hours=rng.random() * 24,
+            minutes=rng.random() * 60,
+        )
+        yield (
+            occurred_at,
+            rng.choice(DIRECTIONS),
+            rng.choice(RESOURCE_TYPES),
+            rng.choice(ALLOC_UNITS),
+            rng.choice(REASONS),
+            round(10 + rng.random() * 1990, 2),
+            round(1 + rng.random() * 29, 2),
+            rng.choice(SOURCES),
+            rng.random() < 0.70,
+            rng.choice(NOTES),
+        )
+
+
+def seed_exam(conn, rows: int, seed: int) -> int:
+    from psycopg2.extras import execute_values
+
+    rng = random.Random(seed)
+    with conn.cursor() as cur:
+        run_sql_file(cur, ROOT / "exam" / "sql" / "init.sql")
+        cur.execute("TRUNCATE TABLE public.resource_allocations RESTART IDENTITY;")
+        execute_values(
+            cur,
+            """
+            INSERT INTO public.resource_allocations (
+              occurred_at, direction, resource_type, unit, allocation_reason,
+              amount, duration_days, source, confirmed, notes
+            ) VALUES %s
+            """,
+            generate_allocations(rows, rng),
+            page_size=2000,
+        )
+        cur.execute("ANALYZE public.resource_allocations;")
+        run_sql_file(cur, ROOT / "exam" / "sql" / "sample.sql")
+    return rows
+
+
+def seed_practice58(conn, rows: int, seed: int) -> int:
+    seed_mod = load_practice58_seed()
+    seed_mod.random.seed(seed)
+    with conn.cursor() as cur:
+        run_sql_file(cur, ROOT / "Practice58" / "db" / "schema.sql")
+        run_sql_file(cur, ROOT / "Practice58" / "db" / "migrate_control.sql")
+        seed_mod.ensure_reference_data(cur)
+        seed_mod.clear_documents(cur)
+        inserted = seed_mod.generate_week_documents(cur, days=7, total_docs=rows, overload_unit="J3")
+        cur.execute("ANALYZE documents;")
+    return inserted
+
+
+SEEDERS = {
+    "exam": seed_exam,
+    "practice58": seed_practice58,
+}
+
+
+def seed(target: str, dsn: str, rows: int, seed_value: int = 13) -> int:
+    import psycopg2
+
+    conn = psycopg2.connect(libpq_dsn(dsn))
+    try:
+        inserted = SEEDERS[target](conn, rows, seed_value)
+        conn.commit()
+        if target == "exam":
+            conn.autocommit = True
+            _load("exam_schema", ROOT / "exam" / "schema.py").apply(conn=conn)
+    finally:
+        conn.close()
+    return inserted
@@ -0,0 +1,141 @@
+"""
+Мікробенчмарк серіалізації великих відповідей: до/після orjson.
+
+    python -m bench.serialization --rows 2000 --repeat 30
+
+"before" — шлях FastAPI за замовчуванням: валідація response_model
+(для exam), jsonable_encoder і json.dumps як у JSONResponse.render.
+"after" — fastjson.dumps() над сирими рядками з БД.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from bench import TARGETS
+from bench.seed import generate_allocations
+
+ALLOCATION_FIELDS = [
+    "occurred_at", "direction", "resource_type", "unit", "allocation_reason",
+    "amount", "duration_days", "source", "confirmed", "notes",
+]
+
+
+def import_apps():
+    # main.py exam вимагає DATABASE_URL; з'єднання тут не відкриваються
+    os.environ.setdefault("DATABASE_URL", "postgresql+psycopg2://bench@127.0.0.1/bench")
+    for project_dir, _ in TARGETS.values():
+        sys.path.insert(0, str(project_dir))
+    import main as exam_main
+    from apicommon import fastjson  # спільний для exam і Practice58
+    return exam_main, fastjson
+
+
+def allocation_rows(n: int, rng: random.Random) -> list[dict]:
+    rows = []
+    for i, values in enumerate(generate_allocations(n, rng), start=1):
+        row = {"id": i, **dict(zip(ALLOCATION_FIELDS, values))}
+        row["amount"] = Decimal(str(row["amount"]))
+        row["duration_days"] = Decimal(str(row["duration_days"]))
+        rows.append(row)
+    return rows
+
+
+def document_rows(n: int, rng: random.Random) -> list[dict]:
+    now = datetime.now().replace(microsecond=0)
+    return [
+        {
+            "doc_id": i,
+            "reg_number": None,
+            "title": "БД: уточнення обстановки (J3, Сектор А)",
+            "doc_date": now - timedelta(minutes=rng.randint(0, 7 * 24 * 60)),
+            "unit": rng.choice(["J1", "J2", "J3", "J4", "J5", "J6", "J7"]),
+            "sector": rng.choice(["Сектор А", "Сектор Б", "Сектор В"]),
+            "doc_type": rng.choice(["ПБД", "БД", "БЧС", "ЗВІТ", "РОЗП"]),
+            "status": rng.choice(["отримано", "в_роботі", "доведено", "прострочено"]),
+            "priority": rng.randint(1, 3),
+            "cycle_minutes": rng.randint(5, 600),
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def std_json(content) -> bytes:
+    # те саме, що starlette JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def timed(fn, repeat: int) -> dict:
+    fn()  # прогрів
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        size = len(fn())
+        runs.append((time.perf_counter() - t0) * 1000)
+    return {"median_ms": round(statistics.median(runs), 3), "min_ms": round(min(runs), 3), "bytes": size}
+
+
+def cases(n: int, seed: int):
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    exam_main, fastjson = import_apps()
+    rng = random.Random(seed)
+
+    alloc = allocation_rows(n, rng)
+    orm_like = [SimpleNamespace(**r) for r in alloc]
+    page_adapter = TypeAdapter(exam_main.AllocationsPage)
+
+    points = [
+        {k: r[k] for k in ("id", "occurred_at", "direction", "resource_type", "unit", "amount", "confirmed")}
+        | {"lat": 48.4 + rng.random(), "lon": 31.1 + rng.random()}
+        for r in alloc
+    ]
+    points_adapter = TypeAdapter(list[exam_main.MapPoint])
+
+    docs = document_rows(n, rng)
+
+    yield "/allocations", {
+        "before": lambda: std_json(jsonable_encoder(page_adapter.validate_python(
+            {"items": orm_like, "total": n, "limit": n, "offset": 0}, from_attributes=True))),
+        "after": lambda: fastjson.dumps({"items": alloc, "total": n, "limit": n, "offset": 0}),
+    }
+    yield "/map_points", {
+        "before": lambda: std_json(jsonable_encoder(points_adapter.validate_python(points))),
+        "after": lambda: fastjson.dumps(points),
+    }
+    yield "/api/documents", {
+        "before": lambda: std_json(jsonable_encoder({"rows": docs})),
+        "after": lambda: fastjson.dumps({"rows": docs}),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Серіалізація відповідей: FastAPI за замовчуванням vs orjson")
+    ap.add_argument("--rows", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=30)
+    ap.add_argument("--seed", type=int, default=13)
+    ap.add_argument("--out", help="шлях до JSON-звіту")
+    args = ap.parse_args(argv)
+
+    results = {}
+    for name, variants in cases(args.rows, args.seed):
+        results[name] = {k: timed(fn, args.repeat) for k, fn in variants.items()}
+        b, a = results[name]["before"], results[name]["after"]
+        results[name]["speedup"] = round(b["median_ms"] / a["median_ms"], 1) if a["median_ms"] else None
+        print(f"{name:16} before {b['median_ms']:9.3f} мс   after {a['median_ms']:8.3f} мс   "
+              f"x{results[name]['speedup']}   ({a['bytes']} B)")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"rows": args.rows, "repeat": args.repeat, "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
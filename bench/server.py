@@ -0,0 +1,149 @@
+"""
+Запуск API цілі під uvicorn з лічильником SQL-запитів по ендпоінтах.
+
+    python -m bench.server --target exam --port 8765
+
+Лічильник підміняє psycopg2.connect так, що кожен курсор рахує execute();
+це покриває і сирий psycopg2 (Practice58), і SQLAlchemy (exam).
+Статистика доступна на GET /__bench__/queries, DELETE скидає її.
+
+--query-log FILE додатково пише кожен SQL з підставленими параметрами
+(JSONL: endpoint, ms, sql) — вхід для exam/index_advisor.py.
+"""
+import argparse
+import contextvars
+import importlib
+import json
+import sys
+import threading
+import time
+
+from bench import TARGETS
+
+STATS_PATH = "/__bench__/queries"
+
+_current = contextvars.ContextVar("bench_query_cell", default=None)
+_lock = threading.Lock()
+_stats: dict[str, dict] = {}
+_cursor_classes: dict[type, type] = {}
+_query_log = None
+
+
+def _count():
+    cell = _current.get()
+    if cell is not None:
+        cell[0] += 1
+
+
+def _log_query(cursor, query, params, seconds):
+    cell = _current.get()
+    try:
+        sql = cursor.mogrify(query, params).decode()
+    except Exception:
+        return
+    line = json.dumps({"endpoint": cell[1] if cell else None, "ms": round(seconds * 1000, 3), "sql": sql},
+                      ensure_ascii=False)
+    with _lock:
+        _query_log.write(line + "\n")
+
+
+def _counting_cursor(base: type) -> type:
+    cls = _cursor_classes.get(base)
+    if cls is None:
+        class CountingCursor(base):
+            def execute(self, query, params=None):
+                _count()
+                if _query_log is None:
+                    return super().execute(query, params)
+                t0 = time.perf_counter()
+                try:
+                    return super().execute(query, params)
+                finally:
+                    _log_query(self, query, params, time.perf_counter() - t0)
+
+            def executemany(self, *args, **kwargs):
+                _count()
+                return super().executemany(*args, **kwargs)
+
+        cls = _cursor_classes[base] = CountingCursor
+    return cls
+
+
+def install_query_counter():
+    import psycopg2
+    import psycopg2.extensions
+
+    original = psycopg2.connect
+
+    def connect(*args, **kwargs):
+        base = kwargs.get("cursor_factory") or psycopg2.extensions.cursor
+        kwargs["cursor_factory"] = _counting_cursor(base)
+        return original(*args, **kwargs)
+
+    psycopg2.connect = connect
+
+
+class QueryCountingApp:
+    """ASGI-обгортка: прив'язує лічильник запитів до HTTP-запиту."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        if scope["path"] == STATS_PATH:
+            return await self.stats(scope, send)
+
+        cell = [0, scope["path"]]
+        token = _current.set(cell)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current.reset(token)
+            with _lock:
+                s = _stats.setdefault(scope["path"], {"requests": 0, "queries": 0})
+                s["requests"] += 1
+                s["queries"] += cell[0]
+
+    async def stats(self, scope, send):
+        with _lock:
+            if scope["method"] == "DELETE":
+                _stats.clear()
+            body = json.dumps(_stats).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def load_app(target: str):
+    project_dir, spec = TARGETS[target]
+    module_name, attr = spec.split(":")
+    sys.path.insert(0, str(project_dir))
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def main(argv=None):
+    import uvicorn
+
+    ap = argparse.ArgumentParser(description="API цілі з лічильником SQL-запитів")
+    ap.add_argument("--target", choices=sorted(TARGETS), required=True)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--query-log", help="JSONL з усіма SQL-запитами (для exam/index_advisor.py)")
+    args = ap.parse_args(argv)
+
+    global _query_log
+    if args.query_log:
+        _query_log = open(args.query_log, "a", encoding="utf-8", buffering=1)
+    install_query_counter()
+    app = QueryCountingApp(load_app(args.target))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
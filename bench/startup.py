@@ -0,0 +1,168 @@
+"""
+Час холодного старту API: імпорт застосунку і шлях до першої відповіді.
+
+    python -m bench.startup --target exam --repeat 5
+    python -m bench.startup --target practice58 --repeat 5 --out bench/results/startup.json
+
+importtime: `python -X importtime -c "import <модуль>"` у каталозі проєкту —
+загальний час імпорту, власний час модулів, зведений за пакетами, і найдорожчі модулі.
+cold start: свіжий процес uvicorn; ready — від запуску до першої 200 від
+легкого ендпоінта без БД, first — перший запит до БД (пул, з'єднання, кеші),
+warm — той самий запит удруге. Кожен режим — медіана --repeat запусків:
+"lazy" (типово) і "warmup" (DB_WARMUP=1: пул і кеші прогріваються до ready).
+
+DSN береться з --dsn або BENCH_DATABASE_URL.
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+from bench import ROOT, TARGETS
+from bench.report import git_commit, write_report
+from bench.seed import libpq_dsn
+
+RESULTS_DIR = ROOT / "bench" / "results"
+
+# ціль -> (легкий ендпоінт без БД, перший запит до БД)
+PROBES = {
+    "exam": ("/health", "/kpi"),
+    "practice58": ("/api/db_status", "/api/kpi"),
+}
+
+IMPORTTIME_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def importtime(target: str, env: dict, top: int = 10) -> dict:
+    """Розбір stderr `-X importtime` для імпорту ASGI-модуля цілі."""
+    project, spec = TARGETS[target]
+    module = spec.split(":")[0]
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=project, env=env, capture_output=True, text=True)
+    if out.returncode:
+        raise SystemExit(f"import {module} завершився з кодом {out.returncode}:\n{out.stderr[-2000:]}")
+
+    rows = []  # (власний мкс, кумулятивний мкс, модуль)
+    for line in out.stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if m:
+            rows.append((int(m.group(1)), int(m.group(2)), m.group(4)))
+
+    # власний час модулів, зведений за пакетом верхнього рівня: сума = весь імпорт
+    packages = {}
+    for self_us, _, name in rows:
+        pkg = name.split(".")[0]
+        packages[pkg] = packages.get(pkg, 0) + self_us
+    total_us = next((cum for _, cum, name in rows if name == module), 0)
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 1),
+        "modules": len(rows),
+        "top_packages_ms": {k: round(v / 1000, 1) for k, v in sorted(packages.items(), key=lambda kv: -kv[1])[:top]},
+        "top_self_ms": {name: round(s / 1000, 1) for s, _, name in sorted(rows, reverse=True)[:top]},
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url: str) -> int:
+    with urllib.request.urlopen(url, timeout=30) as r:
+        r.read()
+        return r.status
+
+
+def cold_start(target: str, env: dict, timeout: float = 60) -> dict:
+    """Один холодний старт uvicorn: ready / first / warm у мс."""
+    project, spec = TARGETS[target]
+    ready_path, first_path = PROBES[target]
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    t0 = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", spec, "--port", str(port), "--log-level", "warning"],
+                            cwd=project, env=env)
+    try:
+        deadline = t0 + timeout
+        while True:
+            if proc.poll() is not None:
+                raise SystemExit(f"Сервер {target} завершився з кодом {proc.returncode}")
+            if time.perf_counter() > deadline:
+                raise SystemExit(f"Сервер не відповів за {timeout:.0f} с")
+            try:
+                _get(base + ready_path)
+                break
+            except (urllib.error.URLError, OSError):
+                time.sleep(0.005)
+        ready = time.perf_counter()
+        _get(base + first_path)
+        first = time.perf_counter()
+        _get(base + first_path)
+        warm = time.perf_counter()
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return {
+        "ready_ms": (ready - t0) * 1000,
+        "first_ms": (first - ready) * 1000,
+        "warm_ms": (warm - first) * 1000,
+        "to_first_response_ms": (first - t0) * 1000,
+    }
+
+
+def medians(runs: list[dict]) -> dict:
+    return {k: round(statistics.median(r[k] for r in runs), 1) for k in runs[0]}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Час холодного старту exam / Practice58 API")
+    ap.add_argument("--target", choices=sorted(TARGETS), required=True)
+    ap.add_argument("--dsn", help="postgresql+psycopg2://... (типово BENCH_DATABASE_URL)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--modes", default="lazy,warmup", help="lazy і/або warmup через кому")
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--out", help="JSON-звіт (типово bench/results/startup-<target>-<commit>.json)")
+    args = ap.parse_args(argv)
+
+    dsn = args.dsn or os.getenv("BENCH_DATABASE_URL")
+    if not dsn:
+        raise SystemExit("Потрібен --dsn або BENCH_DATABASE_URL (окрема БД для бенчмарку).")
+    # Practice58 передає DATABASE_URL прямо в psycopg2 — потрібен libpq-формат
+    env = {**os.environ, "DATABASE_URL": dsn if args.target == "exam" else libpq_dsn(dsn)}
+    env.pop("DB_WARMUP", None)
+
+    imports = importtime(args.target, env, args.top)
+    print(f"import {imports['module']}: {imports['total_ms']} мс, модулів {imports['modules']}")
+    for name, ms in imports["top_packages_ms"].items():
+        print(f"  {name:28} {ms:8.1f} мс")
+
+    modes = {}
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        mode_env = {**env, "DB_WARMUP": "1"} if mode == "warmup" else env
+        modes[mode] = medians([cold_start(args.target, mode_env) for _ in range(args.repeat)])
+        m = modes[mode]
+        print(f"{mode:7} ready {m['ready_ms']:7.1f} мс  first {m['first_ms']:7.1f} мс  "
+              f"warm {m['warm_ms']:6.1f} мс  до першої відповіді {m['to_first_response_ms']:7.1f} мс")
+
+    commit = git_commit()
+    report = {
+        "meta": {"target": args.target, "commit": commit, "repeat": args.repeat, "python": sys.version.split()[0]},
+        "importtime": imports,
+        "cold_start": modes,
+    }
+    out = Path(args.out) if args.out else RESULTS_DIR / f"startup-{args.target}-{commit or 'local'}.json"
+    write_report(report, out)
+    print(f"Звіт: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Сценарії оновлення дашбордів.
+
+Кожне оновлення — список етапів; запити одного етапу йдуть паралельно,
+етапи — послідовно. Так відтворюється реальний fan-out фронтенду:
+
+- practice58: refreshAll() у Practice58/web/app.js — Promise.all з 5 запитів,
+  потім стрічка документів (refreshFeedOnly);
+- exam: loadAll() у exam/web/app.js — усі запити по черзі.
+
+Параметри фільтрів обираються з rng, тож при тому самому seed
+послідовність запитів однакова між прогонами і комітами.
+"""
+import random
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+
+def _url(path: str, params: dict) -> str:
+    params = {k: v for k, v in params.items() if v is not None and v != ""}
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+# ---------------- exam ----------------
+EXAM_DIRECTIONS = ["Північ", "Південь", "Схід", "Захід", "Центр"]
+
+
+def exam_common_params(rng: random.Random, now: datetime) -> dict:
+    # більшість оновлень — без фільтрів, як у дашборда на стіні
+    f = {}
+    r = rng.random()
+    if r < 0.25:
+        f["start"] = (now - timedelta(days=rng.choice([7, 30, 90]))).isoformat()
+        f["end"] = now.isoformat()
+    elif r < 0.40:
+        f["direction"] = rng.choice(EXAM_DIRECTIONS)
+    elif r < 0.50:
+        f["confirmed"] = rng.choice(["true", "false"])
+    elif r < 0.55:
+        f["min_value"] = rng.choice([5, 10, 20])
+    return f
+
+
+def exam_refresh(rng: random.Random, now: datetime, approx: bool = False) -> list[list[str]]:
+    common = exam_common_params(rng, now)
+    # approx=true — агрегати з вибірки (exam/approx.py); таблиця й мапа лишаються точними
+    agg = {**common, "approx": "true"} if approx else common
+
+    # вікно KPI: поточний період і попередній такої ж довжини (computePeriodWindow)
+    end = datetime.fromisoformat(common["end"]) if "end" in common else now
+    start = datetime.fromisoformat(common["start"]) if "start" in common else end - timedelta(days=7)
+    prev_start = start - (end - start)
+    curr = {**agg, "start": start.isoformat(), "end": end.isoformat()}
+    prev = {**agg, "start": prev_start.isoformat(), "end": start.isoformat()}
+
+    return [
+        [_url("/kpi", curr)],
+        [_url("/kpi", prev)],
+        [_url("/trend", {**agg, "bucket": rng.choice(["day", "day", "week"])})],
+        [_url("/distribution/direction", agg)],
+        [_url("/distribution/unit", agg)],
+        [_url("/heatmap", {**common, "metric": "amount_sum"})],
+        [_url("/allocations", {**common, "limit": 15, "offset": 0})],
+        [_url("/map_points", {**common, "limit": 350})],
+    ]
+
+
+# ---------------- practice58 ----------------
+P58_STATUSES = ["отримано", "в_роботі", "доведено", "прострочено"]
+
+
+def practice58_params(rng: random.Random, now: datetime) -> dict:
+    p = {}
+    r = rng.random()
+    if r < 0.20:
+        p["date_from"] = (now - timedelta(days=rng.choice([1, 3, 7]))).strftime("%Y-%m-%dT%H:%M")
+    elif r < 0.35:
+        p["unit_id"] = rng.randint(1, 7)
+    elif r < 0.45:
+        p["doc_type_id"] = rng.randint(1, 5)
+    elif r < 0.50:
+        p["status"] = rng.choice(P58_STATUSES)
+    elif r < 0.55:
+        p["priority"] = rng.randint(1, 3)
+    return p
+
+
+def practice58_refresh(rng: random.Random, now: datetime) -> list[list[str]]:
+    p = practice58_params(rng, now)
+    # worked_docs / docs_by_unit не приймають усіх фільтрів — передаємо як фронтенд
+    return [
+        [
+            _url("/api/kpi", p),
+            _url("/api/week_dynamics", p),
+            _url("/api/worked_docs", p),
+            _url("/api/docs_by_unit", p),
+            "/api/control_board",
+        ],
+        [_url("/api/documents", {**p, "limit": rng.choice([50, 100, 100, 200])})],
+    ]
+
+
+MIXES = {
+    "exam": exam_refresh,
+    "practice58": practice58_refresh,
+}
@@ -0,0 +1,273 @@
+# countries.py
+"""
+Індекс країн для з'єднання наборів за країною: назва / код -> ISO3
+(countries.csv: ISO3, назва, код GlobalFirePower, синоніми).
+
+    from countries import index, join
+
+    idx = index()                                         # з .cache/, перебудовується при зміні countries.csv
+    idx.iso3_of(["DR Congo", "Democratic Republic of the Congo", "Côte d'Ivoire"])
+    merged = join("world_army", "gfp")                    # набори з registry.py, ключі — з KEYS
+    merged = join((df, "Country", "name"), "gfp", how="left")
+
+    python countries.py join world_army gfp -o merged.csv
+    python countries.py unresolved world_army
+    python countries.py bench --rows 2000000
+
+- стовпець ISO3 у GlobalFirePower — власні коди GFP, не ISO 3166
+  (SLV там Словенія, а в ISO — Сальвадор), тому ключі мають простір:
+  "name" (назви й синоніми), "iso3", "gfp";
+- назва нормалізується (регістр, діакритика, "&" -> "and", пунктуація,
+  "the" на початку) — "Côte d'Ivoire" і "cote divoire" дають один ключ;
+- кожне унікальне значення шукається в словнику один раз (pd.factorize),
+  далі — цілі коди країн; з'єднання — масив позицій розміру кількості
+  країн: O(n) без повторного зіставлення рядків і без хеш-з'єднання pandas.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import registry
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TABLE = os.path.join(HERE, "countries.csv")
+KINDS = ("name", "iso3", "gfp")
+
+# ключ країни в наборах реєстру: (стовпець, простір)
+KEYS = {
+    "world_army": ("country", "name"),
+    "gfp": ("ISO3", "gfp"),
+}
+
+
+def normalize(name):
+    s = unicodedata.normalize("NFKD", str(name)).encode("ascii", "ignore").decode()
+    s = s.casefold().replace("&", " and ")
+    s = "".join(ch if ch.isalnum() else " " for ch in s if ch not in "'’")
+    s = " ".join(s.split())
+    return s[4:] if s.startswith("the ") else s
+
+
+@dataclass
+class CountryIndex:
+    iso3: np.ndarray          # код країни -> ISO3
+    names: np.ndarray         # код країни -> назва
+    lookup: dict              # простір -> {ключ: код країни}
+
+    @property
+    def dtype(self):
+        """Спільний CategoricalDtype: однакові коди в усіх наборах."""
+        return pd.CategoricalDtype(self.iso3)
+
+    def codes(self, values, kind="name"):
+        """Значення -> int32 коди країн (-1 — не знайдено); словник — лише для унікальних."""
+        if kind not in KINDS:
+            raise ValueError(f"Невідомий простір ключів {kind!r}: {', '.join(KINDS)}")
+        table = self.lookup[kind]
+        uniques_codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+        key = normalize if kind == "name" else (lambda v: str(v).strip().upper())
+        mapped = np.array([table.get(key(v), -1) for v in uniques] + [-1], dtype=np.int32)
+        return mapped[uniques_codes]  # -1 (NaN) -> останній елемент, теж -1
+
+    def iso3_of(self, values, kind="name"):
+        codes = self.codes(values, kind)
+        return pd.Categorical.from_codes(codes, dtype=self.dtype)
+
+    def to_json(self):
+        return {"iso3": self.iso3.tolist(), "names": self.names.tolist(), "lookup": self.lookup}
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(np.array(data["iso3"], dtype=object), np.array(data["names"], dtype=object), data["lookup"])
+
+
+def build(path=TABLE):
+    table = pd.read_csv(path, keep_default_na=False, dtype=str)
+    lookup = {kind: {} for kind in KINDS}
+
+    def add(kind, key, code):
+        if not key:
+            return
+        if lookup[kind].get(key, code) != code:
+            raise ValueError(f"{path}: {kind} {key!r} належить двом країнам "
+                             f"({table.iso3[lookup[kind][key]]}, {table.iso3[code]})")
+        lookup[kind][key] = code
+
+    for code, row in enumerate(table.itertuples(index=False)):
+        add("iso3", row.iso3.upper(), code)
+        add("gfp", row.gfp.upper(), code)
+        for name in [row.name, *row.aliases.split("|")]:
+            add("name", normalize(name) if name else "", code)
+    return CountryIndex(table["iso3"].to_numpy(object), table["name"].to_numpy(object), lookup)
+
+
+def _cache_path():
+    return os.path.join(registry.CACHE_DIR, "country_index.json")
+
+
+_INDEX = None
+
+
+def index(path=TABLE):
+    """Індекс з кешу (.cache/country_index.json); перебудовується, якщо змінився countries.csv."""
+    global _INDEX
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    if _INDEX is not None and _INDEX[0] == digest:
+        return _INDEX[1]
+    cache = _cache_path()
+    idx = None
+    if os.path.exists(cache):
+        with open(cache, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("source") == digest:
+            idx = CountryIndex.from_json(data)
+    if idx is None:
+        idx = build(path)
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        tmp = cache + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"source": digest, **idx.to_json()}, f, ensure_ascii=False)
+        os.replace(tmp, cache)
+    _INDEX = (digest, idx)
+    return idx
+
+
+# ---------------- з'єднання ----------------
+def _side(spec):
+    """Назва набору з реєстру або (DataFrame, стовпець, простір) -> (DataFrame, стовпець, простір)."""
+    if isinstance(spec, str):
+        if spec not in KEYS:
+            raise KeyError(f"Для набору {spec!r} не задано ключ країни (KEYS)")
+        return (registry.load(spec), *KEYS[spec])
+    return spec
+
+
+def with_key(df, column, kind="name", name="iso3"):
+    """Копія df зі стовпцем ISO3 (category зі спільними категоріями індексу)."""
+    out = df.copy()
+    out[name] = index().iso3_of(df[column], kind)
+    return out
+
+
+def unresolved(df, column, kind="name"):
+    """Значення стовпця, яких немає в індексі (кандидати в синоніми countries.csv)."""
+    codes = index().codes(df[column], kind)
+    return sorted(set(df[column][(codes < 0) & df[column].notna()].astype(str)))
+
+
+def _take(df, positions):
+    """Рядки df за позиціями; -1 -> NaN (цілі стовпці стають float / nullable)."""
+    missing = positions < 0
+    out = df.iloc[np.where(missing, 0, positions)].reset_index(drop=True)
+    if missing.any():
+        out = out.astype({c: "float64" for c in out.columns if out[c].dtype.kind in "iub"})
+        out.loc[missing, :] = np.nan
+    return out
+
+
+def join(left, right, how="inner", suffixes=("_x", "_y")):
+    """З'єднання двох наборів за країною: O(n) через коди країн.
+
+    Праворуч країна має бути унікальною (один рядок на країну, як у
+    World_Army і GlobalFirePower); ліворуч — будь-яка кількість рядків.
+    how: inner | left | outer. Результат має стовпець iso3 (category).
+    """
+    if how not in ("inner", "left", "outer"):
+        raise ValueError(f"how={how!r}: підтримуються inner, left, outer")
+    idx = index()
+    ldf, lcol, lkind = _side(left)
+    rdf, rcol, rkind = _side(right)
+    lc, rc = idx.codes(ldf[lcol], lkind), idx.codes(rdf[rcol], rkind)
+
+    known = rc[rc >= 0]
+    if len(known) and np.bincount(known, minlength=len(idx.iso3)).max() > 1:
+        raise ValueError("Праворуч кілька рядків на країну — агрегуйте набір перед join")
+    pos = np.full(len(idx.iso3), -1, dtype=np.int64)
+    pos[known] = np.flatnonzero(rc >= 0)
+    right_pos = np.where(lc >= 0, pos[np.maximum(lc, 0)], -1)
+
+    left_pos = np.arange(len(ldf))
+    if how == "inner":
+        keep = right_pos >= 0
+        left_pos, right_pos = left_pos[keep], right_pos[keep]
+    codes = np.where(left_pos >= 0, lc[left_pos], -1)
+    if how == "outer":
+        matched = np.zeros(len(rdf), dtype=bool)
+        matched[right_pos[right_pos >= 0]] = True
+        extra = np.flatnonzero(~matched)
+        left_pos = np.concatenate([left_pos, np.full(len(extra), -1)])
+        right_pos = np.concatenate([right_pos, extra])
+        codes = np.concatenate([codes, rc[extra]])
+
+    overlap = (set(ldf.columns) & set(rdf.columns)) - {"iso3"}
+    lpart = _take(ldf.drop(columns="iso3", errors="ignore"), left_pos)
+    rpart = _take(rdf.drop(columns="iso3", errors="ignore"), right_pos)
+    lpart.columns = [c + suffixes[0] if c in overlap else c for c in lpart.columns]
+    rpart.columns = [c + suffixes[1] if c in overlap else c for c in rpart.columns]
+    iso3 = pd.Series(pd.Categorical.from_codes(codes, dtype=idx.dtype), name="iso3")
+    return pd.concat([iso3, lpart, rpart], axis=1)
+
+
+# ---------------- вимір ----------------
+def _string_merge(left, right):
+    """Як у ноутбуках: нормалізація рядків і merge за ними на кожному виклику."""
+    names = pd.Series({normalize(n): iso for iso, n in zip(index().iso3, index().names)})
+    lkey = left["country"].map(normalize).map(names)
+    table = pd.read_csv(TABLE, keep_default_na=False)
+    gfp = table[table["gfp"] != ""].set_index("gfp")["iso3"]
+    rkey = right["ISO3"].map(gfp)
+    return left.assign(key=lkey).merge(right.assign(key=rkey), on="key", how="inner")
+
+
+def bench(rows=1_000_000, seed=0):
+    army, gfp = registry.load("world_army"), registry.load("gfp")
+    big = army.sample(rows, replace=True, random_state=seed).reset_index(drop=True)
+    timings = {}
+    for label, fn in [("рядки: normalize + merge", lambda: _string_merge(big, gfp)),
+                      ("індекс: коди країн", lambda: join((big, "country", "name"), "gfp"))]:
+        t0 = time.perf_counter()
+        out = fn()
+        timings[label] = (time.perf_counter() - t0, len(out))
+    return timings
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Індекс країн і з'єднання наборів за країною")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("join", help="з'єднати два набори з реєстру")
+    p.add_argument("left", choices=list(KEYS))
+    p.add_argument("right", choices=list(KEYS))
+    p.add_argument("--how", choices=["inner", "left", "outer"], default="inner")
+    p.add_argument("-o", "--output")
+    p = sub.add_parser("unresolved", help="значення ключа, яких немає в countries.csv")
+    p.add_argument("name", choices=list(KEYS))
+    p = sub.add_parser("bench", help="з'єднання через індекс проти merge за рядками")
+    p.add_argument("--rows", type=int, default=1_000_000)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "join":
+        merged = join(args.left, args.right, args.how)
+        print(f"{len(merged)} рядків, {merged['iso3'].isna().sum()} без ISO3")
+        if args.output:
+            merged.to_csv(args.output, index=False)
+        else:
+            print(merged.head(10).to_string(index=False))
+    elif args.cmd == "unresolved":
+        df, column, kind = _side(args.name)
+        missing = unresolved(df, column, kind)
+        print("\n".join(missing) if missing else "усі значення знайдено")
+    else:
+        for label, (seconds, n) in bench(args.rows).items():
+            print(f"  {label}: {seconds:.3f} с, {n} рядків")
+
+
+if __name__ == "__main__":
+    main()
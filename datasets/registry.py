@@ -0,0 +1,302 @@
+# registry.py
+"""
+Реєстр наборів даних практичних: схема (типи, категорії, нормалізація
+заголовків) + одноразова конвертація CSV у Parquet і швидке читання з нього.
+
+    import sys; sys.path.insert(0, "../datasets")      # з каталогу практичної
+    from registry import load, batches
+
+    army = load("world_army")                   # перший виклик — CSV -> .cache/world_army.parquet
+    gfp = load("gfp", columns=["Country", "ISO3", "Defense Budget"])
+    for chunk in batches("gfp", batch_size=100_000):   # без завантаження всього файлу
+        ...
+
+    python registry.py convert                  # усі набори
+    python registry.py info
+    python registry.py bench --rows 5000000     # CSV проти Parquet на синтетичному великому файлі
+
+- заголовок читається окремо: BOM ("\\ufeffS no:") і пробіли по краях
+  прибираються, далі — перейменування зі схеми;
+- CSV конвертується потоково (pyarrow.csv, блоками по 64 МБ) у Parquet
+  по row group на блок — пам'ять не залежить від розміру файлу, тож так
+  само конвертуються багатогігабайтні набори Kaggle (register());
+- категоріальні стовпці пишуться як dictionary і читаються як category;
+  типи зі схеми фіксуються при конвертації, решта виводяться pyarrow;
+- кеш перебудовується, якщо змінився CSV (розмір, mtime) або схема —
+  підпис зберігається в метаданих Parquet;
+- читання — memory_map + лише потрібні стовпці (columns=) і рядки (filters=).
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+CACHE_DIR = os.environ.get("DATASETS_CACHE", os.path.join(HERE, ".cache"))
+BLOCK_SIZE = 64 << 20
+
+ARROW_TYPES = {
+    "int8": pa.int8(), "int16": pa.int16(), "int32": pa.int32(), "int64": pa.int64(),
+    "float32": pa.float32(), "float64": pa.float64(), "string": pa.string(), "bool": pa.bool_(),
+    "category": pa.dictionary(pa.int32(), pa.string()),
+}
+
+
+@dataclass
+class Schema:
+    name: str
+    path: str                                         # відносно кореня репозиторію або абсолютний
+    dtypes: dict = field(default_factory=dict)        # стовпець -> ключ ARROW_TYPES
+    rename: dict = field(default_factory=dict)        # після зняття BOM / пробілів
+    na_values: dict = field(default_factory=dict)     # стовпець -> значення, що означають пропуск
+    description: str = ""
+
+    @property
+    def csv_path(self):
+        return self.path if os.path.isabs(self.path) else os.path.join(ROOT, self.path)
+
+    @property
+    def parquet_path(self):
+        return os.path.join(CACHE_DIR, f"{self.name}.parquet")
+
+
+_MILITARY = {c: "int32" for c in ("activeDuty", "paramilitary", "reserves", "total")}
+_CASE_FLAGS = {c: "float32" for c in ("MID", "IMI", "MIPS", "CRS", "ACD")}
+
+DATASETS = {s.name: s for s in [
+    Schema("world_army", "3.3/World_Army_Dataset.csv",
+           dtypes={"S no:": "int16", "country": "string", **_MILITARY, "pop2022": "float64"},
+           description="Чисельність армій країн, 2022 (3.3)"),
+    Schema("gfp", "3.5/GlobalFirePower.csv",
+           dtypes={"Country": "string", "ISO3": "string", "Rank": "int16",
+                   "Coastline (km)": "float64", "Waterways (km)": "float64"},
+           # як у simple 3.5: нечислові позначки -> NaN
+           na_values={"Coastline (km)": ["Landlocked"], "Waterways (km)": ["Minimum not met."]},
+           description="Global Firepower: ~45 показників країн (3.5)"),
+    Schema("boston", "4.3/boston.csv", description="Boston Housing (4.3)"),
+    Schema("case_universe", "4.5/case_universe.csv",
+           dtypes={"Target State": "category", "Target COW ID": "category", "Start Year": "int16",
+                   "End Year": "float32", "Uncertain": "int8", **_CASE_FLAGS},
+           description="Випадки застосування сили, ціль Uncertain (4.5)"),
+]}
+
+
+def register(schema):
+    """Додати набір (наприклад, великий CSV з Kaggle) до реєстру."""
+    DATASETS[schema.name] = schema
+    return schema
+
+
+def get(name):
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise KeyError(f"Невідомий набір {name!r}; є: {', '.join(DATASETS)}") from None
+
+
+def normalize_columns(names):
+    return [n.lstrip("\ufeff").strip() for n in names]
+
+
+def read_header(path):
+    """Назви стовпців з першого рядка CSV (utf-8-sig знімає BOM, csv — лапки й коми в назвах)."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f))
+
+
+def signature(schema):
+    st = os.stat(schema.csv_path)
+    spec = json.dumps({k: v for k, v in asdict(schema).items() if k != "description"}, sort_keys=True)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "schema": hashlib.sha1(spec.encode()).hexdigest()}
+
+
+def _cached_signature(path):
+    meta = pq.read_schema(path).metadata or {}
+    raw = meta.get(b"registry")
+    return json.loads(raw) if raw else None
+
+
+def _with_nulls(batch, na_values, dtypes):
+    """Позначки на зразок "Landlocked" -> null, потім приведення до типу зі схеми."""
+    arrays = []
+    for name, arr in zip(batch.schema.names, batch.columns):
+        if name in na_values:
+            arr = pc.if_else(pc.is_in(arr, pa.array(na_values[name], pa.string())),
+                             pa.scalar(None, pa.string()), arr)
+            arr = pc.cast(arr, ARROW_TYPES[dtypes.get(name, "float64")])
+        arrays.append(arr)
+    return pa.RecordBatch.from_arrays(arrays, names=batch.schema.names)
+
+
+def convert(name, force=False):
+    """CSV -> Parquet (якщо кеш застарів або force); повертає шлях до .parquet."""
+    schema = get(name)
+    out = schema.parquet_path
+    sig = signature(schema)
+    if not force and os.path.exists(out) and _cached_signature(out) == sig:
+        return out
+
+    columns = [schema.rename.get(c, c) for c in normalize_columns(read_header(schema.csv_path))]
+    if len(set(columns)) != len(columns):
+        raise ValueError(f"{schema.csv_path}: повторювані назви стовпців після нормалізації")
+    column_types = {c: ARROW_TYPES[t] for c, t in schema.dtypes.items() if c not in schema.na_values}
+    column_types.update({c: pa.string() for c in schema.na_values})
+    unknown = set(schema.dtypes) - set(columns)
+    if unknown:
+        raise ValueError(f"{name}: у CSV немає стовпців {sorted(unknown)}")
+
+    reader = pacsv.open_csv(
+        schema.csv_path,
+        read_options=pacsv.ReadOptions(column_names=columns, skip_rows=1, block_size=BLOCK_SIZE),
+        convert_options=pacsv.ConvertOptions(column_types=column_types, strings_can_be_null=True))
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".parquet.tmp")
+    os.close(fd)
+    writer = None
+    try:
+        for batch in reader:
+            if schema.na_values:
+                batch = _with_nulls(batch, schema.na_values, schema.dtypes)
+            if writer is None:
+                arrow_schema = batch.schema.with_metadata({"registry": json.dumps(sig)})
+                writer = pq.ParquetWriter(tmp, arrow_schema)
+            writer.write_batch(batch)
+        if writer is None:  # CSV лише із заголовком
+            raise ValueError(f"{schema.csv_path}: немає рядків даних")
+        writer.close()
+        writer = None
+        os.replace(tmp, out)  # атомарно: паралельний load() не побачить напівзаписаний файл
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return out
+
+
+def table(name, columns=None, filters=None):
+    """pyarrow.Table з кешу (memory_map, лише потрібні стовпці / рядки)."""
+    return pq.read_table(convert(name), columns=columns, filters=filters, memory_map=True)
+
+
+def load(name, columns=None, filters=None):
+    """DataFrame: dictionary -> category, решта — як у схемі."""
+    # self_destruct: буфери Arrow звільняються по мірі перетворення — пік пам'яті ~1× замість 2×
+    return table(name, columns, filters).to_pandas(self_destruct=True, split_blocks=True)
+
+
+def batches(name, columns=None, batch_size=65_536):
+    """Ітератор DataFrame-ів по batch_size рядків — для наборів, що не влазять у пам'ять."""
+    with pq.ParquetFile(convert(name), memory_map=True) as f:
+        for batch in f.iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+
+
+def info():
+    rows = []
+    for s in DATASETS.values():
+        cached = os.path.exists(s.parquet_path)
+        meta = pq.ParquetFile(s.parquet_path).metadata if cached else None
+        rows.append({"name": s.name, "csv": s.path, "csv_mb": round(os.path.getsize(s.csv_path) / 2**20, 2),
+                     "parquet_mb": round(os.path.getsize(s.parquet_path) / 2**20, 2) if cached else None,
+                     "rows": meta.num_rows if meta else None,
+                     "fresh": cached and _cached_signature(s.parquet_path) == signature(s),
+                     "description": s.description})
+    return pd.DataFrame(rows)
+
+
+# ---------------- вимір: CSV проти Parquet ----------------
+def _timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def synthetic_csv(base, rows, directory):
+    """CSV з rows рядків: рядки base повторюються (заголовок — як в оригіналі, з BOM)."""
+    src = get(base).csv_path
+    with open(src, "rb") as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith(b"\n"):
+        body += b"\n"
+    per = body.count(b"\n")
+    path = os.path.join(directory, f"{base}_{rows}.csv")
+    with open(path, "wb") as f:
+        f.write(header)
+        for _ in range(rows // per):
+            f.write(body)
+        f.write(b"".join(body.splitlines(keepends=True)[:rows % per]))
+    return path
+
+
+def bench(base="gfp", rows=1_000_000, columns=None):
+    schema = get(base)
+    with tempfile.TemporaryDirectory() as d:
+        path = synthetic_csv(base, rows, d)
+        big = register(Schema(f"{base}_x{rows}", path, dict(schema.dtypes), dict(schema.rename),
+                              dict(schema.na_values)))
+        global CACHE_DIR
+        cache, CACHE_DIR = CACHE_DIR, d
+        try:
+            csv_s, df = _timed(lambda: pd.read_csv(path), repeat=1)
+            t0 = time.perf_counter()
+            convert(big.name, force=True)
+            convert_s = time.perf_counter() - t0
+            load_s, loaded = _timed(lambda: load(big.name))
+            cols = columns or list(loaded.columns[:3])
+            cols_s, _ = _timed(lambda: load(big.name, columns=cols))
+            result = {"rows": len(loaded), "csv_mb": round(os.path.getsize(path) / 2**20, 1),
+                      "parquet_mb": round(os.path.getsize(big.parquet_path) / 2**20, 1),
+                      "read_csv_s": round(csv_s, 3), "convert_s": round(convert_s, 3),
+                      "load_s": round(load_s, 3), f"load_{len(cols)}_columns_s": round(cols_s, 3),
+                      "csv_memory_mb": round(df.memory_usage(deep=True).sum() / 2**20, 1),
+                      "memory_mb": round(loaded.memory_usage(deep=True).sum() / 2**20, 1)}
+        finally:
+            CACHE_DIR = cache
+            DATASETS.pop(big.name, None)
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Реєстр наборів даних: CSV -> Parquet і швидке читання")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("convert", help="сконвертувати (типово — усі набори)")
+    p.add_argument("names", nargs="*")
+    p.add_argument("--force", action="store_true")
+    sub.add_parser("info", help="набори, розміри, свіжість кешу")
+    p = sub.add_parser("bench", help="pd.read_csv проти load() на синтетичному великому CSV")
+    p.add_argument("--base", default="gfp", choices=list(DATASETS))
+    p.add_argument("--rows", type=int, default=1_000_000)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "convert":
+        for name in args.names or list(DATASETS):
+            t0 = time.perf_counter()
+            path = convert(name, args.force)
+            print(f"{name}: {time.perf_counter() - t0:.2f} с -> {os.path.relpath(path)}")
+    elif args.cmd == "info":
+        with pd.option_context("display.width", 200):
+            print(info().to_string(index=False))
+    else:
+        for k, v in bench(args.base, args.rows).items():
+            print(f"  {k}: {v}")
+
+
+if __name__ == "__main__":
+    main()
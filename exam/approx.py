@@ -0,0 +1,160 @@
+"""
+Наближені агрегати для approx=true (/kpi, /trend, /distribution/*).
+
+Джерело рядків:
+- "sample" — таблиця resource_allocations_sample (sql/sample.sql):
+  вибірка Бернуллі з часткою rate, яку тригери тримають актуальною;
+- "system" — TABLESAMPLE SYSTEM (APPROX_SYSTEM_PCT, типово 1%) по самій
+  таблиці, якщо вибірки немає. Береться кожна N-та сторінка, а не рядок:
+  межі похибки нижче коректні, лише коли рядки з однаковими фільтрами не
+  скупчені на сторінках (для даних, що вставлялися за часом, фільтр за
+  датою їх занижує).
+
+Оцінки Горвіца-Томпсона: кількість n/p і сума Σx/p; середнє — Σx/n по
+вибірці. Похибка — півширина 95% довірчого інтервалу (±).
+
+    python approx.py rebuild --rate 0.02      # перебудувати вибірку (DATABASE_URL)
+    python approx.py check --api http://127.0.0.1:8000
+"""
+import argparse
+import json
+import math
+import os
+import time
+import urllib.request
+from pathlib import Path
+from urllib.parse import urlencode
+
+Z = 1.96  # 95%
+
+HERE = Path(__file__).resolve().parent
+SAMPLE_SQL = HERE / "sql" / "sample.sql"
+
+SAMPLE_INFO_SQL = """
+SELECT sample, rate FROM public.approx_samples
+WHERE source = 'resource_allocations' AND to_regclass('public.' || sample) IS NOT NULL
+"""
+
+
+def settings() -> dict:
+    return {
+        "system_pct": float(os.getenv("APPROX_SYSTEM_PCT", "1")),
+        # менше рядків вибірки під фільтром — відповідь рахується точно
+        "min_rows": int(os.getenv("APPROX_MIN_ROWS", "100")),
+        "info_ttl_s": float(os.getenv("APPROX_INFO_TTL_S", "60")),
+    }
+
+
+# ---------------- оцінки ----------------
+def scale_count(n, p):
+    """Кількість у всій таблиці за n рядками вибірки -> (оцінка, ±)."""
+    return n / p, Z * math.sqrt(n * (1 - p)) / p
+
+
+def scale_sum(s, s2, p):
+    """Сума за сумою s і сумою квадратів s2 у вибірці -> (оцінка, ±)."""
+    return s / p, Z * math.sqrt(max(s2, 0.0) * (1 - p)) / p
+
+
+def sample_mean(s, s2, n, p):
+    """Середнє за вибіркою -> (оцінка, ±); n < 2 — похибка невідома (None)."""
+    if n == 0:
+        return 0.0, None
+    mean = s / n
+    if n < 2:
+        return mean, None
+    var = max(s2 - n * mean * mean, 0.0) / (n - 1)
+    return mean, Z * math.sqrt(var * (1 - p) / n)
+
+
+def header(method, p, rows) -> str:
+    """Значення заголовка X-Approx: джерело, частка, рядків вибірки під фільтром."""
+    return f"{method}; rate={p:g}; rows={rows}"
+
+
+# ---------------- обслуговування ----------------
+def rebuild(rate=None):
+    """Перестворити вибірку і тригери (sql/sample.sql), за потреби з новою часткою."""
+    from schema import connect
+
+    conn = connect()
+    try:
+        with conn, conn.cursor() as cur:
+            if rate is not None:
+                cur.execute("SELECT set_config('approx.rate', %s, true)", (str(rate),))
+            cur.execute(SAMPLE_SQL.read_text(encoding="utf-8"))
+            rows, rate = cur.fetchone()
+    finally:
+        conn.close()
+    return rows, rate
+
+
+# ---------------- перевірка ----------------
+CHECKS = [
+    ("/kpi", {}),
+    ("/kpi", {"direction": "Схід"}),
+    ("/kpi", {"confirmed": "true", "min_value": 10}),
+    ("/trend", {"bucket": "week"}),
+    ("/distribution/direction", {}),
+    ("/distribution/unit", {"confirmed": "false"}),
+]
+
+
+def _get(url):
+    t0 = time.perf_counter()
+    with urllib.request.urlopen(url, timeout=30) as r:
+        body = json.loads(r.read())
+        return body, r.headers.get("X-Approx"), (time.perf_counter() - t0) * 1000
+
+
+def _pairs(path, exact, approx):
+    """(назва, точне, оцінка, ±) для порівнюваних значень відповіді."""
+    if path == "/kpi":
+        for key in ("events_count", "amount_sum", "duration_avg"):
+            yield key, exact[key], approx[key], approx.get(key + "_err")
+        return
+    key = "bucket_start" if path == "/trend" else "category"
+    approx_by = {p[key]: p for p in approx}
+    for point in exact:
+        other = approx_by.get(point[key], {"events_count": 0, "amount_sum": 0})
+        for metric in ("events_count", "amount_sum"):
+            yield f"{point[key]}.{metric}", point[metric], other[metric], other.get(metric + "_err")
+
+
+def check(api):
+    """Точні й наближені відповіді API: час і чи потрапило точне значення в межі."""
+    inside = total = 0
+    for path, params in CHECKS:
+        query = "?" + urlencode(params) if params else ""
+        exact, _, exact_ms = _get(f"{api}{path}{query}")
+        approx, how, approx_ms = _get(f"{api}{path}?{urlencode({**params, 'approx': 'true'})}")
+        worst = 0.0
+        for _, truth, estimate, err in _pairs(path, exact, approx):
+            total += 1
+            if err is None or abs(truth - estimate) <= err:
+                inside += 1
+            if truth:
+                worst = max(worst, abs(estimate - truth) / abs(truth))
+        print(f"{path}{query}: точно {exact_ms:.1f} мс, approx {approx_ms:.1f} мс "
+              f"[{how or 'точно'}], найбільша відн. похибка {worst:.1%}")
+    print(f"Точне значення в межах ±: {inside}/{total}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Вибірка для наближених запитів exam API")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("rebuild", help="перестворити resource_allocations_sample")
+    p.add_argument("--rate", type=float, help="частка рядків у вибірці (типово — поточна або 0.01)")
+    p = sub.add_parser("check", help="порівняти approx=true з точними відповідями")
+    p.add_argument("--api", default="http://127.0.0.1:8000")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "rebuild":
+        rows, rate = rebuild(args.rate)
+        print(f"Вибірка: {rows} рядків, rate={rate:g}")
+    else:
+        check(args.api.rstrip("/"))
+
+
+if __name__ == "__main__":
+    main()
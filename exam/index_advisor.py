@@ -0,0 +1,388 @@
+"""
+Порадник індексів: прогін журналу SQL-запитів через EXPLAIN (ANALYZE, BUFFERS).
+
+    python -m bench run --target exam --query-log /tmp/queries.jsonl   # з кореня репозиторію
+    python index_advisor.py /tmp/queries.jsonl
+    python index_advisor.py postgresql.log --top 5       # log_min_duration_statement = 0
+    python index_advisor.py /tmp/queries.jsonl --json /tmp/advice.json
+
+1. Запити до resource_allocations групуються за формою фільтра: стовпці
+   з рівністю, з діапазоном, GROUP BY, ORDER BY, LIMIT — без значень
+   параметрів. Кількість запитів форми в журналі = наскільки вона "гаряча".
+2. До --samples різних запитів кожної форми проганяються через
+   EXPLAIN (ANALYZE, BUFFERS) у READ ONLY транзакції з відкатом: фактичний
+   час, сторінки (hit/read), чим читається таблиця.
+3. Якщо таблицю читає Seq Scan, сканування відкидає більшість прочитаних
+   рядків або агрегат по індексу ходить у сторінки таблиці, пропонується
+   індекс: рівності (спершу найселективніші за pg_stats), далі діапазон
+   або сортування; без LIMIT — INCLUDE решти потрібних стовпців для
+   index-only scan. Пропозиції з тим самим ключем зливаються; ті, що вже
+   покриває наявний індекс, не дублюються — звіт пояснює, чому його не
+   взято. Фільтр, під який потрапляє понад 30% рядків, індексом не лікується.
+
+Журнал — JSONL з bench.server (--query-log) або лог PostgreSQL; в обох
+параметри мають бути підставлені в текст (psycopg2 так і надсилає).
+"""
+import argparse
+import json
+import re
+from dataclasses import dataclass, field
+
+from schema import TABLE, connect, indexes
+
+COL = r"(?<![\w.])(?:public\.)?resource_allocations\.(\w+)"
+PREDICATE = re.compile(COL + r"\s*(=|>=|<=|<>|!=|<|>|\bIN\b|\bIS\b)", re.I)
+FROM_TABLE = re.compile(r"\bFROM\s+(?:public\.)?resource_allocations\b(?!_)", re.I)
+CLAUSE = re.compile(r"\b(WHERE|GROUP BY|ORDER BY|LIMIT|OFFSET)\b", re.I)
+PG_LOG = re.compile(r"(?:duration: ([\d.]+) ms\s+)?(?:statement|execute [^:]*):\s(.*)$")
+RANGE_FIRST = ("occurred_at",)  # діапазон, під який усе сортується
+MAX_SHARE = 0.3                 # під фільтр більше частки рядків — повне сканування дешевше
+
+
+@dataclass(frozen=True)
+class Shape:
+    eq: tuple            # стовпці з рівністю / IN / IS
+    ranges: tuple        # стовпці з >, >=, <, <=
+    group: tuple
+    order: tuple         # ((стовпець, "DESC"|"ASC"), ...)
+    limit: bool
+    columns: tuple       # усі стовпці таблиці в запиті
+
+    def label(self):
+        parts = [f"{c}=" for c in self.eq] + [f"{c}[..]" for c in self.ranges]
+        out = " ".join(parts) or "(без фільтра)"
+        if self.group:
+            out += f" GROUP BY {','.join(self.group)}"
+        if self.order:
+            out += " ORDER BY " + ",".join(f"{c} {d}" for c, d in self.order)
+        if self.limit:
+            out += " LIMIT"
+        return out
+
+
+@dataclass
+class Stats:
+    shape: Shape
+    calls: int = 0
+    log_ms: float = 0.0
+    endpoints: set = field(default_factory=set)
+    samples: list = field(default_factory=list)
+    runs: list = field(default_factory=list)     # результати EXPLAIN
+    errors: list = field(default_factory=list)   # семпли, на яких EXPLAIN не вдався
+
+
+# ---------------- журнал ----------------
+def read_log(path):
+    """(sql, ms | None, endpoint | None) з JSONL bench.server або логу PostgreSQL."""
+    with open(path, encoding="utf-8") as f:
+        first = f.readline()
+        f.seek(0)
+        if first.lstrip().startswith("{"):
+            for line in f:
+                if line.strip():
+                    rec = json.loads(line)
+                    yield rec["sql"], rec.get("ms"), rec.get("endpoint")
+            return
+        current = None
+        for line in f:
+            if line[:1].isspace() and current is not None:   # продовження багаторядкового запиту
+                current[0] += "\n" + line.rstrip("\n")
+                continue
+            if current is not None:
+                yield current[0], current[1], None
+                current = None
+            m = PG_LOG.search(line)
+            if m:
+                current = [m.group(2), float(m.group(1)) if m.group(1) else None]
+        if current is not None:
+            yield current[0], current[1], None
+
+
+def _clauses(sql):
+    """{WHERE: текст, GROUP BY: текст, ...} верхнього рівня запиту."""
+    marks = [(m.start(), m.end(), m.group(1).upper()) for m in CLAUSE.finditer(sql)]
+    out = {}
+    for i, (_, end, name) in enumerate(marks):
+        out[name] = sql[end:marks[i + 1][0] if i + 1 < len(marks) else len(sql)]
+    return out
+
+
+def shape_of(sql):
+    """Форма запиту до resource_allocations або None (інші таблиці, вибірки)."""
+    if not FROM_TABLE.search(sql) or re.search(r"\bTABLESAMPLE\b", sql, re.I):
+        return None
+    if not sql.lstrip().upper().startswith("SELECT"):
+        return None
+    parts = _clauses(sql)
+    eq, ranges = [], []
+    for col, op in PREDICATE.findall(parts.get("WHERE", "")):
+        target = ranges if op in (">", ">=", "<", "<=") else eq
+        if col not in target:
+            target.append(col)
+    group = tuple(dict.fromkeys(re.findall(COL, parts.get("GROUP BY", ""))))
+    order = tuple((c, (d or "ASC").upper())
+                  for c, d in re.findall(COL + r"(?:\s+(DESC|ASC))?", parts.get("ORDER BY", ""), re.I))
+    columns = tuple(sorted(set(re.findall(COL, sql))))
+    return Shape(tuple(sorted(eq)), tuple(sorted(ranges)), group, order, "LIMIT" in parts, columns)
+
+
+def collect(path, samples=3):
+    """Форми запитів журналу з кількістю, сумарним часом і прикладами."""
+    shapes = {}
+    for sql, ms, endpoint in read_log(path):
+        shape = shape_of(sql)
+        if shape is None:
+            continue
+        st = shapes.setdefault(shape, Stats(shape))
+        st.calls += 1
+        st.log_ms += ms or 0.0
+        if endpoint:
+            st.endpoints.add(endpoint)
+        if len(st.samples) < samples and sql not in st.samples:
+            st.samples.append(sql)
+    return shapes
+
+
+# ---------------- EXPLAIN ----------------
+def _walk(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def explain(cur, sql, index_names):
+    cur.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql)
+    doc = cur.fetchone()[0]
+    doc = json.loads(doc) if isinstance(doc, str) else doc
+    top = doc[0]
+    plan = top["Plan"]
+    scans, kept, removed = [], 0, 0
+    for node in _walk(plan):
+        on_table = node.get("Relation Name") == TABLE or node.get("Index Name") in index_names
+        if not on_table or node["Node Type"] == "BitmapAnd":
+            continue
+        scans.append(node["Node Type"] + (f" {node['Index Name']}" if "Index Name" in node else ""))
+        if node["Node Type"] == "Bitmap Index Scan":
+            continue  # рядки рахує Bitmap Heap Scan над ним
+        loops = node.get("Actual Loops", 1) or 1
+        kept += node.get("Actual Rows", 0) * loops
+        removed += (node.get("Rows Removed by Filter", 0) + node.get("Rows Removed by Index Recheck", 0)) * loops
+    return {
+        "ms": top["Execution Time"],
+        "hit": plan.get("Shared Hit Blocks", 0),
+        "read": plan.get("Shared Read Blocks", 0),
+        "scans": scans,
+        "kept": kept,
+        "removed": removed,
+    }
+
+
+def replay(shapes, timeout_ms=30_000):
+    """EXPLAIN ANALYZE семплів кожної форми; запит, що перевищив timeout_ms або
+    впав з помилкою SQL, записується в Stats.errors і не зупиняє прогін."""
+    import psycopg2
+    from psycopg2 import errors
+
+    conn = connect()
+    try:
+        conn.set_session(readonly=True)
+        with conn.cursor() as cur:
+            existing = indexes(cur)
+            cur.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", (f"public.{TABLE}",))
+            reltuples = max(cur.fetchone()[0], 1)
+            cur.execute("SELECT attname, n_distinct FROM pg_stats WHERE schemaname = 'public' AND tablename = %s",
+                        (TABLE,))
+            distinct = {name: (nd if nd > 0 else -nd * reltuples) for name, nd in cur.fetchall()}
+            conn.rollback()
+            names = {ix["name"] for ix in existing}
+            for st in shapes.values():
+                for sql in st.samples:
+                    try:
+                        cur.execute(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+                        st.runs.append(explain(cur, sql, names))
+                    except errors.QueryCanceled:
+                        st.errors.append(f"довше за {timeout_ms} мс")
+                    except psycopg2.Error as e:
+                        st.errors.append(str(e).strip().splitlines()[0])
+                    finally:
+                        conn.rollback()
+    finally:
+        conn.close()
+    return existing, distinct, reltuples
+
+
+# ---------------- поради ----------------
+def index_columns(definition):
+    """pg_get_indexdef -> (метод, ключові стовпці, INCLUDE-стовпці)."""
+    m = re.search(r"USING (\w+) \((.*?)\)(?: INCLUDE \((.*?)\))?(?: WITH| WHERE|$)", definition)
+    if not m:
+        return None, [], []
+    keys = [k.strip().split()[0].strip('"') for k in m.group(2).split(",")]
+    include = [k.strip().strip('"') for k in m.group(3).split(",")] if m.group(3) else []
+    return m.group(1), keys, include
+
+
+def candidate(shape, distinct):
+    """(ключ [(стовпець, напрям)], INCLUDE) для форми або None, якщо фільтра немає."""
+    eq = sorted(shape.eq, key=lambda c: -distinct.get(c, 0))
+    key = [(c, "") for c in eq]
+    ranges = sorted(shape.ranges, key=lambda c: (c not in RANGE_FIRST, c))
+    order = dict(shape.order)
+    if shape.limit and shape.order:
+        # сторінка: індекс має віддавати рядки вже в порядку ORDER BY, решта — фільтр
+        ranges = [c for c in ranges if c == shape.order[0][0]] or [shape.order[0][0]]
+    if ranges:
+        key.append((ranges[0], " DESC" if order.get(ranges[0]) == "DESC" else ""))
+    elif shape.order and shape.order[0][0] not in shape.eq:
+        c, d = shape.order[0]
+        key.append((c, " DESC" if d == "DESC" else ""))
+    if not key:
+        return None
+    cols = {c for c, _ in key}
+    include = [] if shape.limit else [c for c in shape.columns if c not in cols]
+    return key, include
+
+
+def covered_by(key, include, existing):
+    want = [c for c, _ in key]
+    for ix in existing:
+        method, keys, inc = index_columns(ix["definition"])
+        if method == "btree" and ix["valid"] and keys[:len(want)] == want and set(include) <= set(keys) | set(inc):
+            return ix["name"]
+    return None
+
+
+def ddl(key, include):
+    name = "idx_ra_" + "_".join(c for c, _ in key) + ("_cover" if include else "")
+    cols = ", ".join(c + d for c, d in key)
+    inc = f" INCLUDE ({', '.join(include)})" if include else ""
+    return f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON public.{TABLE} ({cols}){inc};"
+
+
+def advise(st, existing, distinct, reltuples):
+    """((ключ, INCLUDE) | None, пояснення) для форми за результатами EXPLAIN."""
+    runs = st.runs
+    scans = [s for r in runs for s in r["scans"]]
+    seq = any(s.startswith("Seq Scan") for s in scans)
+    heap = not st.shape.limit and any(s.startswith(("Bitmap Heap Scan", "Index Scan")) for s in scans)
+    kept = sum(r["kept"] for r in runs)
+    removed = sum(r["removed"] for r in runs)
+    wasteful = removed > 4 * max(kept, 1)
+    share = kept / len(runs) / reltuples
+    if not (seq or wasteful or heap):
+        return None, "план уже індексний"
+    cand = candidate(st.shape, distinct)
+    if cand is None:
+        return None, "фільтра немає — читається вся таблиця; для агрегатів див. approx=true"
+    if not st.shape.limit and share > MAX_SHARE:
+        return None, f"під фільтр ~{share:.0%} рядків — індекс не допоможе; для агрегатів див. approx=true"
+    key, include = cand
+    have = covered_by(key, include, existing)
+    if have and any(s.endswith(" " + have) for s in scans):
+        return None, f"{have} уже в плані; решту фільтра ({removed} відкинутих рядків) ключ не звузить"
+    if have:
+        return None, f"є {have}, але планувальник його не взяв (під фільтр ~{share:.0%} рядків)"
+    if seq:
+        reason = "Seq Scan"
+    elif wasteful:
+        reason = f"відкинуто фільтром {removed} з {removed + kept} рядків"
+    else:
+        reason = "індекс без потрібних стовпців — агрегат читає сторінки таблиці"
+    return (key, include), reason
+
+
+def report(shapes, existing, distinct, reltuples, top=15):
+    rows = []
+    for st in shapes.values():
+        if not st.runs:
+            if st.errors:  # жоден семпл не пройшов — форма однаково в звіті
+                rows.append({
+                    "shape": st.shape.label(), "calls": st.calls, "endpoints": sorted(st.endpoints),
+                    "log_ms": round(st.log_ms, 1), "explain_ms": None, "weight_ms": round(st.log_ms, 1),
+                    "buffers_hit": None, "buffers_read": None, "scans": [],
+                    "suggestion": None, "key": None, "include": None,
+                    "reason": f"EXPLAIN не вдався: {st.errors[0]}", "failed": len(st.errors),
+                })
+            continue
+        n = len(st.runs)
+        mean_ms = sum(r["ms"] for r in st.runs) / n
+        suggestion, reason = advise(st, existing, distinct, reltuples)
+        rows.append({
+            "shape": st.shape.label(),
+            "calls": st.calls,
+            "endpoints": sorted(st.endpoints),
+            "log_ms": round(st.log_ms, 1),
+            "explain_ms": round(mean_ms, 2),
+            "weight_ms": round(st.calls * mean_ms, 1),   # скільки часу БД форма займає за журналом
+            "buffers_hit": round(sum(r["hit"] for r in st.runs) / n),
+            "buffers_read": round(sum(r["read"] for r in st.runs) / n),
+            "scans": sorted({s for r in st.runs for s in r["scans"]}),
+            "suggestion": ddl(*suggestion) if suggestion else None,
+            "key": [c + d for c, d in suggestion[0]] if suggestion else None,
+            "include": suggestion[1] if suggestion else None,
+            "reason": reason,
+            "failed": len(st.errors),
+        })
+    rows.sort(key=lambda r: -r["weight_ms"])
+    return rows[:top] if top else rows
+
+
+def print_report(rows):
+    for i, r in enumerate(rows, 1):
+        ep = ", ".join(r["endpoints"])
+        print(f"{i:2}. {r['shape']}" + (f"  [{ep}]" if ep else ""))
+        if r["explain_ms"] is None:
+            print(f"    запитів {r['calls']}, у журналі {r['log_ms']} мс — {r['reason']}")
+            continue
+        print(f"    запитів {r['calls']}, EXPLAIN {r['explain_ms']} мс (вага {r['weight_ms']} мс), "
+              f"сторінок hit {r['buffers_hit']} / read {r['buffers_read']}"
+              + (f", семплів з помилкою {r['failed']}" if r["failed"] else ""))
+        print(f"    {'; '.join(r['scans'])} — {r['reason']}")
+        if r["suggestion"]:
+            print(f"    -> {r['suggestion']}")
+    missing = merged(rows)
+    print(f"\nВідсутніх індексів: {len(missing)}")
+    for stmt in missing:
+        print("  " + stmt)
+
+
+def merged(rows):
+    """Пропозиції -> індекси: ключ, що є префіксом іншого (з будь-яким напрямом),
+    зливається з довшим, INCLUDE об'єднується."""
+    keys = []  # [стовпці ключа, напрями, INCLUDE]
+    for r in sorted((r for r in rows if r["key"]), key=lambda r: -len(r["key"])):
+        cols = [k.split()[0] for k in r["key"]]
+        target = next((k for k in keys if k[0][:len(cols)] == cols), None)
+        if target is None:
+            target = [cols, [""] * len(cols), []]
+            keys.append(target)
+        for i, k in enumerate(r["key"]):
+            if k.endswith(" DESC"):
+                target[1][i] = " DESC"
+        target[2].extend(c for c in r["include"] if c not in target[2] and c not in target[0])
+    return [ddl(list(zip(cols, dirs)), sorted(inc)) for cols, dirs, inc in keys]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Гарячі форми фільтрів і відсутні індекси за журналом запитів")
+    ap.add_argument("log", help="JSONL з bench.server --query-log або лог PostgreSQL")
+    ap.add_argument("--samples", type=int, default=3, help="запитів кожної форми для EXPLAIN ANALYZE")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--timeout-ms", type=int, default=30_000)
+    ap.add_argument("--json", help="зберегти звіт у JSON")
+    args = ap.parse_args(argv)
+
+    shapes = collect(args.log, args.samples)
+    if not shapes:
+        raise SystemExit(f"У {args.log} немає запитів до {TABLE}")
+    existing, distinct, reltuples = replay(shapes, args.timeout_ms)
+    rows = report(shapes, existing, distinct, reltuples, args.top)
+    print(f"Форм фільтрів: {len(shapes)}, запитів: {sum(st.calls for st in shapes.values())}\n")
+    print_report(rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
 import os
-from datetime import datetime, date
+import sys
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from inspect import signature
+from datetime import datetime, date, timedelta, timezone
 from typing import Optional, List, Dict, Tuple
 from random import random
 
 from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -15,22 +22,88 @@ from sqlalchemy import (
     Boolean,
     Numeric,
     DateTime,
+    MetaData,
     func,
+    literal_column,
     select,
     and_,
+    tablesample,
+    text,
 )
-from sqlalchemy.orm import declarative_base, Session
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import aliased, declarative_base, Session
+
+import approx as approx_stats
+
+# fastjson / compression / routing — спільні з Practice58: пакет apicommon у корені репозиторію
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from apicommon.compression import CompressionMiddleware
+from apicommon.fastjson import ORJSONResponse
+from apicommon.routing import LAG_SQL, ReplicaRouter, replica_urls, router_settings
 
 # ----------------- ENV / DB -----------------
 load_dotenv()
-DATABASE_URL = os.getenv("DATABASE_URL")
-if not DATABASE_URL:
-    raise RuntimeError("DATABASE_URL is missing in .env")
-
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, future=True)
 Base = declarative_base()
 
+# engine і репліки створюються при першому запиті (або на старті з DB_WARMUP=1),
+# а не при імпорті: імпорт не відкриває з'єднань, не вантажить драйвер і не
+# потребує .env — без DATABASE_URL падає лише запит до БД
+_db = None
+_db_lock = threading.Lock()
+
+
+def replica_lag(replica_engine) -> float:
+    with replica_engine.connect() as conn:
+        return conn.execute(text(LAG_SQL)).scalar_one()
+
+
+def get_db() -> Tuple[Engine, ReplicaRouter]:
+    """(engine первинної БД, router реплік) — один раз на процес."""
+    global _db
+    if _db is None:
+        with _db_lock:
+            if _db is None:
+                url = os.getenv("DATABASE_URL")
+                if not url:
+                    raise RuntimeError("DATABASE_URL is missing in .env")
+                engine = create_engine(url, pool_pre_ping=True, future=True)
+                # репліки для аналітичних читань (DATABASE_REPLICA_URLS), див. routing.py
+                replica_engines = [
+                    create_engine(u, pool_pre_ping=True, future=True, connect_args={"connect_timeout": 2})
+                    for u in replica_urls()
+                ]
+                router = ReplicaRouter(
+                    replica_engines,
+                    replica_lag,
+                    names=[e.url.render_as_string(hide_password=True) for e in replica_engines],
+                    **router_settings(),
+                )
+                _db = (engine, router)
+    return _db
+
+
+@contextmanager
+def read_session():
+    """Сесія для читання: свіжа репліка, якщо є, інакше первинна БД."""
+    engine, router = get_db()
+    target = router.pick()
+    conn = None
+    if target is not None:
+        try:
+            conn = target.connect()
+        except OperationalError as e:
+            router.failed(target, e)
+    if conn is None:
+        conn = engine.connect()
+    try:
+        with Session(bind=conn) as db:
+            yield db
+    finally:
+        conn.close()
+
 # ----------------- ORM Model -----------------
+# індекси під форми build_filters — у sql/indexes.sql (python schema.py apply)
 class ResourceAllocation(Base):
     __tablename__ = "resource_allocations"
     __table_args__ = {"schema": "public"}
@@ -50,6 +123,21 @@ class ResourceAllocation(Base):
     confirmed = Column(Boolean, nullable=False, default=False)
     notes = Column(Text, nullable=True)
 
+# джерела рядків для approx=true (approx.py): вибірка sql/sample.sql
+# або TABLESAMPLE SYSTEM по самій таблиці, якщо вибірки немає
+APPROX = approx_stats.settings()
+SampledAllocation = aliased(
+    ResourceAllocation,
+    ResourceAllocation.__table__.to_metadata(MetaData(), name="resource_allocations_sample"),
+    adapt_on_names=True,
+)
+SystemSampledAllocation = aliased(
+    ResourceAllocation,
+    tablesample(ResourceAllocation.__table__, func.system(APPROX["system_pct"]), name="ra_system",
+                seed=literal_column("0")),
+)
+_sample_info = {"checked": float("-inf"), "rate": None}
+
 # ----------------- Schemas -----------------
 class AllocationOut(BaseModel):
     id: int
@@ -106,7 +194,15 @@ class MapPoint(BaseModel):
     lon: float
 
 # ----------------- App -----------------
-app = FastAPI(title="Resource Allocations API", version="1.2")
+@asynccontextmanager
+async def lifespan(app):
+    # DB_WARMUP=1: пул і кеші прогріваються до того, як uvicorn почне приймати запити
+    if os.getenv("DB_WARMUP") == "1":
+        await run_in_threadpool(warm_up)
+    yield
+
+app = FastAPI(title="Resource Allocations API", version="1.2", default_response_class=ORJSONResponse,
+              lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -120,6 +216,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# heatmap / map_points / allocations — сотні КБ повторюваного JSON
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
 
 # ----------------- Helpers -----------------
 def build_filters(
@@ -130,30 +228,148 @@ def build_filters(
     unit: Optional[str],
     min_value: Optional[float],
     confirmed: Optional[bool],
+    model=ResourceAllocation,
 ):
     f = []
     if start:
-        f.append(ResourceAllocation.occurred_at >= start)
+        f.append(model.occurred_at >= start)
     if end:
-        f.append(ResourceAllocation.occurred_at <= end)
+        f.append(model.occurred_at <= end)
     if direction:
-        f.append(ResourceAllocation.direction == direction)
+        f.append(model.direction == direction)
     if resource_type:
-        f.append(ResourceAllocation.resource_type == resource_type)
+        f.append(model.resource_type == resource_type)
     if unit:
-        f.append(ResourceAllocation.unit == unit)
+        f.append(model.unit == unit)
     if min_value is not None:
-        f.append(ResourceAllocation.duration_days >= min_value)
+        f.append(model.duration_days >= min_value)
     if confirmed is not None:
-        f.append(ResourceAllocation.confirmed == confirmed)
+        f.append(model.confirmed == confirmed)
     return f
 
+# колонки для "сирих" відповідей без ORM-об'єктів і Pydantic
+ALLOCATION_COLUMNS = [
+    ResourceAllocation.id,
+    ResourceAllocation.occurred_at,
+    ResourceAllocation.direction,
+    ResourceAllocation.resource_type,
+    ResourceAllocation.unit,
+    ResourceAllocation.allocation_reason,
+    ResourceAllocation.amount,
+    ResourceAllocation.duration_days,
+    ResourceAllocation.source,
+    ResourceAllocation.confirmed,
+    ResourceAllocation.notes,
+]
+
+MAP_POINT_COLUMNS = [
+    ResourceAllocation.id,
+    ResourceAllocation.occurred_at,
+    ResourceAllocation.direction,
+    ResourceAllocation.resource_type,
+    ResourceAllocation.unit,
+    ResourceAllocation.amount,
+    ResourceAllocation.confirmed,
+]
+
+# count(*), а не count(id) — тут і в ендпоінтах: id немає в покривних індексах
+# (sql/indexes.sql), тож агрегати лишаються index-only scan
 def metric_expr(metric: str):
     if metric == "events_count":
-        return func.count(ResourceAllocation.id)
+        return func.count()
     # default: amount_sum
     return func.coalesce(func.sum(ResourceAllocation.amount), 0)
 
+# ----------------- approx=true -----------------
+def approx_source(db):
+    """(сутність, частка p, метод): таблиця-вибірка, якщо є, інакше TABLESAMPLE SYSTEM."""
+    now = time.monotonic()
+    if now - _sample_info["checked"] >= APPROX["info_ttl_s"]:
+        row = None
+        if db.execute(text("SELECT to_regclass('public.approx_samples')")).scalar() is not None:
+            row = db.execute(text(approx_stats.SAMPLE_INFO_SQL)).first()
+        _sample_info.update(checked=now, rate=float(row.rate) if row else None)
+    if _sample_info["rate"]:
+        return SampledAllocation, _sample_info["rate"], "sample"
+    return SystemSampledAllocation, APPROX["system_pct"] / 100, "system"
+
+
+def approx_kpi(db, where):
+    """KPI з вибірки з межами ±; None — під фільтром замало рядків вибірки."""
+    m, p, method = approx_source(db)
+    q = select(
+        func.count(m.id),
+        func.coalesce(func.sum(m.amount), 0),
+        func.coalesce(func.sum(m.amount * m.amount), 0),
+        func.coalesce(func.sum(m.duration_days), 0),
+        func.coalesce(func.sum(m.duration_days * m.duration_days), 0),
+    )
+    filters = where(model=m)
+    if filters:
+        q = q.where(and_(*filters))
+    n, s, s2, d, d2 = db.execute(q).one()
+    if n < APPROX["min_rows"]:
+        return None
+
+    top_q = select(m.resource_type, func.count().label("cnt"))
+    if filters:
+        top_q = top_q.where(and_(*filters))
+    top = db.execute(top_q.group_by(m.resource_type).order_by(func.count().desc()).limit(1)).first()
+
+    count, count_err = approx_stats.scale_count(n, p)
+    amount, amount_err = approx_stats.scale_sum(float(s), float(s2), p)
+    duration, duration_err = approx_stats.sample_mean(float(d), float(d2), n, p)
+    return ORJSONResponse(
+        {
+            "events_count": round(count),
+            "amount_sum": amount,
+            "duration_avg": duration,
+            "top_resource_type": top[0] if top else None,
+            "events_count_err": count_err,
+            "amount_sum_err": amount_err,
+            "duration_avg_err": duration_err,
+        },
+        headers={"X-Approx": approx_stats.header(method, p, n)},
+    )
+
+
+def approx_groups(db, where, key, out_key, order_by_count=True):
+    """Кількість і сума по групах key(model) з вибірки; None — замало рядків."""
+    m, p, method = approx_source(db)
+    k = key(m).label("k")
+    q = select(
+        k,
+        func.count(m.id),
+        func.coalesce(func.sum(m.amount), 0),
+        func.coalesce(func.sum(m.amount * m.amount), 0),
+    )
+    filters = where(model=m)
+    if filters:
+        q = q.where(and_(*filters))
+    q = q.group_by(k).order_by(func.count().desc() if order_by_count else k)
+    rows = db.execute(q).all()
+    sampled = sum(n for _, n, _, _ in rows)
+    if sampled < APPROX["min_rows"]:
+        return None
+
+    out = []
+    for value, n, s, s2 in rows:
+        count, count_err = approx_stats.scale_count(n, p)
+        amount, amount_err = approx_stats.scale_sum(float(s), float(s2), p)
+        out.append({
+            out_key: value.date() if out_key == "bucket_start" else value,
+            "events_count": round(count),
+            "amount_sum": amount,
+            "events_count_err": count_err,
+            "amount_sum_err": amount_err,
+        })
+    return ORJSONResponse(out, headers={"X-Approx": approx_stats.header(method, p, sampled)})
+
+APPROX_QUERY = Query(
+    False,
+    description="Оцінка з вибірки (~1% рядків) з межами ± (95%) у полях *_err і заголовку X-Approx",
+)
+
 # “базові” координати по напрямках (для демо на OSM)
 DIRECTION_COORDS = {
     "Північ": (51.50, 31.30),
@@ -168,6 +384,11 @@ DIRECTION_COORDS = {
 def health():
     return {"status": "ok"}
 
+@app.get("/health/db")
+def health_db():
+    """Відставання реплік і куди пішли читання."""
+    return get_db()[1].snapshot()
+
 @app.get("/allocations", response_model=AllocationsPage)
 def list_allocations(
     limit: int = Query(20, ge=1, le=200),
@@ -183,23 +404,24 @@ def list_allocations(
 ):
     filters = build_filters(start, end, direction, resource_type, unit, min_value, confirmed)
 
-    with Session(engine) as db:
-        total_q = select(func.count(ResourceAllocation.id))
+    with read_session() as db:
+        total_q = select(func.count()).select_from(ResourceAllocation)
         if filters:
             total_q = total_q.where(and_(*filters))
         total = db.execute(total_q).scalar_one()
 
-        q = select(ResourceAllocation).order_by(ResourceAllocation.occurred_at.desc())
+        q = select(*ALLOCATION_COLUMNS).order_by(ResourceAllocation.occurred_at.desc())
         if filters:
             q = q.where(and_(*filters))
         q = q.limit(limit).offset(offset)
 
-        items = db.execute(q).scalars().all()
-        return {"items": items, "total": int(total), "limit": limit, "offset": offset}
+        # рядки з БД довірені — одразу в bytes, без валідації AllocationOut
+        items = [dict(r) for r in db.execute(q).mappings()]
+        return ORJSONResponse({"items": items, "total": int(total), "limit": limit, "offset": offset})
 
 @app.get("/allocations/{alloc_id}", response_model=AllocationOut)
 def get_allocation(alloc_id: int):
-    with Session(engine) as db:
+    with read_session() as db:
         row = db.get(ResourceAllocation, alloc_id)
         if not row:
             raise HTTPException(status_code=404, detail="Not found")
@@ -214,12 +436,19 @@ def kpi(
     unit: Optional[str] = None,
     min_value: Optional[float] = None,
     confirmed: Optional[bool] = None,
+    approx: bool = APPROX_QUERY,
 ):
-    filters = build_filters(start, end, direction, resource_type, unit, min_value, confirmed)
+    where = partial(build_filters, start, end, direction, resource_type, unit, min_value, confirmed)
+    filters = where()
+
+    with read_session() as db:
+        if approx:
+            out = approx_kpi(db, where)
+            if out is not None:
+                return out
 
-    with Session(engine) as db:
         q = select(
-            func.count(ResourceAllocation.id),
+            func.count(),
             func.coalesce(func.sum(ResourceAllocation.amount), 0),
             func.coalesce(func.avg(ResourceAllocation.duration_days), 0),
         )
@@ -251,14 +480,22 @@ def trend(
     unit: Optional[str] = None,
     min_value: Optional[float] = None,
     confirmed: Optional[bool] = None,
+    approx: bool = APPROX_QUERY,
 ):
-    filters = build_filters(start, end, direction, resource_type, unit, min_value, confirmed)
+    where = partial(build_filters, start, end, direction, resource_type, unit, min_value, confirmed)
+    filters = where()
     trunc = "day" if bucket == "day" else "week"
 
-    with Session(engine) as db:
+    with read_session() as db:
+        if approx:
+            out = approx_groups(db, where, lambda m: func.date_trunc(trunc, m.occurred_at),
+                                "bucket_start", order_by_count=False)
+            if out is not None:
+                return out
+
         q = select(
             func.date_trunc(trunc, ResourceAllocation.occurred_at).label("b"),
-            func.count(ResourceAllocation.id),
+            func.count(),
             func.coalesce(func.sum(ResourceAllocation.amount), 0),
         )
         if filters:
@@ -279,13 +516,20 @@ def distribution_direction(
     unit: Optional[str] = None,
     min_value: Optional[float] = None,
     confirmed: Optional[bool] = None,
+    approx: bool = APPROX_QUERY,
 ):
-    filters = build_filters(start, end, None, resource_type, unit, min_value, confirmed)
+    where = partial(build_filters, start, end, None, resource_type, unit, min_value, confirmed)
+    filters = where()
+
+    with read_session() as db:
+        if approx:
+            out = approx_groups(db, where, lambda m: m.direction, "category")
+            if out is not None:
+                return out
 
-    with Session(engine) as db:
         q = select(
             ResourceAllocation.direction,
-            func.count(ResourceAllocation.id),
+            func.count(),
             func.coalesce(func.sum(ResourceAllocation.amount), 0),
         )
         if filters:
@@ -303,13 +547,20 @@ def distribution_unit(
     resource_type: Optional[str] = None,
     min_value: Optional[float] = None,
     confirmed: Optional[bool] = None,
+    approx: bool = APPROX_QUERY,
 ):
-    filters = build_filters(start, end, direction, resource_type, None, min_value, confirmed)
+    where = partial(build_filters, start, end, direction, resource_type, None, min_value, confirmed)
+    filters = where()
+
+    with read_session() as db:
+        if approx:
+            out = approx_groups(db, where, lambda m: m.unit, "category")
+            if out is not None:
+                return out
 
-    with Session(engine) as db:
         q = select(
             ResourceAllocation.unit,
-            func.count(ResourceAllocation.id),
+            func.count(),
             func.coalesce(func.sum(ResourceAllocation.amount), 0),
         )
         if filters:
@@ -331,7 +582,7 @@ def heatmap(
 ):
     filters = build_filters(start, end, direction, None, unit, min_value, confirmed)
 
-    with Session(engine) as db:
+    with read_session() as db:
         # axis 1: resource_types
         resource_types = db.execute(
             select(ResourceAllocation.resource_type)
@@ -385,31 +636,59 @@ def map_points(
 ):
     filters = build_filters(start, end, direction, resource_type, unit, min_value, confirmed)
 
-    with Session(engine) as db:
-        q = select(ResourceAllocation).order_by(ResourceAllocation.occurred_at.desc())
+    with read_session() as db:
+        q = select(*MAP_POINT_COLUMNS).order_by(ResourceAllocation.occurred_at.desc())
         if filters:
             q = q.where(and_(*filters))
         q = q.limit(limit)
 
-        rows = db.execute(q).scalars().all()
         out: List[Dict] = []
 
-        for r in rows:
-            base = DIRECTION_COORDS.get(r.direction, (48.38, 31.16))  # fallback
+        for r in db.execute(q).mappings():
+            base = DIRECTION_COORDS.get(r["direction"], (48.38, 31.16))  # fallback
             # невеликий "джитер", щоб точки не накладались
-            lat = base[0] + (random() - 0.5) * 0.25
-            lon = base[1] + (random() - 0.5) * 0.35
-
-            out.append({
-                "id": int(r.id),
-                "occurred_at": r.occurred_at,
-                "direction": r.direction,
-                "resource_type": r.resource_type,
-                "unit": r.unit,
-                "amount": float(r.amount),
-                "confirmed": bool(r.confirmed),
-                "lat": float(lat),
-                "lon": float(lon),
-            })
-
-        return out
+            point = dict(r)
+            point["lat"] = base[0] + (random() - 0.5) * 0.25
+            point["lon"] = base[1] + (random() - 0.5) * 0.35
+            out.append(point)
+
+        return ORJSONResponse(out)
+
+# ----------------- Warm-up -----------------
+# ендпоінти, що читають вікно дат за індексом; heatmap будує осі по всій таблиці
+WARMUP_ENDPOINTS = (list_allocations, kpi, trend, distribution_direction, distribution_unit, map_points)
+
+
+def warm_up():
+    """Підготувати процес до першого запиту (DB_WARMUP=1 або виклик вручну).
+
+    - відкрити DB_WARMUP_CONNECTIONS (типово розмір пулу) з'єднань до первинної
+      БД і кожної репліки одночасно — вони лишаються в пулі;
+    - на кожному з'єднанні спланувати запит до resource_allocations: бекенд
+      PostgreSQL кешує каталог таблиці та її індексів;
+    - викликати ендпоінти з порожнім вікном дат: SQLAlchemy кешує скомпільовані
+      запити, і перший справжній запит лише підставляє параметри.
+    """
+    engine, router = get_db()
+    n = int(os.getenv("DB_WARMUP_CONNECTIONS", "0")) or engine.pool.size()
+    probe = select(ResourceAllocation.id).where(ResourceAllocation.occurred_at > func.now()).limit(0)
+    for target in [engine, *router.replicas]:
+        conns = []
+        try:
+            for _ in range(n):
+                conns.append(target.connect())
+            for conn in conns:
+                conn.execute(probe)
+                conn.rollback()
+        except OperationalError as e:
+            if target is engine:
+                raise
+            router.failed(target, e)
+        finally:
+            for conn in conns:
+                conn.close()
+
+    empty = datetime.now(timezone.utc) + timedelta(days=365 * 100)
+    for endpoint in WARMUP_ENDPOINTS:
+        params = {name: getattr(p.default, "default", p.default) for name, p in signature(endpoint).parameters.items()}
+        endpoint(**{**params, "start": empty, "end": empty})
@@ -0,0 +1,139 @@
+"""
+Керування індексами resource_allocations (sql/indexes.sql).
+
+    python schema.py apply       # створити відсутні, прибрати замінені, VACUUM ANALYZE
+    python schema.py status      # очікувані / зайві індекси, розмір, кількість сканувань
+
+Оператори файлу виконуються по одному в autocommit: CREATE/DROP INDEX
+CONCURRENTLY не блокує записи, а IF [NOT] EXISTS робить повтор безпечним.
+Індекс, що не добудувався (перерваний CONCURRENTLY), лишається INVALID —
+status його показує, apply перестворює (лише індекси з indexes.sql).
+"""
+import argparse
+import os
+import re
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+INDEXES_SQL = HERE / "sql" / "indexes.sql"
+TABLE = "resource_allocations"
+
+INDEXES_STATUS_SQL = """
+SELECT c.relname AS name,
+       i.indisvalid AS valid,
+       pg_relation_size(c.oid) AS bytes,
+       COALESCE(s.idx_scan, 0) AS scans,
+       pg_get_indexdef(c.oid) AS definition
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indexrelid
+LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = i.indexrelid
+WHERE i.indrelid = %s::regclass
+ORDER BY c.relname
+"""
+
+
+def connect(autocommit=False):
+    """psycopg2-з'єднання за DATABASE_URL (.env); префікс драйвера SQLAlchemy відкидається."""
+    import psycopg2
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    url = os.getenv("DATABASE_URL")
+    if not url:
+        raise SystemExit("DATABASE_URL is missing in .env")
+    scheme, rest = url.split("://", 1)
+    conn = psycopg2.connect(f"{scheme.split('+', 1)[0]}://{rest}")  # без +psycopg2
+    conn.autocommit = autocommit
+    return conn
+
+
+def statements(path=INDEXES_SQL):
+    """Оператори SQL-файлу без коментарів."""
+    lines = [ln for ln in Path(path).read_text(encoding="utf-8").splitlines() if not ln.lstrip().startswith("--")]
+    return [s.strip() for s in "\n".join(lines).split(";") if s.strip()]
+
+
+def expected(path=INDEXES_SQL):
+    """(назви індексів, що мають бути; назви, що мають зникнути) за файлом."""
+    created, dropped = [], []
+    for stmt in statements(path):
+        m = re.match(r"CREATE INDEX (?:CONCURRENTLY )?(?:IF NOT EXISTS )?(\w+)", stmt)
+        if m:
+            created.append(m.group(1))
+        m = re.match(r"DROP INDEX (?:CONCURRENTLY )?(?:IF EXISTS )?(?:\w+\.)?(\w+)", stmt)
+        if m:
+            dropped.append(m.group(1))
+    return created, dropped
+
+
+def indexes(cur, table=TABLE):
+    cur.execute(INDEXES_STATUS_SQL, (f"public.{table}",))
+    cols = [c.name for c in cur.description]
+    return [dict(zip(cols, row)) for row in cur.fetchall()]
+
+
+def apply(path=INDEXES_SQL, vacuum=True, conn=None):
+    """Виконати sql/indexes.sql; conn — вже відкрите з'єднання в autocommit (інакше DATABASE_URL)."""
+    own = conn is None
+    if own:
+        conn = connect(autocommit=True)
+    try:
+        created, _ = expected(path)
+        with conn.cursor() as cur:
+            # CREATE ... IF NOT EXISTS пропустив би недобудований індекс. Лише індекси
+            # файлу: чужий INVALID може бути CREATE INDEX CONCURRENTLY в іншій сесії
+            invalid = [ix["name"] for ix in indexes(cur) if not ix["valid"] and ix["name"] in created]
+            for name in invalid:
+                cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS public.{name}")
+                print(f"  видалено INVALID {name}")
+            for stmt in statements(path):
+                t0 = time.perf_counter()
+                cur.execute(stmt)
+                print(f"  {stmt.splitlines()[0]} — {time.perf_counter() - t0:.1f} с")
+            if vacuum:
+                # visibility map для index-only scan + свіжа статистика планувальника
+                cur.execute(f"VACUUM (ANALYZE) public.{TABLE}")
+    finally:
+        if own:
+            conn.close()
+
+
+def status(path=INDEXES_SQL):
+    created, dropped = expected(path)
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            present = {ix["name"]: ix for ix in indexes(cur)}
+    finally:
+        conn.close()
+    for name, ix in present.items():
+        if name in dropped:
+            mark = "замінений — apply видалить"
+        elif not ix["valid"]:
+            mark = "INVALID — apply перестворить" if name in created else "INVALID, поза indexes.sql — apply не чіпає"
+        else:
+            mark = "" if name in created or ix["definition"].startswith("CREATE UNIQUE") else "поза indexes.sql"
+        print(f"  {name:32} {ix['bytes'] / 2**20:8.1f} МБ  сканувань {ix['scans']:>8}  {mark}")
+    missing = [name for name in created if name not in present]
+    for name in missing:
+        print(f"  {name:32} {'—':>8}     відсутній")
+    return missing
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Індекси resource_allocations (sql/indexes.sql)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("apply", help="створити / прибрати індекси за sql/indexes.sql")
+    p.add_argument("--no-vacuum", action="store_true")
+    sub.add_parser("status", help="стан індексів таблиці")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "apply":
+        apply(vacuum=not args.no_vacuum)
+    else:
+        raise SystemExit(1 if status() else 0)
+
+
+if __name__ == "__main__":
+    main()
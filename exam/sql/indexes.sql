@@ -0,0 +1,38 @@
+-- Індекси resource_allocations під форми фільтрів API (build_filters у main.py):
+-- діапазон occurred_at + direction / resource_type / unit / confirmed / duration_days,
+-- сортування ORDER BY occurred_at DESC LIMIT (allocations, map_points).
+--
+-- Застосування: python schema.py apply — кожен оператор окремо (CONCURRENTLY
+-- не працює в транзакції), потім VACUUM ANALYZE для index-only scan.
+-- Перевірка: python schema.py status; python index_advisor.py <лог запитів>.
+
+-- діапазон дат без інших фільтрів (KPI-вікна, trend, heatmap) і сторінки за датою:
+-- INCLUDE — усі стовпці агрегатів і фільтрів, щоб агрегати читали лише індекс
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ra_occurred_cover
+  ON public.resource_allocations (occurred_at DESC)
+  INCLUDE (direction, resource_type, unit, confirmed, amount, duration_days);
+
+-- рівність + діапазон дат: (стовпець, occurred_at DESC) віддає рядки вже в
+-- порядку сторінки і обмежує діапазон усередині значення фільтра
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ra_direction_occurred
+  ON public.resource_allocations (direction, occurred_at DESC)
+  INCLUDE (resource_type, unit, confirmed, amount, duration_days);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ra_resource_type_occurred
+  ON public.resource_allocations (resource_type, occurred_at DESC)
+  INCLUDE (direction, unit, confirmed, amount, duration_days);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ra_unit_occurred
+  ON public.resource_allocations (unit, occurred_at DESC)
+  INCLUDE (direction, resource_type, confirmed, amount, duration_days);
+
+-- BRIN: кілька сторінок на весь діапазон дат; планувальник бере його, коли рядки
+-- лежать у порядку вставки (журнал подій), а не перемішані, як у тестових даних
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ra_occurred_brin
+  ON public.resource_allocations USING brin (occurred_at) WITH (pages_per_range = 32);
+
+-- init.sql: індекси, які покривають нові (той самий перший стовпець)
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_ra_occurred_at;
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_ra_direction;
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_ra_resource_type;
+DROP INDEX CONCURRENTLY IF EXISTS public.idx_ra_unit;
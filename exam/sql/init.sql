@@ -1,3 +1,5 @@
+-- вибірка для approx=true (sample.sql) описує стару таблицю — теж видаляється
+DROP TABLE IF EXISTS public.resource_allocations_sample;
 DROP TABLE IF EXISTS public.resource_allocations;
 
 CREATE TABLE public.resource_allocations (
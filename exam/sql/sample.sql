@@ -0,0 +1,70 @@
+-- Вибірка resource_allocations для наближених запитів (approx=true у API).
+-- Кожен рядок потрапляє у вибірку незалежно з імовірністю rate (Бернуллі):
+-- спочатку з наявних даних, далі — тригером на кожен INSERT. UPDATE/DELETE/
+-- TRUNCATE синхронізуються, тож вибірка лишається рівномірною без перебудов.
+-- Частка (типово 0.01, далі — збережена): SET approx.rate = 0.02; перед запуском файлу.
+
+CREATE TABLE IF NOT EXISTS public.approx_samples (
+  source   TEXT PRIMARY KEY,
+  sample   TEXT NOT NULL,
+  rate     DOUBLE PRECISION NOT NULL CHECK (rate > 0 AND rate <= 1),
+  built_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO public.approx_samples (source, sample, rate)
+VALUES ('resource_allocations', 'resource_allocations_sample',
+        COALESCE(NULLIF(current_setting('approx.rate', true), '')::float8, 0.01))
+ON CONFLICT (source) DO UPDATE
+  SET rate = COALESCE(NULLIF(current_setting('approx.rate', true), '')::float8, approx_samples.rate),
+      built_at = NOW();
+
+DROP TABLE IF EXISTS public.resource_allocations_sample;
+CREATE TABLE public.resource_allocations_sample (LIKE public.resource_allocations INCLUDING DEFAULTS);
+
+INSERT INTO public.resource_allocations_sample
+SELECT * FROM public.resource_allocations
+WHERE random() < (SELECT rate FROM public.approx_samples WHERE source = 'resource_allocations');
+
+ALTER TABLE public.resource_allocations_sample ADD PRIMARY KEY (id);
+CREATE INDEX idx_ras_occurred_at ON public.resource_allocations_sample (occurred_at DESC);
+
+CREATE OR REPLACE FUNCTION public.resource_allocations_sample_sync() RETURNS trigger AS $$
+BEGIN
+  IF TG_OP = 'TRUNCATE' THEN
+    TRUNCATE public.resource_allocations_sample;
+    RETURN NULL;
+  END IF;
+  IF TG_OP = 'DELETE' THEN
+    DELETE FROM public.resource_allocations_sample WHERE id = OLD.id;
+    RETURN OLD;
+  END IF;
+  IF TG_OP = 'UPDATE' THEN
+    -- рядок лишається у вибірці (або поза нею) — інакше зміщення
+    DELETE FROM public.resource_allocations_sample WHERE id = OLD.id;
+    IF FOUND THEN
+      INSERT INTO public.resource_allocations_sample SELECT NEW.*;
+    END IF;
+    RETURN NEW;
+  END IF;
+  IF random() < (SELECT rate FROM public.approx_samples WHERE source = 'resource_allocations') THEN
+    INSERT INTO public.resource_allocations_sample SELECT NEW.*;
+  END IF;
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_ra_sample ON public.resource_allocations;
+CREATE TRIGGER trg_ra_sample
+  AFTER INSERT OR UPDATE OR DELETE ON public.resource_allocations
+  FOR EACH ROW EXECUTE FUNCTION public.resource_allocations_sample_sync();
+
+DROP TRIGGER IF EXISTS trg_ra_sample_truncate ON public.resource_allocations;
+CREATE TRIGGER trg_ra_sample_truncate
+  AFTER TRUNCATE ON public.resource_allocations
+  FOR EACH STATEMENT EXECUTE FUNCTION public.resource_allocations_sample_sync();
+
+ANALYZE public.resource_allocations_sample;
+
+SELECT COUNT(*) AS sample_rows,
+       (SELECT rate FROM public.approx_samples WHERE source = 'resource_allocations') AS rate
+FROM public.resource_allocations_sample;
@@ -0,0 +1,201 @@
+# bench.py
+"""
+Навантаження на сервіс оцінювання: онлайн-запити і потокове оцінювання.
+
+    python bench.py --model mlp --concurrency 32 --requests 200
+    python bench.py --model logistic --compare-batching       # SCORING_MAX_BATCH=1 проти типового
+    python bench.py --url http://127.0.0.1:8010 --model mlp    # вже запущений сервіс
+
+online — кожен потік шле --requests запитів /predict по --rows рядків;
+bulk — один потік CSV на --bulk-rows рядків через /score (chunked upload).
+Друкує рядків/с і p50/p99 затримки з боку клієнта та /stats сервера.
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+from models import ROOT, mlp_data
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = max(0, int(np.ceil(q / 100 * len(sorted_values))) - 1)
+    return sorted_values[k]
+
+
+def sample_rows(model, n, seed=0):
+    """n записів у форматі входу моделі."""
+    if model == "mlp":
+        X, _ = mlp_data(n, seed=seed)
+        return pd.DataFrame(X, columns=[f"x{i}" for i in range(X.shape[1])])
+    data = pd.read_csv(os.path.join(ROOT, "4.5", "case_universe.csv")).drop(columns="Uncertain")
+    return data.sample(n, replace=True, random_state=seed).reset_index(drop=True)
+
+
+def _records_json(df):
+    return json.dumps({"rows": json.loads(df.to_json(orient="records"))}).encode()
+
+
+def online(base_url, model, concurrency, requests, rows):
+    u = urlsplit(base_url)
+    payloads = [_records_json(sample_rows(model, rows, seed=i)) for i in range(min(requests, 50))]
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker(k):
+        conn = http.client.HTTPConnection(u.hostname, u.port, timeout=60)
+        mine = []
+        for i in range(requests):
+            body = payloads[(k + i) % len(payloads)]
+            t0 = time.perf_counter()
+            conn.request("POST", f"/predict/{model}", body, {"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            resp.read()
+            mine.append(time.perf_counter() - t0)
+            if resp.status != 200:
+                errors.append(resp.status)
+        conn.close()
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=worker, args=(k,)) for k in range(concurrency)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    ms = sorted(s * 1000 for s in latencies)
+    return {"requests": len(ms), "errors": len(errors), "rows_per_s": round(len(ms) * rows / elapsed, 1),
+            "p50_ms": round(percentile(ms, 50), 2), "p99_ms": round(percentile(ms, 99), 2)}
+
+
+def bulk(base_url, model, total_rows, chunk):
+    u = urlsplit(base_url)
+    df = sample_rows(model, min(total_rows, 20_000))
+    header = df.to_csv(index=False).split("\n", 1)[0].encode() + b"\n"
+    block = df.to_csv(index=False, header=False).encode()
+
+    def body():
+        yield header
+        sent = 0
+        while sent < total_rows:
+            part = block if sent + len(df) <= total_rows else \
+                df.iloc[:total_rows - sent].to_csv(index=False, header=False).encode()
+            yield part
+            sent += min(len(df), total_rows - sent)
+
+    conn = http.client.HTTPConnection(u.hostname, u.port, timeout=600)
+    t0 = time.perf_counter()
+    conn.putrequest("POST", f"/score/{model}?chunk={chunk}")
+    conn.putheader("Content-Type", "text/csv")
+    conn.putheader("Transfer-Encoding", "chunked")
+    conn.endheaders()
+
+    def send():
+        # тіло — в окремому потоці: сервіс відповідає, ще не дочитавши запит, і якщо
+        # клієнт не читає відповідь паралельно, обидва буфери сокета заповнюються
+        for part in body():
+            conn.sock.sendall(b"%x\r\n%s\r\n" % (len(part), part))
+        conn.sock.sendall(b"0\r\n\r\n")
+
+    sender = threading.Thread(target=send)
+    sender.start()
+    resp = conn.getresponse()
+    lines = 0
+    while True:
+        data = resp.read1(1 << 16)
+        if not data:
+            break
+        lines += data.count(b"\n")
+    sender.join()
+    elapsed = time.perf_counter() - t0
+    conn.close()
+    return {"rows": lines - 1, "status": resp.status, "rows_per_s": round((lines - 1) / elapsed, 1),
+            "total_s": round(elapsed, 2)}
+
+
+def start_server(port, env):
+    proc = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+                             "--log-level", "warning"], cwd=HERE, env={**os.environ, **env})
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"Сервіс завершився з кодом {proc.returncode}")
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+            return proc
+        except OSError:
+            time.sleep(0.5)
+    proc.terminate()
+    raise SystemExit("Сервіс не піднявся за 120 с")
+
+
+def server_stats(base_url, model):
+    with urllib.request.urlopen(f"{base_url}/stats") as r:
+        return json.loads(r.read())[model]
+
+
+def run_all(base_url, args):
+    online(base_url, args.model, args.concurrency, 3, args.rows)  # прогрів
+    urllib.request.urlopen(urllib.request.Request(f"{base_url}/stats", method="DELETE")).read()
+    result = {"online": online(base_url, args.model, args.concurrency, args.requests, args.rows)}
+    result["server"] = server_stats(base_url, args.model)
+    if args.bulk_rows:
+        result["bulk"] = bulk(base_url, args.model, args.bulk_rows, args.chunk)
+    return result
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Навантаження на сервіс оцінювання")
+    ap.add_argument("--url", help="вже запущений сервіс (інакше запускається локально)")
+    ap.add_argument("--port", type=int, default=8011)
+    ap.add_argument("--model", default="mlp")
+    ap.add_argument("--concurrency", type=int, default=32, help="паралельних клієнтів")
+    ap.add_argument("--requests", type=int, default=100, help="запитів на клієнта")
+    ap.add_argument("--rows", type=int, default=1, help="рядків в одному запиті /predict")
+    ap.add_argument("--bulk-rows", type=int, default=200_000, help="рядків у потоці /score (0 — без)")
+    ap.add_argument("--chunk", type=int, default=5000)
+    ap.add_argument("--compare-batching", action="store_true",
+                    help="два прогони: SCORING_MAX_BATCH=1 і типовий")
+    args = ap.parse_args(argv)
+
+    if args.url:
+        runs = [("сервіс", None)]
+    elif args.compare_batching:
+        runs = [("без мікропакетів", {"SCORING_MAX_BATCH": "1"}), ("мікропакети", {})]
+    else:
+        runs = [("мікропакети", {})]
+
+    for label, env in runs:
+        proc = start_server(args.port, env) if env is not None else None
+        try:
+            result = run_all(args.url or f"http://127.0.0.1:{args.port}", args)
+        finally:
+            if proc:
+                proc.terminate()
+                proc.wait(timeout=30)
+        o, s = result["online"], result["server"]
+        print(f"[{label}] online {args.model}: {o['requests']} запитів × {args.rows} рядків, "
+              f"{args.concurrency} клієнтів: {o['rows_per_s']} рядків/с, p50 {o['p50_ms']} мс, "
+              f"p99 {o['p99_ms']} мс, помилок {o['errors']}; середній пакет {s['batch_rows_mean']} рядків")
+        if "bulk" in result:
+            b = result["bulk"]
+            print(f"[{label}] bulk CSV: {b['rows']} рядків за {b['total_s']} с — {b['rows_per_s']} рядків/с")
+
+
+if __name__ == "__main__":
+    main()
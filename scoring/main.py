@@ -0,0 +1,463 @@
+# main.py
+"""
+Сервіс оцінювання класифікаторів 4.5 (logistic) і 4.8 (mlp).
+
+    python models.py                         # один раз: навчити і зберегти моделі
+    uvicorn main:app --port 8010
+
+    POST /predict/{model}   {"rows": [{...}, ...]}  -> ймовірності класів
+    POST /score/{model}     потік CSV (text/csv) або NDJSON -> потік результатів
+    GET  /stats             рядків/с, p50/p99 затримки, середній розмір пакета
+
+- моделі завантажуються один раз при старті (lifespan) і прогріваються;
+  MLP рахується на NumPy (kind "numpy", mlp.npz) — TensorFlow не
+  імпортується, старт займає мілісекунди замість секунд;
+- паралельні запити /predict до однієї моделі збираються в один пакет
+  (MicroBatcher): один векторний predict_proba на сотні рядків замість
+  сотні викликів по рядку. Пакет закривається за SCORING_MAX_BATCH рядків
+  або SCORING_MAX_WAIT_MS мілісекунд; поки модель рахує попередній пакет,
+  нові запити накопичуються в черзі. Якщо пакет падає, запити
+  повторюються поодинці — помилку отримує лише той, що її спричинив;
+- /score читає тіло частинами й відповідає одразу по мірі обробки
+  блоків по ?chunk= рядків — пам'ять не залежить від розміру потоку.
+"""
+import asyncio
+import csv
+import io
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+import joblib
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+
+from models import ARTIFACTS, _numpy_mlp, load_meta
+
+ARTIFACTS_DIR = os.getenv("SCORING_ARTIFACTS", ARTIFACTS)
+MAX_BATCH = int(os.getenv("SCORING_MAX_BATCH", "512"))       # 1 — без мікропакетів
+MAX_WAIT_MS = float(os.getenv("SCORING_MAX_WAIT_MS", "2"))
+
+
+def json_response(content, status_code=200):
+    return Response(orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY),
+                    status_code=status_code, media_type="application/json")
+
+
+# ----------------- Моделі -----------------
+class Scorer:
+    """Модель + опис входу: records / CSV -> DataFrame -> predict_proba."""
+
+    def __init__(self, name, meta, predict):
+        self.name = name
+        self.numeric = meta["numeric"]
+        self.categorical = meta["categorical"]
+        self.columns = self.numeric + self.categorical
+        self.classes = meta["classes"]
+        self._predict = predict
+
+    def coerce(self, df):
+        missing = [c for c in self.columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"відсутні стовпці: {', '.join(missing)}")
+        out = {c: pd.to_numeric(df[c], errors="coerce").astype(np.float32) for c in self.numeric}
+        # коди — рядки, як при навчанні (CSV і JSON можуть дати 220 замість "220")
+        out.update({c: df[c].astype(str).astype(object).where(df[c].notna(), np.nan) for c in self.categorical})
+        return pd.DataFrame(out, columns=self.columns)
+
+    def frame(self, records):
+        # відсутні ключі -> NaN, далі їх заповнює модель (середнє / мода)
+        return self.coerce(pd.DataFrame.from_records(records, columns=self.columns))
+
+    def predict_proba(self, df):
+        return np.asarray(self._predict(df), dtype=np.float32)
+
+    def predict_records(self, records):
+        return self.predict_proba(self.frame(records))
+
+
+def load_sklearn(name, meta, directory):
+    model = joblib.load(os.path.join(directory, f"{name}.joblib"))
+    return Scorer(name, meta, model.predict_proba)
+
+
+def load_keras(name, meta, directory):
+    import tensorflow as tf
+
+    model = tf.keras.models.load_model(os.path.join(directory, f"{name}.keras"))
+    scaler = joblib.load(os.path.join(directory, f"{name}_scaler.joblib"))
+    numeric = meta["numeric"]
+
+    def predict(df):
+        x = df[numeric].to_numpy(np.float32)
+        x = np.where(np.isnan(x), scaler.mean_.astype(np.float32), x)  # пропуск -> середнє
+        x = scaler.transform(x).astype(np.float32)
+        # прямий виклик без model.predict(): той дає ~мс накладних витрат на виклик
+        return model(x, training=False).numpy()
+
+    return Scorer(name, meta, predict)
+
+
+def load_numpy(name, meta, directory):
+    # scaler уже вбудований у перший шар, пропуски заповнюються його середніми
+    model = _numpy_mlp().NumpyMLP.load(os.path.join(directory, f"{name}.npz"))
+    numeric = meta["numeric"]
+    return Scorer(name, meta, lambda df: model.predict_proba(df[numeric].to_numpy(np.float32)))
+
+
+LOADERS = {"sklearn": load_sklearn, "keras": load_keras, "numpy": load_numpy}
+
+
+def load_models(directory=ARTIFACTS_DIR):
+    scorers = {}
+    for fname in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+        if not fname.endswith(".json"):
+            continue
+        name = fname[:-5]
+        meta = load_meta(name, directory)
+        scorer = LOADERS[meta["kind"]](name, meta, directory)
+        # прогрів: перший виклик ініціалізує кодувальники / граф TensorFlow
+        scorer.predict_proba(scorer.frame([dict.fromkeys(scorer.columns)]))
+        scorers[name] = scorer
+    return scorers
+
+
+# ----------------- Статистика -----------------
+def percentile(sorted_values, q):
+    # nearest-rank, як у bench/report.py
+    if not sorted_values:
+        return 0.0
+    k = max(0, int(np.ceil(q / 100 * len(sorted_values))) - 1)
+    return sorted_values[k]
+
+
+class Stats:
+    def __init__(self, window=20_000):
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.started = time.perf_counter()
+        self.requests = 0
+        self.rows = 0
+        self.batches = 0
+        self.batch_rows = 0
+        self.latencies = deque(maxlen=self.window)  # секунди на запит /predict
+
+    def request(self, rows, seconds):
+        self.requests += 1
+        self.rows += rows
+        self.latencies.append(seconds)
+
+    def batch(self, rows):
+        self.batches += 1
+        self.batch_rows += rows
+
+    def snapshot(self):
+        elapsed = time.perf_counter() - self.started
+        ms = sorted(s * 1000 for s in self.latencies)
+        return {
+            "requests": self.requests,
+            "rows": self.rows,
+            "rows_per_s": round(self.rows / elapsed, 1) if elapsed else 0.0,
+            "batches": self.batches,
+            "batch_rows_mean": round(self.batch_rows / self.batches, 1) if self.batches else 0.0,
+            "p50_ms": round(percentile(ms, 50), 3),
+            "p99_ms": round(percentile(ms, 99), 3),
+        }
+
+
+# ----------------- Мікропакети -----------------
+class MicroBatcher:
+    """Черга запитів однієї моделі -> пакети -> один predict_proba у робочому потоці."""
+
+    def __init__(self, scorer, stats, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS):
+        self.scorer = scorer
+        self.stats = stats
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        # один потік на модель: виклики моделі не перетинаються, цикл подій вільний
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"score-{scorer.name}")
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+        self.executor.shutdown(wait=False)
+
+    async def predict(self, records):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((records, future))
+        return await future
+
+    async def run(self, df):
+        """Виконати вже готовий пакет (блок /score) у потоці моделі."""
+        loop = asyncio.get_running_loop()
+        self.stats.batch(len(df))
+        return await loop.run_in_executor(self.executor, self.scorer.predict_proba, df)
+
+    async def run_records(self, records):
+        # DataFrame будується один на пакет і в потоці моделі: pandas на кожен
+        # запит коштував би більше, ніж сам predict_proba
+        loop = asyncio.get_running_loop()
+        self.stats.batch(len(records))
+        return await loop.run_in_executor(self.executor, self.scorer.predict_records, records)
+
+    async def _collect(self):
+        batch = [await self.queue.get()]
+        rows = len(batch[0][0])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while rows < self.max_batch:
+            try:
+                item = self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    async def _loop(self):
+        while True:
+            batch = await self._collect()
+            records = [r for chunk, _ in batch for r in chunk]
+            try:
+                proba = await self.run_records(records)
+            except Exception as e:
+                if len(batch) == 1:
+                    if not batch[0][1].done():
+                        batch[0][1].set_exception(e)
+                    continue
+                # помилку спричинив один із запитів пакета: повторюємо кожен окремо,
+                # щоб 500 отримав лише він, а не сусіди по пакету
+                for chunk, future in batch:
+                    if future.done():
+                        continue
+                    try:
+                        proba = await self.run_records(chunk)
+                    except Exception as err:
+                        if not future.done():
+                            future.set_exception(err)
+                    else:
+                        if not future.done():
+                            future.set_result(proba)
+                continue
+            start = 0
+            for chunk, future in batch:
+                if not future.done():  # клієнт міг відключитися
+                    future.set_result(proba[start:start + len(chunk)])
+                start += len(chunk)
+
+
+# ----------------- App -----------------
+@asynccontextmanager
+async def lifespan(app):
+    app.state.scorers = load_models()
+    app.state.stats = {name: Stats() for name in app.state.scorers}
+    app.state.batchers = {
+        name: MicroBatcher(scorer, app.state.stats[name]) for name, scorer in app.state.scorers.items()
+    }
+    for b in app.state.batchers.values():
+        b.start()
+    yield
+    for b in app.state.batchers.values():
+        await b.stop()
+
+
+app = FastAPI(title="Scoring API", version="1.0", lifespan=lifespan)
+
+
+def batcher_for(request, name):
+    b = request.app.state.batchers.get(name)
+    if b is None:
+        raise HTTPException(404, f"Невідома модель: {name} (є: {', '.join(request.app.state.batchers) or 'жодної — запустіть models.py'})")
+    return b
+
+
+@app.get("/health")
+def health(request: Request):
+    return {"status": "ok", "models": list(request.app.state.scorers)}
+
+
+@app.get("/models")
+def models(request: Request):
+    return {name: {"numeric": s.numeric, "categorical": s.categorical, "classes": s.classes}
+            for name, s in request.app.state.scorers.items()}
+
+
+@app.post("/predict/{name}")
+async def predict(name: str, request: Request):
+    t0 = time.perf_counter()
+    b = batcher_for(request, name)
+    try:
+        body = orjson.loads(await request.body())
+    except orjson.JSONDecodeError as e:
+        raise HTTPException(422, f"Некоректний JSON: {e}")
+    records = body.get("rows") if isinstance(body, dict) else body
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        raise HTTPException(422, 'Очікується {"rows": [{стовпець: значення}, ...]}')
+    if not records:
+        return json_response({"classes": b.scorer.classes, "proba": []})
+    proba = await b.predict(records)
+    b.stats.request(len(records), time.perf_counter() - t0)
+    return json_response({"classes": b.scorer.classes, "proba": proba})
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """Відповідь, яка пишеться, поки ще читається тіло запиту.
+
+    StreamingResponse для ASGI < 2.4 паралельно слухає receive() на
+    відключення клієнта і «з'їдає» частини тіла — тут цього слухача немає.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+
+def _record_end(data, quoted):
+    """Позиція після останнього повного запису в data (0 — немає).
+
+    quoted=True (CSV): перенос рядка всередині поля в лапках — не межа
+    запису; межа — лише \n, до якого парна кількість лапок ("" — дві)."""
+    cut = data.rfind(b"\n")
+    if not quoted:
+        return cut + 1
+    after = data.count(b'"', cut + 1) if cut >= 0 else 0
+    odd = (data.count(b'"') - after) % 2
+    while cut >= 0 and odd:
+        prev = data.rfind(b"\n", 0, cut)
+        odd ^= data.count(b'"', prev + 1, cut) % 2
+        cut = prev
+    return cut + 1
+
+
+async def _blocks(request, rows, quoted=False):
+    """Тіло запиту -> блоки повних записів (bytes), у кожному ~rows рядків."""
+    tail, parts, count = b"", [], 0
+    async for chunk in request.stream():
+        data = tail + chunk
+        cut = _record_end(data, quoted)
+        tail = data[cut:]
+        if cut:
+            parts.append(data[:cut])
+            count += data.count(b"\n", 0, cut)
+        if count >= rows:
+            yield b"".join(parts)
+            parts, count = [], 0
+    if tail.strip():
+        parts.append(tail + b"\n")
+    if parts:
+        yield b"".join(parts)
+
+
+def _csv_frame(header, block, scorer):
+    return pd.read_csv(io.BytesIO(header + block), dtype={c: str for c in scorer.categorical})
+
+
+def _ndjson_frame(block):
+    return pd.DataFrame.from_records([orjson.loads(line) for line in block.splitlines() if line.strip()])
+
+
+def _csv_out(proba):
+    labels = proba.argmax(axis=1)
+    buf = io.StringIO()
+    np.savetxt(buf, np.column_stack([labels, proba]), fmt=["%d"] + ["%.6f"] * proba.shape[1], delimiter=",")
+    return buf.getvalue().encode()
+
+
+def _error_out(msg, is_csv):
+    if not is_csv:
+        return orjson.dumps({"error": msg}) + b"\n"
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerow(["error", msg])
+    return buf.getvalue().encode()
+
+
+def _ndjson_out(proba, classes):
+    labels = proba.argmax(axis=1)
+    return b"".join(orjson.dumps({"label": classes[k], "proba": p}, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+                    for k, p in zip(labels, proba))
+
+
+# помилки в даних потоку: до відповіді — 422, після заголовка 200 — запис у самому потоці
+FRAME_ERRORS = (ValueError, KeyError, pd.errors.ParserError, orjson.JSONDecodeError)
+
+
+@app.post("/score/{name}")
+async def score_stream(name: str, request: Request, chunk: int = Query(5000, ge=1, le=200_000)):
+    b = batcher_for(request, name)
+    scorer = b.scorer
+    is_csv = "csv" in request.headers.get("content-type", "")
+    blocks = _blocks(request, chunk, quoted=is_csv)
+
+    # заголовок CSV і перший блок перевіряються до відповіді: відсутні стовпці
+    # чи зламаний формат дають 422, а не обірвану відповідь 200
+    header, df = None, None
+    async for block in blocks:
+        if is_csv and header is None:
+            cut = block.find(b"\n") + 1
+            header, block = block[:cut], block[cut:]
+            names = next(csv.reader([header.decode("utf-8", "replace")]), [])
+            missing = [c for c in scorer.columns if c not in names]
+            if missing:
+                raise HTTPException(422, f"відсутні стовпці: {', '.join(missing)}")
+            if not block:
+                continue
+        try:
+            df = scorer.coerce(_csv_frame(header, block, scorer) if is_csv else _ndjson_frame(block))
+        except FRAME_ERRORS as e:
+            raise HTTPException(422, f"Некоректні дані: {e}")
+        break
+
+    async def body():
+        nonlocal df
+        if is_csv:
+            yield ("label," + ",".join(f"p_{c}" for c in scorer.classes) + "\n").encode()
+        if df is None:
+            return
+        t0 = time.perf_counter()
+        proba = await b.run(df)
+        yield _csv_out(proba) if is_csv else _ndjson_out(proba, scorer.classes)
+        b.stats.request(len(df), time.perf_counter() - t0)
+
+        async for block in blocks:
+            t0 = time.perf_counter()
+            try:
+                df = scorer.coerce(_csv_frame(header, block, scorer) if is_csv else _ndjson_frame(block))
+            except FRAME_ERRORS as e:
+                # статус уже відправлено: останній запис потоку — помилка, далі не читаємо
+                yield _error_out(f"Некоректні дані: {e}", is_csv)
+                return
+            proba = await b.run(df)
+            yield _csv_out(proba) if is_csv else _ndjson_out(proba, scorer.classes)
+            b.stats.request(len(df), time.perf_counter() - t0)
+
+    media = "text/csv" if is_csv else "application/x-ndjson"
+    return DuplexStreamingResponse(body(), media_type=media)
+
+
+@app.get("/stats")
+def stats(request: Request):
+    return {name: s.snapshot() for name, s in request.app.state.stats.items()}
+
+
+@app.delete("/stats")
+def reset_stats(request: Request):
+    for s in request.app.state.stats.values():
+        s.reset()
+    return {"status": "ok"}
@@ -0,0 +1,142 @@
+# models.py
+"""
+Навчання і збереження класифікаторів для сервісу оцінювання (main.py).
+
+    python models.py                 # обидві моделі -> artifacts/
+    python models.py --only mlp --epochs 30
+
+- logistic — конвеєр 4.5 (sparse_pipeline.py: one-hot у CSR + liblinear)
+  на case_universe.csv; зберігається joblib-ом цілком, разом з кодуванням;
+- mlp — Keras MLP 64-32-9 з 4.8 (practice8_variant7_classification_task.ipynb)
+  на make_classification; StandardScaler зберігається поруч, а ваги разом
+  зі scaler — ще й у mlp.npz (4.8/numpy_mlp.py): сервіс рахує MLP на NumPy
+  і не імпортує TensorFlow.
+
+Для кожної моделі пишеться <назва>.json: вхідні стовпці (числові /
+категоріальні) і класи — сервіс за ним розбирає CSV / NDJSON.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+ARTIFACTS = os.path.join(HERE, "artifacts")
+
+# параметри ноутбука 4.8 (student_number = 7)
+MLP_SEED = 7
+MLP_SAMPLES = 7000
+MLP_CLASSES = 9
+MLP_FEATURES = 18
+
+
+def _sparse_pipeline():
+    # каталог "4.5" не може бути пакетом — додаємо його до шляху імпорту
+    sys.path.insert(0, os.path.join(ROOT, "4.5"))
+    import sparse_pipeline
+    return sparse_pipeline
+
+
+def _numpy_mlp():
+    sys.path.insert(0, os.path.join(ROOT, "4.8"))
+    import numpy_mlp
+    return numpy_mlp
+
+
+def save_meta(name, meta, directory=ARTIFACTS):
+    with open(os.path.join(directory, f"{name}.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+
+def load_meta(name, directory=ARTIFACTS):
+    with open(os.path.join(directory, f"{name}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+# ---------------- 4.5: логістична регресія ----------------
+def train_logistic(directory=ARTIFACTS, encoding="onehot"):
+    sp = _sparse_pipeline()
+    data = sp.load("case_universe.csv")
+    X_train, X_test, y_train, y_test = sp.split(data)
+    model = sp.build_pipeline(encoding).fit(X_train, y_train)
+    joblib.dump(model, os.path.join(directory, "logistic.joblib"))
+    save_meta("logistic", {
+        "kind": "sklearn",
+        "numeric": [c for c in X_train.columns if c not in sp.CATEGORICAL],
+        "categorical": list(sp.CATEGORICAL),
+        "classes": [int(c) for c in model.classes_],
+    }, directory)
+    return model.score(X_test, y_test)
+
+
+# ---------------- 4.8: Keras MLP ----------------
+def mlp_data(n_samples=MLP_SAMPLES, seed=MLP_SEED):
+    """Дані як у practice8_variant7_classification_task.ipynb."""
+    from sklearn.datasets import make_classification
+    X, y = make_classification(
+        n_samples=n_samples, n_features=MLP_FEATURES, n_informative=8,
+        n_redundant=MLP_FEATURES - 8, n_classes=MLP_CLASSES, n_clusters_per_class=1,
+        class_sep=1.5 + 0.1 * (seed % 5), flip_y=0.01, random_state=seed,
+    )
+    return X.astype(np.float32), y
+
+
+def train_mlp(directory=ARTIFACTS, epochs=60):
+    import tensorflow as tf
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    X, y = mlp_data()
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=MLP_SEED, stratify=y)
+    scaler = StandardScaler().fit(X_train)
+
+    tf.random.set_seed(MLP_SEED)
+    model = tf.keras.Sequential([
+        tf.keras.Input(shape=(MLP_FEATURES,)),
+        tf.keras.layers.Dense(64, activation="relu"),
+        tf.keras.layers.Dense(32, activation="relu"),
+        tf.keras.layers.Dense(MLP_CLASSES, activation="softmax"),
+    ])
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.01),
+                  loss="sparse_categorical_crossentropy", metrics=["accuracy"])
+    model.fit(scaler.transform(X_train), y_train, epochs=epochs, batch_size=64,
+              validation_split=0.2, verbose=0)
+
+    model.save(os.path.join(directory, "mlp.keras"))
+    joblib.dump(scaler, os.path.join(directory, "mlp_scaler.joblib"))
+    _numpy_mlp().from_keras(model, scaler).save(os.path.join(directory, "mlp.npz"))
+    save_meta("mlp", {
+        "kind": "numpy",  # "keras" — обслуговувати mlp.keras через TensorFlow
+        "numeric": [f"x{i}" for i in range(MLP_FEATURES)],
+        "categorical": [],
+        "classes": list(range(MLP_CLASSES)),
+    }, directory)
+    return model.evaluate(scaler.transform(X_test), y_test, verbose=0)[1]
+
+
+TRAINERS = {"logistic": train_logistic, "mlp": train_mlp}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Навчити і зберегти моделі для сервісу оцінювання")
+    ap.add_argument("--only", choices=sorted(TRAINERS), help="лише одна модель")
+    ap.add_argument("--dir", default=ARTIFACTS)
+    ap.add_argument("--epochs", type=int, default=60, help="епох для mlp")
+    args = ap.parse_args(argv)
+
+    os.makedirs(args.dir, exist_ok=True)
+    for name in [args.only] if args.only else TRAINERS:
+        t0 = time.perf_counter()
+        kwargs = {"epochs": args.epochs} if name == "mlp" else {}
+        accuracy = TRAINERS[name](args.dir, **kwargs)
+        print(f"{name}: accuracy {accuracy:.3f}, {time.perf_counter() - t0:.1f} с -> {args.dir}")
+
+
+if __name__ == "__main__":
+    main()